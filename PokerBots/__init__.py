@@ -2,4 +2,23 @@ from .players.BasePlayer import BasePlayer
 from .players.CallingPlayer import CallingPlayer
 from .players.RandomPlayer import RandomPlayer
 from .players.GamblingPlayer import GamblingPlayer
+from .players.MCTSPlayer import MCTSPlayer
+from .players.AsyncBasePlayer import AsyncBasePlayer
+from .players.SyncPlayerAdapter import SyncPlayerAdapter
 from .game.Game import Game
+from .game.AsyncGame import AsyncGame, play_tables
+from .game.GameStats import GameStats
+from .game.SimulationRunner import SimulationRunner, SimulationSummary
+from .game.BatchSimulator import BatchSimulator
+from .game.BotWorkers import BotWorkerPool, WorkerPlayer
+from .game.HandHistory import HandHistoryReader, HandHistoryWriter
+from .game.Deal import Deal
+from .game.Observation import Observation
+from .game.DuplicateEvaluator import DuplicateEvaluator, DuplicateResult
+from .game.HandReplayer import HandReplayer, ReplayResult
+from .game.League import League, LeagueResult, PairingRecord
+from .game.Tournament import BlindLevel, BlindSchedule, PlayerRegistry, Tournament, TournamentResult
+from .equity.EquityEngine import EquityEngine, EquityResult
+from .equity.PreflopTable import PreflopTable
+from .equity.EquityCache import EquityCache
+from .equity.HandEvaluator import HandEvaluator
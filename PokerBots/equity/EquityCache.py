@@ -0,0 +1,190 @@
+from __future__ import annotations
+import itertools
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+import pokerkit
+from PokerBots.equity.cards import card_codes
+
+# For each of the 24 relabelings of the suits, the image of every card code.
+_SUIT_PERMUTATIONS = tuple(
+    tuple(4 * (code // 4) + permutation[code % 4] for code in range(52))
+    for permutation in itertools.permutations(range(4))
+)
+
+
+def canonical_form(hole_cards: list[int], board_cards: list[int]) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    """
+    Computes a representative of the hole and board cards that is the same for all suit relabelings.
+
+    Args:
+        hole_cards (list[int]): Codes of the hole cards.
+        board_cards (list[int]): Codes of the board cards.
+
+    Returns:
+        tuple[tuple[int, ...], tuple[int, ...]]: The smallest (sorted hole cards, sorted board cards) pair over all
+            suit relabelings.
+    """
+    return min(
+        (tuple(sorted(image[card] for card in hole_cards)), tuple(sorted(image[card] for card in board_cards)))
+        for image in _SUIT_PERMUTATIONS
+    )
+
+
+class EquityCache:
+    """
+    Bounded LRU cache of win rates keyed by the canonical form of a situation.
+
+    Situations that only differ by a relabeling of the suits (e.g. the same hole cards and flop with the suits
+    permuted) have the same win rate, so they share one entry.
+
+    Attributes:
+        max_entries (int): Maximum number of cached win rates. The least recently used entry is evicted first.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that had to be computed.
+    """
+
+    def __init__(self, max_entries: int = 100_000):
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_entries (int): Maximum number of cached win rates. Default is 100,000.
+        """
+        if max_entries <= 0:
+            raise ValueError(f"max_entries must be positive, got {max_entries}.")
+
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.__entries = OrderedDict()
+
+    def get_or_compute(
+        self,
+        hole_cards: list[pokerkit.Card],
+        board_cards: list[pokerkit.Card],
+        n_players: int,
+        compute: Callable[[], float],
+        *,
+        context: Hashable = None,
+    ) -> float:
+        """
+        Returns the cached win rate of the situation, computing and storing it on a miss.
+
+        Args:
+            hole_cards (list[pokerkit.Card]): The two cards in the player's hand.
+            board_cards (list[pokerkit.Card]): The cards currently on the board.
+            n_players (int): The number of active players.
+            compute (Callable[[], float]): Computes the win rate of the situation on a miss.
+            context (Hashable): Anything else the win rate depends on (e.g. the number of simulations). Default is None.
+
+        Returns:
+            float: The win rate.
+        """
+        key = self.__key(hole_cards, board_cards, n_players, context)
+
+        win_rate = self.__get(key)
+        if win_rate is None:
+            win_rate = compute()
+            self.__put(key, win_rate)
+        return win_rate
+
+    def get(
+        self,
+        hole_cards: list[pokerkit.Card],
+        board_cards: list[pokerkit.Card],
+        n_players: int,
+        *,
+        context: Hashable = None,
+    ) -> float | None:
+        """
+        Returns the cached win rate of the situation, or None on a miss (for callers that compute many misses at once).
+
+        Args:
+            hole_cards (list[pokerkit.Card]): The two cards in the player's hand.
+            board_cards (list[pokerkit.Card]): The cards currently on the board.
+            n_players (int): The number of active players.
+            context (Hashable): Anything else the win rate depends on. Default is None.
+
+        Returns:
+            float | None: The win rate, if cached.
+        """
+        return self.__get(self.__key(hole_cards, board_cards, n_players, context))
+
+    def put(
+        self,
+        hole_cards: list[pokerkit.Card],
+        board_cards: list[pokerkit.Card],
+        n_players: int,
+        win_rate: float,
+        *,
+        context: Hashable = None,
+    ):
+        """
+        Stores the win rate of the situation.
+
+        Args:
+            hole_cards (list[pokerkit.Card]): The two cards in the player's hand.
+            board_cards (list[pokerkit.Card]): The cards currently on the board.
+            n_players (int): The number of active players.
+            win_rate (float): The win rate.
+            context (Hashable): Anything else the win rate depends on. Default is None.
+        """
+        self.__put(self.__key(hole_cards, board_cards, n_players, context), win_rate)
+
+    @staticmethod
+    def __key(
+        hole_cards: list[pokerkit.Card], board_cards: list[pokerkit.Card], n_players: int, context: Hashable
+    ) -> tuple:
+        return canonical_form(card_codes(hole_cards), card_codes(board_cards)), n_players, context
+
+    def __get(self, key: tuple) -> float | None:
+        win_rate = self.__entries.get(key)
+        if win_rate is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.__entries.move_to_end(key)
+        return win_rate
+
+    def __put(self, key: tuple, win_rate: float):
+        self.__entries[key] = win_rate
+        self.__entries.move_to_end(key)
+        if len(self.__entries) > self.max_entries:
+            self.__entries.popitem(last=False)
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Share of lookups answered from the cache (0.0 before the first lookup).
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self):
+        """
+        Removes all entries and resets the counters.
+        """
+        self.__entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __repr__(self):
+        return f"EquityCache(entries={len(self)}/{self.max_entries}, hits={self.hits}, misses={self.misses})"
+
+
+# The cache shared by all players of the process that are not given their own.
+_shared_cache = EquityCache()
+
+
+def shared_equity_cache() -> EquityCache:
+    """
+    Returns the cache shared by all players of the current process.
+
+    Returns:
+        EquityCache: The shared cache.
+    """
+    return _shared_cache
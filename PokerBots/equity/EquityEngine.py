@@ -0,0 +1,561 @@
+from __future__ import annotations
+import itertools
+import math
+import random
+import time
+from collections import defaultdict
+from statistics import NormalDist
+import numpy as np
+import pokerkit
+from PokerBots.equity.cards import card_codes
+from PokerBots.equity.HandEvaluator import HandEvaluator, default_hand_evaluator
+
+
+def wilson_interval(successes: int, n_trials: int, z: float) -> tuple[float, float]:
+    """
+    Computes the Wilson score interval of a binomial proportion (elementwise if given arrays).
+
+    Args:
+        successes (int): Number of successes.
+        n_trials (int): Number of trials (positive).
+        z (float): Quantile of the standard normal distribution (e.g. 2.576 for 99% confidence).
+
+    Returns:
+        tuple[float, float]: Lower and upper bounds of the interval.
+    """
+    p = successes / n_trials
+    denominator = 1 + z * z / n_trials
+    center = (p + z * z / (2 * n_trials)) / denominator
+    half_width = z * np.sqrt(p * (1 - p) / n_trials + z * z / (4 * n_trials * n_trials)) / denominator
+    return center - half_width, center + half_width
+
+
+class EquityResult:
+    """
+    Outcome of an equity calculation.
+
+    Attributes:
+        wins (int): Number of simulations in which the player beats every opponent.
+        ties (int): Number of simulations in which the player ties for the best hand.
+        n_simulations (int): Total number of simulations. For an exact result, the number of equally likely deals.
+        exact (bool): True if every possible deal was enumerated, so the rates are exact.
+    """
+
+    def __init__(self, wins: int, ties: int, n_simulations: int, exact: bool = False):
+        self.wins = wins
+        self.ties = ties
+        self.n_simulations = n_simulations
+        self.exact = exact
+
+    @property
+    def win_rate(self) -> float:
+        """
+        Share of simulations won outright.
+        """
+        return self.wins / self.n_simulations
+
+    @property
+    def tie_rate(self) -> float:
+        """
+        Share of simulations in which the pot is split.
+        """
+        return self.ties / self.n_simulations
+
+    def __repr__(self):
+        return (
+            f"EquityResult(wins={self.wins}, ties={self.ties}, n_simulations={self.n_simulations}, exact={self.exact})"
+        )
+
+
+class EquityEngine:
+    """
+    Batched Monte Carlo equity calculator.
+
+    All runouts and opponent hands of a batch of simulations are sampled at once as an integer array, every hand is
+    scored with the table lookups of a HandEvaluator, and wins and ties are counted with a single vectorized comparison.
+
+    Attributes:
+        batch_size (int): Maximum number of simulations processed at once (bounds the memory usage).
+        evaluator (HandEvaluator | None): The evaluator scoring the hands (None: the one shared by the process).
+    """
+
+    def __init__(self, seed: int | None = None, batch_size: int = 8192, evaluator: HandEvaluator | None = None):
+        """
+        Initializes the engine.
+
+        Args:
+            seed (int | None): Seed of the engine's own random generator. If None (default), every estimate draws its
+                seed from the `random` module, so seeding `random` makes the engine reproducible as well.
+            batch_size (int): Maximum number of simulations processed at once. Default is 8192.
+            evaluator (HandEvaluator | None): The evaluator scoring the hands. Default is None: the evaluator shared
+                by the process, which keeps engines cheap to copy and to pickle.
+        """
+        self.batch_size = batch_size
+        self.evaluator = evaluator
+        self.__rng = None if seed is None else np.random.default_rng(seed)
+
+    @staticmethod
+    def count_deals(n_board_cards: int, n_players: int) -> int:
+        """
+        Counts the distinct deals (runouts and sets of opponent hands) left to enumerate.
+
+        Args:
+            n_board_cards (int): Number of cards already on the board.
+            n_players (int): The number of active players, including the player.
+
+        Returns:
+            int: The number of equally likely deals.
+        """
+        n_unseen = 50 - n_board_cards
+        n_missing = 5 - n_board_cards
+        count = math.comb(n_unseen, n_missing)
+        for i in range(n_players - 1):
+            count *= math.comb(n_unseen - n_missing - 2 * i, 2)
+        # Opponents are interchangeable: only the set of their hands matters.
+        return count // math.factorial(n_players - 1)
+
+    def equity(
+        self,
+        hole_cards: list[pokerkit.Card],
+        board_cards: list[pokerkit.Card],
+        n_players: int,
+        *,
+        n_simulations: int = 10_000,
+        exact_budget: int = 50_000,
+        threshold: float | None = None,
+        confidence: float = 0.99,
+        time_budget: float | None = None,
+    ) -> EquityResult:
+        """
+        Computes how often the hole cards win, exactly if there are few enough deals left, by sampling otherwise.
+
+        Heads-up, the turn and the river are always enumerated with the default budget. If a threshold is given,
+        sampling stops as soon as the win rate is known to be above or below it (see `estimate_against_threshold`).
+
+        Args:
+            hole_cards (list[pokerkit.Card]): The two cards in the player's hand (pokerkit cards, strings or codes).
+            board_cards (list[pokerkit.Card]): The cards currently on the board.
+            n_players (int): The number of active players, including the player.
+            n_simulations (int): The (maximum) number of simulations to run if sampling. Default is 10,000.
+            exact_budget (int): Maximum number of deals to enumerate exactly. Default is 50,000.
+            threshold (float | None): Win rate (ties count as wins) to compare against. Default is None: run all
+                simulations.
+            confidence (float): Confidence level of the comparison with the threshold. Default is 0.99.
+            time_budget (float | None): Maximum sampling time in seconds when comparing with a threshold. Default is
+                None (no time limit).
+
+        Returns:
+            EquityResult: Counts of wins and ties.
+        """
+        if self.count_deals(len(board_cards), n_players) <= exact_budget:
+            return self.enumerate_exactly(hole_cards, board_cards, n_players)
+        if threshold is None:
+            return self.estimate(hole_cards, board_cards, n_players, n_simulations=n_simulations)
+        return self.estimate_against_threshold(
+            hole_cards,
+            board_cards,
+            n_players,
+            threshold,
+            max_simulations=n_simulations,
+            confidence=confidence,
+            time_budget=time_budget,
+        )
+
+    def enumerate_exactly(
+        self,
+        hole_cards: list[pokerkit.Card],
+        board_cards: list[pokerkit.Card],
+        n_players: int,
+    ) -> EquityResult:
+        """
+        Counts wins and ties over every possible runout and every set of opponent hands.
+
+        The cost grows quickly with the number of missing cards and opponents (see `count_deals`).
+
+        Args:
+            hole_cards (list[pokerkit.Card]): The two cards in the player's hand (pokerkit cards, strings or codes).
+            board_cards (list[pokerkit.Card]): The cards currently on the board.
+            n_players (int): The number of active players, including the player.
+
+        Returns:
+            EquityResult: Exact counts of wins and ties.
+        """
+        hole = card_codes(hole_cards)
+        board = card_codes(board_cards)
+        deck = [card for card in range(52) if card not in hole + board]
+
+        n_missing = 5 - len(board)
+        n_runouts = math.comb(len(deck), n_missing)
+        runouts = np.array(list(itertools.combinations(deck, n_missing)), dtype=np.int16).reshape(n_runouts, n_missing)
+        pairs = np.array(list(itertools.combinations(deck, 2)), dtype=np.int16)
+        my_scores, enemy_scores = self.__score_runouts(hole, board, runouts, pairs)
+
+        card_masks = np.left_shift(np.int64(1), np.arange(52, dtype=np.int64))
+        runout_masks = card_masks[runouts].sum(axis=1)
+        hand_sets, hand_set_masks = self.__disjoint_pair_sets(card_masks[pairs].sum(axis=1), n_players - 1)
+
+        wins = ties = n_deals = 0
+        for runout in range(n_runouts):
+            valid = (hand_set_masks & runout_masks[runout]) == 0
+            best_enemy_scores = enemy_scores[runout, hand_sets[valid]].min(axis=1)
+            wins += int(np.count_nonzero(my_scores[runout] < best_enemy_scores))
+            ties += int(np.count_nonzero(my_scores[runout] == best_enemy_scores))
+            n_deals += len(best_enemy_scores)
+
+        return EquityResult(wins=wins, ties=ties, n_simulations=n_deals, exact=True)
+
+    def __score_runouts(
+        self, hole: list[int], board: list[int], runouts: np.ndarray, pairs: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Scores the player's hand and every possible opponent hand on every runout.
+
+        Sets of opponent hands then only index into these scores, so every hand is evaluated once per runout.
+        Opponent hands sharing a card with the runout get meaningless scores and must be filtered out by the caller.
+
+        Args:
+            hole (list[int]): Codes of the player's hole cards.
+            board (list[int]): Codes of the known board cards.
+            runouts (np.ndarray): Missing board cards of every runout, of shape (n_runouts, n_missing).
+            pairs (np.ndarray): Every possible opponent hand, of shape (n_pairs, 2).
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Scores of the player of shape (n_runouts,) and scores of the opponent
+                hands of shape (n_runouts, n_pairs).
+        """
+        evaluator = self.evaluator if self.evaluator is not None else default_hand_evaluator()
+        n_runouts = len(runouts)
+        boards = np.concatenate((np.tile(np.array(board, dtype=np.int16), (n_runouts, 1)), runouts), axis=1)
+
+        my_hands = np.empty((n_runouts, 7), dtype=np.int16)
+        my_hands[:, :2] = hole
+        my_hands[:, 2:] = boards
+
+        enemy_hands = np.empty((n_runouts, len(pairs), 7), dtype=np.int16)
+        enemy_hands[:, :, :2] = pairs
+        enemy_hands[:, :, 2:] = boards[:, np.newaxis, :]
+
+        return evaluator.evaluate_batch(my_hands), evaluator.evaluate_batch(enemy_hands)
+
+    @staticmethod
+    def __disjoint_pair_sets(pair_masks: np.ndarray, set_size: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Lists all sets of `set_size` pairwise disjoint hands.
+
+        Args:
+            pair_masks (np.ndarray): Bit mask of the cards of every 2-card hand.
+            set_size (int): Number of hands per set.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Hand indices of shape (n_sets, set_size), in increasing order within a set,
+                and the bit mask of the cards of every set.
+        """
+        sets = np.arange(len(pair_masks)).reshape(-1, 1)
+        set_masks = pair_masks
+        for _ in range(set_size - 1):
+            set_index, pair_index = np.nonzero(
+                (np.arange(len(pair_masks)) > sets[:, -1:]) & ((set_masks[:, np.newaxis] & pair_masks) == 0)
+            )
+            sets = np.concatenate((sets[set_index], pair_index[:, np.newaxis]), axis=1)
+            set_masks = set_masks[set_index] | pair_masks[pair_index]
+        return sets, set_masks
+
+    def estimate(
+        self,
+        hole_cards: list[pokerkit.Card],
+        board_cards: list[pokerkit.Card],
+        n_players: int,
+        n_simulations: int = 10_000,
+    ) -> EquityResult:
+        """
+        Estimates how often the hole cards win against random hands of the other players.
+
+        Args:
+            hole_cards (list[pokerkit.Card]): The two cards in the player's hand (pokerkit cards, strings or codes).
+            board_cards (list[pokerkit.Card]): The cards currently on the board.
+            n_players (int): The number of active players, including the player.
+            n_simulations (int): The number of simulations to run. Default is 10,000.
+
+        Returns:
+            EquityResult: Counts of wins and ties.
+        """
+        hole = card_codes(hole_cards)
+        board = card_codes(board_cards)
+        rng = self.__rng if self.__rng is not None else np.random.default_rng(random.getrandbits(64))
+
+        deck = np.setdiff1d(np.arange(52, dtype=np.int16), np.array(hole + board, dtype=np.int16))
+
+        wins = ties = 0
+        remaining = n_simulations
+        while remaining > 0:
+            batch = min(remaining, self.batch_size)
+            remaining -= batch
+
+            batch_wins, batch_ties = self.__simulate_batch(rng, hole, board, deck, n_players=n_players, size=batch)
+            wins += batch_wins
+            ties += batch_ties
+
+        return EquityResult(wins=wins, ties=ties, n_simulations=n_simulations)
+
+    def estimate_against_threshold(
+        self,
+        hole_cards: list[pokerkit.Card],
+        board_cards: list[pokerkit.Card],
+        n_players: int,
+        threshold: float,
+        *,
+        max_simulations: int = 10_000,
+        confidence: float = 0.99,
+        time_budget: float | None = None,
+        min_batch_size: int = 256,
+    ) -> EquityResult:
+        """
+        Samples in growing batches until the win rate (ties count as wins) is clearly above or below the threshold.
+
+        After every batch, the Wilson score interval of the win rate is computed, and sampling stops as soon as the
+        interval does not contain the threshold, when `max_simulations` is reached or when the time budget is spent.
+        Spots far from the threshold are settled after a few hundred simulations.
+
+        Args:
+            hole_cards (list[pokerkit.Card]): The two cards in the player's hand (pokerkit cards, strings or codes).
+            board_cards (list[pokerkit.Card]): The cards currently on the board.
+            n_players (int): The number of active players, including the player.
+            threshold (float): The win rate to compare against.
+            max_simulations (int): Maximum number of simulations. Default is 10,000.
+            confidence (float): Confidence level of the interval checked after every batch. Default is 0.99.
+            time_budget (float | None): Maximum sampling time in seconds. At least one batch is always run. Default is
+                None (no time limit). Note that results depend on timing when it is set.
+            min_batch_size (int): Size of the first batch. Every next batch is twice as large (up to `batch_size`).
+                Default is 256.
+
+        Returns:
+            EquityResult: Counts of wins and ties over the simulations actually run.
+        """
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+        hole = card_codes(hole_cards)
+        board = card_codes(board_cards)
+        rng = self.__rng if self.__rng is not None else np.random.default_rng(random.getrandbits(64))
+
+        deck = np.setdiff1d(np.arange(52, dtype=np.int16), np.array(hole + board, dtype=np.int16))
+
+        wins = ties = n_simulations = 0
+        next_batch = min_batch_size
+        while n_simulations < max_simulations:
+            batch = min(next_batch, self.batch_size, max_simulations - n_simulations)
+            next_batch = 2 * batch
+
+            batch_wins, batch_ties = self.__simulate_batch(rng, hole, board, deck, n_players=n_players, size=batch)
+            wins += batch_wins
+            ties += batch_ties
+            n_simulations += batch
+
+            lower, upper = wilson_interval(wins + ties, n_simulations, z)
+            if lower > threshold or upper < threshold:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+        return EquityResult(wins=wins, ties=ties, n_simulations=n_simulations)
+
+    def __simulate_batch(
+        self,
+        rng: np.random.Generator,
+        hole: list[int],
+        board: list[int],
+        deck: np.ndarray,
+        *,
+        n_players: int,
+        size: int,
+    ) -> tuple[int, int]:
+        """
+        Deals `size` random runouts and opponent hands from the deck and counts the wins and ties.
+        """
+        n_opponents = n_players - 1
+        sampled = self.__sample_without_replacement(rng, np.tile(deck, (size, 1)), 5 - len(board) + 2 * n_opponents)
+        my_score, best_enemy_score = self.__score_deals(hole, board, sampled, n_opponents)
+
+        wins = int(np.count_nonzero(my_score < best_enemy_score))
+        ties = int(np.count_nonzero(my_score == best_enemy_score))
+        return wins, ties
+
+    def estimate_batch(
+        self,
+        hole_cards: list[list[pokerkit.Card]],
+        board_cards: list[list[pokerkit.Card]],
+        n_players: list[int],
+        *,
+        n_simulations: int = 10_000,
+        threshold: float | None = None,
+        confidence: float = 0.99,
+        min_batch_size: int = 256,
+    ) -> list[EquityResult]:
+        """
+        Estimates the equity of many situations at once (e.g. one per table of a batch simulation).
+
+        Situations with the same number of board cards and players are sampled together, so the NumPy overhead is
+        paid once per group of situations instead of once per situation. If a threshold is given, every situation
+        stops as soon as its win rate is clearly above or below it, as in `estimate_against_threshold`.
+
+        Args:
+            hole_cards (list[list[pokerkit.Card]]): The two hole cards of each situation.
+            board_cards (list[list[pokerkit.Card]]): The board cards of each situation.
+            n_players (list[int]): The number of active players of each situation, including the player.
+            n_simulations (int): The (maximum) number of simulations per situation. Default is 10,000.
+            threshold (float | None): Win rate (ties count as wins) to compare against. Default is None: run all
+                simulations.
+            confidence (float): Confidence level of the comparison with the threshold. Default is 0.99.
+            min_batch_size (int): Simulations per situation in the first round when comparing with a threshold. Every
+                next round is twice as large. Default is 256.
+
+        Returns:
+            list[EquityResult]: Counts of wins and ties of each situation.
+        """
+        rng = self.__rng if self.__rng is not None else np.random.default_rng(random.getrandbits(64))
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+        holes = [card_codes(cards) for cards in hole_cards]
+        boards = [card_codes(cards) for cards in board_cards]
+        counts = np.zeros((3, len(holes)), dtype=np.int64)  # Wins, ties and simulations.
+
+        groups = defaultdict(list)
+        for index, (board, players) in enumerate(zip(boards, n_players)):
+            groups[len(board), players].append(index)
+
+        for (_, players), indices in groups.items():
+            group_holes = np.array([holes[index] for index in indices], dtype=np.int16)
+            group_boards = np.array([boards[index] for index in indices], dtype=np.int16).reshape(len(indices), -1)
+            counts[:, indices] = self.__estimate_group(
+                rng,
+                group_holes,
+                group_boards,
+                n_players=players,
+                n_simulations=n_simulations,
+                threshold=threshold,
+                z=z,
+                min_batch_size=min_batch_size,
+            )
+
+        return [EquityResult(wins=int(wins), ties=int(ties), n_simulations=int(n)) for wins, ties, n in counts.T]
+
+    def __estimate_group(
+        self,
+        rng: np.random.Generator,
+        holes: np.ndarray,
+        boards: np.ndarray,
+        *,
+        n_players: int,
+        n_simulations: int,
+        threshold: float | None,
+        z: float,
+        min_batch_size: int,
+    ) -> np.ndarray:
+        """
+        Samples situations with the same number of board cards and players in rounds of doubling size, until each of
+        them reaches `n_simulations` or is settled against the threshold. Returns the wins, ties and simulations of
+        each situation, of shape (3, n_situations).
+        """
+        counts = np.zeros((3, len(holes)), dtype=np.int64)
+        active = np.arange(len(holes))
+        size = n_simulations if threshold is None else min_batch_size
+        while len(active):
+            sizes = np.minimum(size, n_simulations - counts[2, active])
+            self.__simulate_situations(rng, holes, boards, np.repeat(active, sizes), n_players=n_players, counts=counts)
+            size *= 2
+
+            settled = counts[2, active] >= n_simulations
+            if threshold is not None:
+                lower, upper = wilson_interval(counts[0, active] + counts[1, active], counts[2, active], z)
+                settled |= (lower > threshold) | (upper < threshold)
+            active = active[~settled]
+
+        return counts
+
+    def __simulate_situations(
+        self,
+        rng: np.random.Generator,
+        holes: np.ndarray,
+        boards: np.ndarray,
+        situations: np.ndarray,
+        *,
+        n_players: int,
+        counts: np.ndarray,
+    ):
+        """
+        Runs one simulation per entry of `situations` (indices into `holes` and `boards`) and adds the wins, ties and
+        simulations of each situation to `counts`, of shape (3, n_situations).
+        """
+        n_opponents = n_players - 1
+        n_cards = 5 - boards.shape[1] + 2 * n_opponents
+
+        # Every situation draws from its own deck: all cards but its hole and board cards.
+        known = np.zeros((len(holes), 52), dtype=bool)
+        np.put_along_axis(known, np.concatenate((holes, boards), axis=1).astype(np.intp), True, axis=1)
+        decks = np.nonzero(~known)[1].astype(np.int16).reshape(len(holes), -1)
+
+        for start in range(0, len(situations), self.batch_size):
+            rows = situations[start:start + self.batch_size]
+            sampled = self.__sample_without_replacement(rng, decks[rows], n_cards)
+            my_score, best_enemy_score = self.__score_deals(holes[rows], boards[rows], sampled, n_opponents)
+
+            counts[0] += np.bincount(rows, weights=my_score < best_enemy_score, minlength=len(holes)).astype(np.int64)
+            counts[1] += np.bincount(rows, weights=my_score == best_enemy_score, minlength=len(holes)).astype(np.int64)
+            counts[2] += np.bincount(rows, minlength=len(holes))
+
+    @staticmethod
+    def __sample_without_replacement(rng: np.random.Generator, cards: np.ndarray, n_cards: int) -> np.ndarray:
+        """
+        Draws `n_cards` distinct cards from each row of `cards` (one deck per simulation).
+
+        Runs the first `n_cards` steps of a Fisher-Yates shuffle on all rows at once, which is much cheaper than
+        shuffling whole rows when only a few cards are needed.
+
+        Args:
+            rng (np.random.Generator): The random generator.
+            cards (np.ndarray): Codes of the cards that can be drawn, of shape (n_rows, deck_size). Shuffled in place.
+            n_cards (int): Number of cards drawn per simulation.
+
+        Returns:
+            np.ndarray: Drawn cards of shape (n_rows, n_cards).
+        """
+        n_rows, deck_size = cards.shape
+        rows = np.arange(n_rows)
+        for i in range(n_cards):
+            j = rng.integers(i, deck_size, size=n_rows)
+            picked = cards[rows, j]
+            cards[rows, j] = cards[:, i]
+            cards[:, i] = picked
+        return cards[:, :n_cards]
+
+    def __score_deals(
+        self, hole: list[int] | np.ndarray, board: list[int] | np.ndarray, sampled: np.ndarray, n_opponents: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Scores a batch of sampled deals.
+
+        Args:
+            hole (list[int] | np.ndarray): Codes of the player's hole cards, the same for all deals or one row per deal.
+            board (list[int] | np.ndarray): Codes of the known board cards, the same for all deals or one row per deal.
+            sampled (np.ndarray): Sampled cards of shape (batch, n_missing + 2 * n_opponents): the missing board cards
+                followed by the hole cards of each opponent.
+            n_opponents (int): Number of opponents.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Score of the player and best score of the opponents in each deal (lower is
+                better).
+        """
+        batch = sampled.shape[0]
+        n_known = np.shape(board)[-1]
+        n_missing = 5 - n_known
+
+        # Seats x simulations x 7 cards: the player first, then every opponent.
+        hands = np.empty((n_opponents + 1, batch, 7), dtype=sampled.dtype)
+        hands[:, :, 2:2 + n_known] = board
+        hands[:, :, 2 + n_known:] = sampled[:, :n_missing]
+        hands[0, :, :2] = hole
+        hands[1:, :, :2] = sampled[:, n_missing:].reshape(batch, n_opponents, 2).transpose(1, 0, 2)
+
+        evaluator = self.evaluator if self.evaluator is not None else default_hand_evaluator()
+        scores = evaluator.evaluate_batch(hands)
+        return scores[0], scores[1:].min(axis=0)
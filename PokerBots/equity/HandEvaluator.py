@@ -0,0 +1,222 @@
+"""
+Table-driven evaluator of 5-, 6- and 7-card poker hands.
+
+Hands are ranked exactly as `treys.Evaluator` ranks them: from 1 (royal flush) to 7462 (7-5-4-3-2 offsuit), lower is
+better. Instead of trying every 5-card subset, a hand is evaluated with two precomputed tables:
+
+- If 5 or more cards share a suit, the hand is a flush or a straight flush (with 7 cards or fewer it can not be a full
+  house or quads at the same time), and its rank is read from `flush_ranks`, indexed by the 13-bit mask of the ranks
+  of that suit.
+- Otherwise, the rank only depends on the multiset of ranks. The key of a multiset is the sum of 5 ** rank over the
+  cards (a base-5 number whose digits are the rank counts), and the rank is found by binary search in the sorted
+  `multiset_keys` array.
+
+The tables take about 0.5 MB. They are built from the treys lookup tables on first use, saved as `.npy` files to a
+cache directory and memory-mapped read-only afterwards, so all processes of a machine share them.
+"""
+from __future__ import annotations
+import itertools
+import os
+from collections import Counter
+from collections.abc import Iterable
+import numpy as np
+import pokerkit
+from treys.lookup import LookupTable
+from PokerBots.equity.cards import card_codes
+
+_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+_POWERS_OF_5 = np.array([5 ** rank for rank in range(13)], dtype=np.int32)
+_SUIT_SHIFTS = np.array([13 * suit for suit in range(4)], dtype=np.int64)
+
+_TABLE_NAMES = ("flush_ranks", "multiset_keys", "multiset_ranks")
+
+DEFAULT_DIRECTORY = os.path.join(
+    os.environ.get("POKERBOTS_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "pokerbots")),
+    "hand_evaluator",
+)
+
+
+def _ranks_of(product: int) -> list[int]:
+    """
+    Decomposes a treys prime product into the ranks it encodes.
+    """
+    ranks = []
+    for rank, prime in enumerate(_PRIMES):
+        while product % prime == 0:
+            product //= prime
+            ranks.append(rank)
+    return ranks
+
+
+class HandEvaluator:
+    """
+    Evaluates single hands or whole arrays of hands with precomputed rank tables.
+
+    Attributes:
+        flush_ranks (np.ndarray): Rank of the best flush for every 13-bit mask of ranks (0 if fewer than 5 bits).
+        multiset_keys (np.ndarray): Sorted keys of all rank multisets of 5 to 7 cards.
+        multiset_ranks (np.ndarray): Rank of the best non-flush hand of every multiset, aligned with the keys.
+    """
+
+    def __init__(self, flush_ranks: np.ndarray, multiset_keys: np.ndarray, multiset_ranks: np.ndarray):
+        self.flush_ranks = flush_ranks
+        self.multiset_keys = multiset_keys
+        self.multiset_ranks = multiset_ranks
+
+        self.__flush_ranks_list = flush_ranks.tolist()
+        self.__rank_of_multiset = None
+
+    @classmethod
+    def build(cls) -> "HandEvaluator":
+        """
+        Builds the tables from the treys lookup tables (takes a couple of seconds).
+
+        Returns:
+            HandEvaluator: The evaluator.
+        """
+        lookup = LookupTable()
+        flush_rank_of_ranks = {tuple(_ranks_of(product)): rank for product, rank in lookup.flush_lookup.items()}
+        unsuited_rank_of_ranks = {tuple(_ranks_of(product)): rank for product, rank in lookup.unsuited_lookup.items()}
+
+        flush_ranks = np.zeros(1 << 13, dtype=np.int16)
+        for n_cards in range(5, 8):
+            for ranks in itertools.combinations(range(13), n_cards):
+                mask = sum(1 << rank for rank in ranks)
+                flush_ranks[mask] = min(flush_rank_of_ranks[five] for five in itertools.combinations(ranks, 5))
+
+        keys, values = [], []
+        for n_cards in range(5, 8):
+            for ranks in itertools.combinations_with_replacement(range(13), n_cards):
+                if max(Counter(ranks).values()) > 4:
+                    continue
+                keys.append(sum(5 ** rank for rank in ranks))
+                values.append(min(unsuited_rank_of_ranks[five] for five in set(itertools.combinations(ranks, 5))))
+
+        order = np.argsort(keys)
+        return cls(
+            flush_ranks=flush_ranks,
+            multiset_keys=np.array(keys, dtype=np.int32)[order],
+            multiset_ranks=np.array(values, dtype=np.int16)[order],
+        )
+
+    @classmethod
+    def load(cls, directory: str = DEFAULT_DIRECTORY) -> "HandEvaluator":
+        """
+        Memory-maps the tables saved in `directory`, building and saving them first if they are missing.
+
+        If the directory is not writable, the freshly built tables are kept in memory.
+
+        Args:
+            directory (str): Directory of the `.npy` files. Default is "~/.cache/pokerbots/hand_evaluator"
+                (the POKERBOTS_CACHE_DIR environment variable overrides "~/.cache/pokerbots").
+
+        Returns:
+            HandEvaluator: The evaluator.
+        """
+        paths = [os.path.join(directory, f"{name}.npy") for name in _TABLE_NAMES]
+        if all(os.path.exists(path) for path in paths):
+            return cls(*(np.load(path, mmap_mode="r") for path in paths))
+
+        evaluator = cls.build()
+        try:
+            evaluator.save(directory)
+        except OSError:
+            return evaluator
+        return cls.load(directory)
+
+    def save(self, directory: str = DEFAULT_DIRECTORY):
+        """
+        Saves the tables as `.npy` files.
+
+        Args:
+            directory (str): Destination directory. It is created if needed.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name in _TABLE_NAMES:
+            # Write to a temporary file first, so that concurrent processes never load a partial table.
+            path = os.path.join(directory, f"{name}.npy")
+            temporary_path = f"{path}.{os.getpid()}.tmp"
+            with open(temporary_path, "wb") as file:
+                np.save(file, getattr(self, name))
+            os.replace(temporary_path, path)
+
+    def evaluate(self, cards: Iterable[pokerkit.Card | str | int]) -> int:
+        """
+        Evaluates a single hand.
+
+        Args:
+            cards (Iterable[pokerkit.Card | str | int]): 5 to 7 distinct cards (pokerkit cards, strings or codes).
+
+        Returns:
+            int: The rank of the hand in range [1, 7462], lower is better.
+        """
+        return self.evaluate_codes(card_codes(cards))
+
+    def evaluate_codes(self, codes: list[int]) -> int:
+        """
+        Evaluates a single hand given as card codes, without converting them (see `evaluate`).
+
+        Args:
+            codes (list[int]): 5 to 7 distinct card codes.
+
+        Returns:
+            int: The rank of the hand in range [1, 7462], lower is better.
+        """
+        if self.__rank_of_multiset is None:
+            self.__rank_of_multiset = dict(zip(self.multiset_keys.tolist(), self.multiset_ranks.tolist()))
+
+        masks = [0, 0, 0, 0]
+        key = 0
+        for code in codes:
+            masks[code & 3] |= 1 << (code >> 2)
+            key += 5 ** (code >> 2)
+
+        for mask in masks:
+            flush_rank = self.__flush_ranks_list[mask]
+            if flush_rank:
+                return flush_rank
+        return self.__rank_of_multiset[key]
+
+    def evaluate_batch(self, cards: np.ndarray) -> np.ndarray:
+        """
+        Evaluates an array of hands at once.
+
+        Args:
+            cards (np.ndarray): Integer card codes of shape (..., n_cards), where 5 <= n_cards <= 7. Hands with repeated
+                cards get an arbitrary rank.
+
+        Returns:
+            np.ndarray: Ranks of shape (...,), lower is better.
+        """
+        cards = np.asarray(cards)
+        ranks = cards >> 2
+        suits = (cards & 3).astype(np.int64)
+
+        # One bit per card (13 bits per suit). Cards are distinct, so summing the bits is the same as OR-ing them.
+        hand_masks = np.left_shift(np.int64(1), suits * 13 + ranks).sum(axis=-1)
+        suit_masks = (hand_masks[..., np.newaxis] >> _SUIT_SHIFTS) & 0x1FFF
+        # At most one suit can hold 5 or more cards, the others map to 0.
+        flush = self.flush_ranks[suit_masks].max(axis=-1)
+
+        keys = _POWERS_OF_5[ranks].sum(axis=-1, dtype=np.int32)
+        indices = np.minimum(np.searchsorted(self.multiset_keys, keys), len(self.multiset_keys) - 1)
+        non_flush = self.multiset_ranks[indices]
+
+        return np.where(flush > 0, flush, non_flush)
+
+
+# The evaluator shared by the whole process, loaded on first use.
+_default_evaluator = None
+
+
+def default_hand_evaluator() -> HandEvaluator:
+    """
+    Returns the evaluator shared by the current process, memory-mapping its tables on the first call.
+
+    Returns:
+        HandEvaluator: The shared evaluator.
+    """
+    global _default_evaluator  # pylint: disable=global-statement
+    if _default_evaluator is None:
+        _default_evaluator = HandEvaluator.load()
+    return _default_evaluator
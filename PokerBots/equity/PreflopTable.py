@@ -0,0 +1,185 @@
+"""
+Precomputed preflop win rates of the 169 starting-hand classes.
+
+Before the flop, the win rate only depends on the class of the hole cards (a pair, a suited or an offsuit combination
+of two ranks) and on the number of players. The table below stores it for 2 to 10 players, so that players can look
+it up instead of simulating.
+
+The table is a float32 array of shape (169, 9), where `table[hand_class, n_players - 2]` is the share of deals in
+which the hand is not beaten by any of the `n_players - 1` random hands (ties count as wins, as in GamblingPlayer).
+It is saved as a `.npy` file and memory-mapped read-only by the loader, so that all processes on a machine share the
+same pages.
+
+To rebuild the table shipped with the package, run:
+    python -m PokerBots.equity.PreflopTable --n-simulations 20000
+"""
+from __future__ import annotations
+import argparse
+import os
+import numpy as np
+import pokerkit
+from PokerBots.equity.cards import RANKS, card_code
+from PokerBots.equity.EquityEngine import EquityEngine
+
+MIN_PLAYERS = 2
+MAX_PLAYERS = 10
+N_HAND_CLASSES = 169
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "preflop_table.npy")
+
+
+def hand_class(first_card: pokerkit.Card | str | int, second_card: pokerkit.Card | str | int) -> int:
+    """
+    Computes the class of two hole cards.
+
+    Classes are the cells of a 13 x 13 grid: pairs on the diagonal, suited hands at (high rank, low rank) and
+    offsuit hands at (low rank, high rank).
+
+    Args:
+        first_card (pokerkit.Card | str | int): The first hole card (a pokerkit card, a string or a card code).
+        second_card (pokerkit.Card | str | int): The second hole card.
+
+    Returns:
+        int: The hand class in range [0, 169).
+    """
+    first, second = card_code(first_card), card_code(second_card)
+
+    high, low = max(first // 4, second // 4), min(first // 4, second // 4)
+    if first % 4 == second % 4:
+        return 13 * high + low
+    return 13 * low + high
+
+
+def hand_class_name(index: int) -> str:
+    """
+    Returns the usual name of a hand class, e.g. "AA", "AKs" or "72o".
+
+    Args:
+        index (int): The hand class in range [0, 169).
+
+    Returns:
+        str: The name of the class.
+    """
+    row, column = divmod(index, 13)
+    if row == column:
+        return RANKS[row] * 2
+    if row > column:
+        return f"{RANKS[row]}{RANKS[column]}s"
+    return f"{RANKS[column]}{RANKS[row]}o"
+
+
+def generate_preflop_table(n_simulations: int = 20_000, seed: int = 0) -> np.ndarray:
+    """
+    Simulates the win rate of every hand class for 2 to 10 players.
+
+    Args:
+        n_simulations (int): Number of simulations per hand class and number of players. Default is 20,000.
+        seed (int): Seed of the equity engine. Default is 0.
+
+    Returns:
+        np.ndarray: The table of shape (169, 9).
+    """
+    engine = EquityEngine(seed=seed)
+    table = np.empty((N_HAND_CLASSES, MAX_PLAYERS - MIN_PLAYERS + 1), dtype=np.float32)
+
+    for index in range(N_HAND_CLASSES):
+        row, column = divmod(index, 13)
+        # Representative cards: the suit is irrelevant, only whether both cards share it.
+        hole_cards = [4 * row, 4 * column + (0 if row > column else 1)]
+
+        for n_players in range(MIN_PLAYERS, MAX_PLAYERS + 1):
+            result = engine.estimate(hole_cards, [], n_players=n_players, n_simulations=n_simulations)
+            table[index, n_players - MIN_PLAYERS] = result.win_rate + result.tie_rate
+
+    return table
+
+
+class PreflopTable:
+    """
+    Read-only view of a preflop win-rate table.
+
+    Attributes:
+        table (np.ndarray): The (possibly memory-mapped) array of shape (169, 9).
+    """
+
+    def __init__(self, table: np.ndarray):
+        if table.shape != (N_HAND_CLASSES, MAX_PLAYERS - MIN_PLAYERS + 1):
+            raise ValueError(f"Preflop table must have shape (169, 9), got {table.shape}.")
+        self.table = table
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH) -> "PreflopTable":
+        """
+        Memory-maps a table saved with `save`.
+
+        Args:
+            path (str): Path to the `.npy` file. Default is the table shipped with the package.
+
+        Returns:
+            PreflopTable: The loaded table.
+        """
+        return cls(np.load(path, mmap_mode="r"))
+
+    def save(self, path: str = DEFAULT_PATH):
+        """
+        Saves the table as a `.npy` file.
+
+        Args:
+            path (str): Destination path. Default is the location of the table shipped with the package.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.save(path, np.asarray(self.table, dtype=np.float32))
+
+    def covers(self, n_players: int) -> bool:
+        """
+        Checks whether the table has win rates for the given number of players.
+
+        Args:
+            n_players (int): The number of active players.
+
+        Returns:
+            bool: True if 2 <= n_players <= 10.
+        """
+        return MIN_PLAYERS <= n_players <= MAX_PLAYERS
+
+    def win_rate(self, hole_cards: list[pokerkit.Card], n_players: int) -> float:
+        """
+        Looks up the preflop win rate of the hole cards.
+
+        Args:
+            hole_cards (list[pokerkit.Card]): The two cards in the player's hand.
+            n_players (int): The number of active players, between 2 and 10.
+
+        Returns:
+            float: The win rate (ties count as wins).
+        """
+        if not self.covers(n_players):
+            raise ValueError(f"Preflop table covers {MIN_PLAYERS} to {MAX_PLAYERS} players, got {n_players}.")
+        return float(self.table[hand_class(*hole_cards), n_players - MIN_PLAYERS])
+
+
+# The table shipped with the package, loaded on first use and shared by all players of the process.
+_default_table = None
+
+
+def default_preflop_table() -> PreflopTable:
+    """
+    Returns the table shipped with the package, memory-mapping it on the first call.
+
+    Returns:
+        PreflopTable: The shared table.
+    """
+    global _default_table  # pylint: disable=global-statement
+    if _default_table is None:
+        _default_table = PreflopTable.load()
+    return _default_table
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the preflop win-rate table.")
+    parser.add_argument("--n-simulations", type=int, default=20_000, help="Simulations per class and player count.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the equity engine.")
+    parser.add_argument("--output", default=DEFAULT_PATH, help="Destination .npy file.")
+    args = parser.parse_args()
+
+    PreflopTable(generate_preflop_table(n_simulations=args.n_simulations, seed=args.seed)).save(args.output)
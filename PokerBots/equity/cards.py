@@ -0,0 +1,56 @@
+"""
+Integer card codes shared by the equity tools.
+
+A card is encoded as `4 * rank + suit`, where ranks go from deuce (0) to ace (12) and suits are ordered as
+clubs (0), diamonds (1), hearts (2), spades (3). Hence, codes 0..51 follow the order "2c", "2d", "2h", "2s", ..., "As".
+"""
+from __future__ import annotations
+from collections.abc import Iterable
+import pokerkit
+
+RANKS = "23456789TJQKA"
+SUITS = "cdhs"
+
+CARD_STRINGS = tuple(f"{rank}{suit}" for rank in RANKS for suit in SUITS)
+
+# Precomputed mapping, so that converting a card is a single dictionary lookup. pokerkit cards are hashable and follow
+# the same order in the standard deck, and codes map to themselves.
+_CODE_OF_STRING = {card: code for code, card in enumerate(CARD_STRINGS)}
+_CODE_OF_CARD = {
+    **_CODE_OF_STRING,
+    **{card: code for code, card in enumerate(pokerkit.Deck.STANDARD)},
+    **{code: code for code in range(len(CARD_STRINGS))},
+}
+
+
+def card_code(card: pokerkit.Card | str | int) -> int:
+    """
+    Converts a pokerkit card (or its string representation, e.g. "As") to its integer code.
+
+    Args:
+        card (pokerkit.Card | str | int): The card to convert. Integer codes are returned unchanged.
+
+    Returns:
+        int: The code of the card in range [0, 52).
+    """
+    code = _CODE_OF_CARD.get(card)
+    if code is not None:
+        return code
+    if isinstance(card, str):
+        return _CODE_OF_STRING[card]
+    if isinstance(card, pokerkit.Card):
+        return _CODE_OF_STRING[f"{card.rank}{card.suit}"]
+    return int(card)
+
+
+def card_codes(cards: Iterable[pokerkit.Card | str | int]) -> list[int]:
+    """
+    Converts an iterable of pokerkit cards (or strings) to a list of integer codes.
+
+    Args:
+        cards (Iterable[pokerkit.Card | str | int]): The cards to convert.
+
+    Returns:
+        list[int]: The codes of the cards.
+    """
+    return [card_code(card) for card in cards]
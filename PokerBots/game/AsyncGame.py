@@ -0,0 +1,178 @@
+"""
+An asyncio version of Game, for bots that wait on I/O while deciding.
+
+Many AsyncGames can share one event loop (see `play_tables`): while a table waits on a slow bot, the others play on.
+"""
+from __future__ import annotations
+import asyncio
+from collections.abc import Callable
+from PokerBots.game.Deal import Deal
+from PokerBots.game.Game import Game
+from PokerBots.game.GameEvents import GameEvent
+from PokerBots.game.GameStats import GameStats
+from PokerBots.players.AsyncBasePlayer import AsyncBasePlayer
+from PokerBots.players.BasePlayer import BasePlayer
+from PokerBots.players.CallingPlayer import CallingPlayer
+from PokerBots.players.RandomPlayer import RandomPlayer
+from PokerBots.players.SyncPlayerAdapter import SyncPlayerAdapter
+
+
+class AsyncGame:
+    """
+    A game of No-Limit Texas Hold'em whose players decide with coroutines (see AsyncBasePlayer).
+
+    The rules, the dealing and the events are those of the wrapped Game: AsyncGame only awaits the decisions. A decision
+    that takes longer than `decision_timeout` is replaced by a check if checking is free, and by a fold otherwise.
+
+    Attributes:
+        game (Game): The wrapped game. Its players are the async players.
+        decision_timeout (float | None): Maximum time per decision in seconds, or None for no limit.
+        n_timeouts (dict[str, int]): Number of decisions that timed out, by player name.
+    """
+
+    def __init__(
+        self,
+        initial_stack: float = 30_000,
+        players: list[AsyncBasePlayer | BasePlayer] = None,
+        engine: str = "pokerkit",
+        *,
+        decision_timeout: float | None = None,
+        stats: GameStats | None = None,
+    ):
+        """
+        Initializes the game.
+
+        Args:
+            initial_stack (float): Starting chip count for each player. Default is 30,000.
+            players (list[AsyncBasePlayer | BasePlayer]): The players. Synchronous players are wrapped in a
+                SyncPlayerAdapter. Default is [RandomPlayer(), CallingPlayer()].
+            engine (str): "pokerkit" or "fast" (see Game). Default is "pokerkit".
+            decision_timeout (float | None): Maximum time per decision in seconds. Default is None (no limit).
+            stats (GameStats | None): Stats to record the timings of the hands into (see Game). Decision latencies
+                then include the time the event loop spent on other tables. Default is None.
+        """
+        if players is None:
+            players = [RandomPlayer(), CallingPlayer()]
+        players = [player if isinstance(player, AsyncBasePlayer) else SyncPlayerAdapter(player) for player in players]
+
+        self.game = Game(initial_stack=initial_stack, players=players, engine=engine, stats=stats)
+        self.decision_timeout = decision_timeout
+        self.n_timeouts = {}
+
+    @property
+    def players(self) -> list[AsyncBasePlayer]:
+        """
+        Players still in the game.
+        """
+        return self.game.players
+
+    @property
+    def stacks(self) -> list[float]:
+        """
+        Current stack of each player.
+        """
+        return self.game.stacks
+
+    @property
+    def n_hands(self) -> int:
+        """
+        Number of hands started so far.
+        """
+        return self.game.n_hands
+
+    def subscribe(self, subscriber: Callable[[GameEvent], None]) -> Callable[[GameEvent], None]:
+        """
+        Registers a callable that receives every event of the game (see `Game.subscribe`).
+
+        Args:
+            subscriber (Callable[[GameEvent], None]): The callable.
+
+        Returns:
+            Callable[[GameEvent], None]: The subscriber, so that this method can be used as a decorator.
+        """
+        return self.game.subscribe(subscriber)
+
+    async def play_round(self, verbose: bool = True, deal: Deal | None = None) -> bool:
+        """
+        Plays a single round, awaiting the decisions of the players.
+
+        Args:
+            verbose (bool): If True, logs detailed information about the round. Default is True.
+            deal (Deal | None): Preset cards of the round. Default is None (cards are dealt from the shuffled deck).
+
+        Returns:
+            bool: True if the game is over, otherwise False.
+        """
+        decisions = self.game.play_round_step_by_step(verbose=verbose, deal=deal)
+        action = None
+        while True:
+            try:
+                player_index, valid_actions = decisions.send(action)
+            except StopIteration as stop:
+                return bool(stop.value)
+            action = await self.__decide(player_index, valid_actions)
+
+    async def play(self, rounds: int = 100, verbose: bool = False) -> int:
+        """
+        Plays rounds until the game is over, yielding to the other tables of the event loop after each hand.
+
+        Args:
+            rounds (int): Maximum number of rounds. Default is 100.
+            verbose (bool): If True, logs detailed information about the rounds. Default is False.
+
+        Returns:
+            int: The number of rounds played.
+        """
+        for round_number in range(1, rounds + 1):
+            is_over = await self.play_round(verbose=verbose)
+            # Decisions that do not wait on anything never suspend the coroutine: let the other tables play too.
+            await asyncio.sleep(0)
+            if is_over:
+                return round_number
+        return rounds
+
+    async def __decide(self, player_index: int, valid_actions: dict) -> tuple[str, float]:
+        """
+        Awaits the decision of a player, replacing it by a check or a fold once the timeout expires.
+        """
+        player = self.game.players[player_index]
+        state = self.game.view(player_index)
+        if self.decision_timeout is None:
+            return await player.play(valid_actions=valid_actions, state=state)
+
+        try:
+            async with asyncio.timeout(self.decision_timeout):
+                return await player.play(valid_actions=valid_actions, state=state)
+        except TimeoutError:
+            self.n_timeouts[player.name] = self.n_timeouts.get(player.name, 0) + 1
+            if valid_actions.get("check_or_call") == 0:
+                return "check_or_call", 0
+            return "fold", 0
+
+
+async def play_tables(games: list[AsyncGame], *, rounds: int = 100, max_concurrency: int | None = None) -> list[int]:
+    """
+    Plays several games concurrently in the running event loop.
+
+    Tables interleave whenever a decision waits, so the order of the draws from the `random` module (and therefore the
+    cards) depends on how long the bots take: seeded runs are only reproducible if no decision ever waits.
+
+    Args:
+        games (list[AsyncGame]): The games.
+        rounds (int): Maximum number of rounds per game. Default is 100.
+        max_concurrency (int | None): Maximum number of games playing at once (e.g. to bound the load on a model
+            server). Default is None (all of them).
+
+    Returns:
+        list[int]: The number of rounds played by each game.
+    """
+    if max_concurrency is None:
+        return list(await asyncio.gather(*(game.play(rounds) for game in games)))
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def play(game: AsyncGame) -> int:
+        async with semaphore:
+            return await game.play(rounds)
+
+    return list(await asyncio.gather(*(play(game) for game in games)))
@@ -0,0 +1,144 @@
+from __future__ import annotations
+import copy
+import random
+from collections import defaultdict
+from PokerBots.players.BasePlayer import BasePlayer
+from PokerBots.game.Game import Game
+from PokerBots.game.SimulationRunner import SimulationSummary
+from PokerBots.equity.EquityCache import shared_equity_cache
+
+
+class BatchSimulator:
+    """
+    Plays many independent tables in lockstep, so that each player makes its decisions for all tables at once.
+
+    The same player objects sit at every table. At each step, every table that waits for a decision advances by one
+    action: the tables are grouped by the player to act, and each player decides for its whole group with a single
+    `play_batch` call. Vectorized bots (see GamblingPlayer.play_batch) thus pay their overhead once per step instead of
+    once per table.
+
+    Attributes:
+        players (list[BasePlayer]): Template players, one per seat. Every run plays with fresh copies.
+        n_tables (int): Number of tables (independent games).
+        initial_stack (float): Starting chip count for each player.
+        rounds (int): Maximum number of rounds at each table.
+        engine (str): Engine of the tables ("pokerkit" or "fast").
+        seed (int): Seed of the `random` module for a run.
+    """
+
+    def __init__(
+        self,
+        players: list[BasePlayer],
+        *,
+        n_tables: int,
+        initial_stack: float = 30_000,
+        rounds: int = 100,
+        engine: str = "fast",
+        seed: int = 0,
+    ):
+        """
+        Initializes the simulator.
+
+        Args:
+            players (list[BasePlayer]): Template players, one per seat.
+            n_tables (int): Number of tables.
+            initial_stack (float): Starting chip count for each player. Default is 30,000.
+            rounds (int): Maximum number of rounds at each table. Default is 100.
+            engine (str): Engine of the tables. Default is "fast".
+            seed (int): Seed of the `random` module for a run. Default is 0.
+        """
+        if n_tables <= 0:
+            raise ValueError(f"n_tables must be positive, got {n_tables}.")
+
+        self.players = players
+        self.n_tables = n_tables
+        self.initial_stack = initial_stack
+        self.rounds = rounds
+        self.engine = engine
+        self.seed = seed
+
+    def run(self) -> SimulationSummary:
+        """
+        Plays all tables until each of them is over or has played `rounds` rounds.
+
+        Returns:
+            SimulationSummary: Per-seat results over all tables (one game per table).
+        """
+        random.seed(self.seed)
+        shared_equity_cache().clear()
+        players = copy.deepcopy(self.players)
+        seat_of = {id(player): seat for seat, player in enumerate(players)}
+
+        summary = SimulationSummary([player.name for player in players])
+        summary.n_games = self.n_tables
+
+        tables = [
+            _Table(Game(players=list(players), initial_stack=self.initial_stack, engine=self.engine), seat_of)
+            for _ in range(self.n_tables)
+        ]
+        waiting = [table for table in tables if table.start_round(summary, self.rounds)]
+
+        while waiting:
+            groups = defaultdict(list)
+            for table in waiting:
+                groups[id(table.actor)].append(table)
+
+            waiting = []
+            for group in groups.values():
+                actions = group[0].actor.play_batch(
+                    [(table.valid_actions, table.game.view(table.actor_index)) for table in group]
+                )
+                for table, action in zip(group, actions):
+                    if table.act(action, summary, self.rounds):
+                        waiting.append(table)
+
+        for table in tables:
+            final_stacks = {id(player): stack for player, stack in zip(table.game.players, table.game.stacks)}
+            for player, seat in zip(players, summary.players):
+                seat.final_stacks.append(final_stacks.get(id(player), 0))
+
+        return summary
+
+
+class _Table:
+    """
+    A game of a batch simulation, paused at its next decision.
+    """
+
+    def __init__(self, game: Game, seat_of: dict[int, int]):
+        self.game = game
+        self.seat_of = seat_of
+        self.rounds_played = 0
+        self.actor = None
+        self.actor_index = None
+        self.valid_actions = None
+
+        self.__decisions = None
+        self.__seats = None
+
+    def start_round(self, summary: SimulationSummary, max_rounds: int) -> bool:
+        """
+        Plays rounds until a player has to act. Returns False if the game is over instead.
+        """
+        self.__seats = [self.seat_of[id(player)] for player in self.game.players]
+        self.__decisions = self.game.play_round_step_by_step(verbose=False)
+        return self.__advance(None, summary, max_rounds)
+
+    def act(self, action: tuple[str, float], summary: SimulationSummary, max_rounds: int) -> bool:
+        """
+        Applies the action of the player to act and plays until the next decision. Returns False if the game is over.
+        """
+        return self.__advance(action, summary, max_rounds)
+
+    def __advance(self, action: tuple[str, float] | None, summary: SimulationSummary, max_rounds: int) -> bool:
+        try:
+            self.actor_index, self.valid_actions = self.__decisions.send(action)
+        except StopIteration as stop:
+            summary.record_hand(self.__seats, self.game.state.payoffs)
+            self.rounds_played += 1
+            if stop.value or self.rounds_played >= max_rounds:
+                return False
+            return self.start_round(summary, max_rounds)
+
+        self.actor = self.game.players[self.actor_index]
+        return True
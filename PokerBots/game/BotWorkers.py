@@ -0,0 +1,607 @@
+"""
+Bots hosted in worker processes, so that a bot that crashes, hangs or leaks can not take the game down.
+
+A `BotWorkerPool` starts long-lived worker processes and hands out `WorkerPlayer`s: ordinary players whose decisions
+are made by a copy of the bot in a worker. Workers are reused: releasing a player (or dropping it) gives its process
+back to the pool, and the next hosted bot is loaded into it instead of starting a new process.
+
+The game and a worker exchange length-prefixed messages over a pipe (see `multiprocessing.connection`). All integers
+are little-endian:
+
+- Load (parent to worker): type 2 (u8), then the pickled bot. The worker answers with a single byte once it is ready.
+- Decide (parent to worker): type 1 (u8), the number of observations k (u16), then k observations, each made of:
+  - a fixed part: actor index (u8), number of players n (u8), street index (u8), number of board cards b (u8),
+    statuses (u16, bit i set if player i is still in the hand), the amount to call (i32, -1 if the player can not
+    check or call), the minimum and maximum amounts to bet or raise to (i32, -1 if the player can not bet or raise),
+    the hand number (i32), the pot (i32), the minimum bet (i32) and the number of actions of the history h (u16);
+  - the 2 hole cards of the actor and the b board cards (u8 codes, see PokerBots.equity.cards);
+  - n stacks, n bets, n starting stacks, n antes and n blinds (i32);
+  - h actions of 6 bytes: the player index (u8), the street index times 4 plus the action (u8) and the amount (i32).
+- Actions (worker to parent): k actions of 5 bytes: the action (u8, 0 for fold, 1 for check or call, 2 for bet or
+  raise, 255 if the bot raised an exception or returned an action that can not be encoded) and the amount (i32).
+
+Amounts must fit in an i32: encoding an observation with a larger amount raises a ValueError.
+
+Only the actor's hole cards are sent: a hosted bot can not see the cards of its opponents. It receives the
+Observation of the decision if it observes (see `BasePlayer.observes`), and a `WireState` otherwise, which has the
+attributes of the game state that describe the table.
+"""
+from __future__ import annotations
+import multiprocessing
+import numbers
+import pickle
+import struct
+import weakref
+from multiprocessing.connection import Connection
+from multiprocessing.context import BaseContext
+import pokerkit
+from PokerBots.game.HandHistory import ACTIONS
+from PokerBots.game.Observation import Observation
+from PokerBots.players.BasePlayer import BasePlayer
+
+LOAD = 2
+DECIDE = 1
+
+ERROR = 255
+
+_MIN_AMOUNT = -2 ** 31
+_MAX_AMOUNT = 2 ** 31 - 1
+
+_CARDS = tuple(pokerkit.Deck.STANDARD)
+_ACTION_INDEX = {action: index for index, action in enumerate(ACTIONS)}
+
+_DECIDE = struct.Struct("<BH")
+_OBSERVATION = struct.Struct("<BBBBHiiiiiiH")
+_ACTION = struct.Struct("<Bi")
+_ERROR_ACTION = _ACTION.pack(ERROR, 0)
+# Variable parts of the observations, by number of players and of board cards, and histories by length.
+_BODIES = {}
+_HISTORIES = {}
+
+
+class WireState:
+    """
+    The table as a hosted bot sees it: the attributes of the game state (see FastState) that describe the table, with
+    only the actor's hole cards.
+
+    Attributes:
+        actor_index (int): Index of the player to act.
+        player_count (int): Number of players of the hand.
+        street_index (int): 0 (preflop) to 3 (river).
+        statuses (list[bool]): Whether each player is still in the hand.
+        stacks (list[int]): Stacks of the players.
+        bets (list[int]): Bets of the players on the current street.
+        hole_cards (list[list[pokerkit.Card]]): Hole cards of the players (empty for all but the actor).
+        board_cards (list[list[pokerkit.Card]]): The board, one card per entry (as in pokerkit states).
+        checking_or_calling_amount (int | None): The amount to call.
+        min_completion_betting_or_raising_to_amount (int | None): Minimum amount to bet or raise to.
+        max_completion_betting_or_raising_to_amount (int | None): Maximum amount to bet or raise to.
+    """
+
+    __slots__ = (
+        "actor_index",
+        "player_count",
+        "street_index",
+        "statuses",
+        "stacks",
+        "bets",
+        "hole_cards",
+        "board_cards",
+        "checking_or_calling_amount",
+        "min_completion_betting_or_raising_to_amount",
+        "max_completion_betting_or_raising_to_amount",
+    )
+
+    def __repr__(self):
+        return (
+            f"WireState(actor_index={self.actor_index}, hole_cards={self.hole_cards[self.actor_index]}, "
+            f"board_cards={self.board_cards}, stacks={self.stacks})"
+        )
+
+
+def _body(n_players: int, n_board_cards: int) -> struct.Struct:
+    body = _BODIES.get((n_players, n_board_cards))
+    if body is None:
+        body = _BODIES[n_players, n_board_cards] = struct.Struct(f"<{2 + n_board_cards}B{5 * n_players}i")
+    return body
+
+
+def _history(n_actions: int) -> struct.Struct:
+    history = _HISTORIES.get(n_actions)
+    if history is None:
+        history = _HISTORIES[n_actions] = struct.Struct("<" + "BBi" * n_actions)
+    return history
+
+
+def encode_observations(observations: list[tuple[dict, Observation]]) -> bytes:
+    """
+    Encodes a decide message.
+
+    Args:
+        observations (list[tuple[dict, Observation]]): The valid actions and the observation of each decision.
+
+    Returns:
+        bytes: The message.
+    """
+    parts = [_DECIDE.pack(DECIDE, len(observations))]
+    for valid_actions, observation in observations:
+        call = valid_actions.get("check_or_call", -1)
+        min_raise, max_raise = valid_actions.get("complete_bet_or_raise_to", (-1, -1))
+        statuses = 0
+        for index, status in enumerate(observation.statuses):
+            if status:
+                statuses |= 1 << index
+        history = observation.history
+        _check_amounts(
+            call, min_raise, max_raise, observation.hand_number, observation.pot, observation.min_bet,
+            *observation.stacks, *observation.bets, *observation.starting_stacks, *observation.antes,
+            *observation.blinds_or_straddles, *[amount for _, _, _, amount in history],
+        )
+
+        parts.append(_OBSERVATION.pack(
+            observation.actor_index,
+            observation.player_count,
+            observation.street_index,
+            len(observation.board_codes),
+            statuses,
+            call,
+            min_raise,
+            max_raise,
+            observation.hand_number,
+            observation.pot,
+            observation.min_bet,
+            len(history),
+        ))
+        parts.append(_body(observation.player_count, len(observation.board_codes)).pack(
+            *observation.hole_codes,
+            *observation.board_codes,
+            *observation.stacks,
+            *observation.bets,
+            *observation.starting_stacks,
+            *observation.antes,
+            *observation.blinds_or_straddles,
+        ))
+        if history:
+            parts.append(_history(len(history)).pack(*[
+                value
+                for player_index, street_index, action_index, amount in history
+                for value in (player_index, 4 * street_index + action_index, round(amount))
+            ]))
+    return b"".join(parts)
+
+
+def _check_amounts(*amounts: float):
+    """
+    Raises a ValueError if an amount does not fit in the i32 fields of the messages.
+    """
+    if min(amounts) < _MIN_AMOUNT or max(amounts) > _MAX_AMOUNT:
+        raise ValueError(
+            f"Invalid amounts: {[amount for amount in amounts if not _MIN_AMOUNT <= amount <= _MAX_AMOUNT]}. Hosted "
+            f"bots only play with amounts from {_MIN_AMOUNT} to {_MAX_AMOUNT}."
+        )
+
+
+def decode_observations(message: bytes) -> list[tuple[dict, Observation]]:
+    """
+    Decodes a decide message.
+
+    Args:
+        message (bytes): The message.
+
+    Returns:
+        list[tuple[dict, Observation]]: The valid actions and the observation of each decision.
+    """
+    _, n_observations = _DECIDE.unpack_from(message)
+    offset = _DECIDE.size
+    observations = []
+    for _ in range(n_observations):
+        (
+            actor_index, n_players, street_index, n_board_cards, statuses, call, min_raise, max_raise, hand_number, pot,
+            min_bet, n_actions,
+        ) = _OBSERVATION.unpack_from(message, offset)
+        offset += _OBSERVATION.size
+        body = _body(n_players, n_board_cards)
+        values = body.unpack_from(message, offset)
+        offset += body.size
+        history = _history(n_actions)
+        actions = history.unpack_from(message, offset)
+        offset += history.size
+
+        valid_actions = {"fold": 0}
+        if call >= 0:
+            valid_actions["check_or_call"] = call
+        if min_raise >= 0:
+            valid_actions["complete_bet_or_raise_to"] = (min_raise, max_raise)
+
+        per_player = [values[start:start + n_players] for start in range(2 + n_board_cards, len(values), n_players)]
+        observation = Observation(
+            hand_number,
+            actor_index,
+            n_players,
+            street_index,
+            hole_codes=values[:2],
+            board_codes=values[2:2 + n_board_cards],
+            stacks=per_player[0],
+            bets=per_player[1],
+            pot=pot,
+            statuses=tuple(bool(statuses >> index & 1) for index in range(n_players)),
+            history=tuple(
+                (actions[index], actions[index + 1] >> 2, actions[index + 1] & 3, actions[index + 2])
+                for index in range(0, len(actions), 3)
+            ),
+            starting_stacks=per_player[2],
+            antes=per_player[3],
+            blinds_or_straddles=per_player[4],
+            min_bet=min_bet,
+        )
+        observations.append((valid_actions, observation))
+    return observations
+
+
+def _wire_state(valid_actions: dict, observation: Observation) -> WireState:
+    """
+    Converts an observation to the state a hosted bot that does not observe receives.
+
+    Args:
+        valid_actions (dict): The valid actions of the decision.
+        observation (Observation): The observation.
+
+    Returns:
+        WireState: The state.
+    """
+    state = WireState()
+    state.actor_index = observation.actor_index
+    state.player_count = observation.player_count
+    state.street_index = observation.street_index
+    state.statuses = list(observation.statuses)
+    state.stacks = list(observation.stacks)
+    state.bets = list(observation.bets)
+    state.hole_cards = [[] for _ in range(observation.player_count)]
+    state.hole_cards[observation.actor_index] = [_CARDS[code] for code in observation.hole_codes]
+    state.board_cards = [[_CARDS[code]] for code in observation.board_codes]
+
+    min_raise, max_raise = valid_actions.get("complete_bet_or_raise_to", (None, None))
+    state.checking_or_calling_amount = valid_actions.get("check_or_call")
+    state.min_completion_betting_or_raising_to_amount = min_raise
+    state.max_completion_betting_or_raising_to_amount = max_raise
+    return state
+
+
+def _decide(bot: BasePlayer, observations: list[tuple[dict, Observation]]) -> bytes:
+    """
+    Asks a hosted bot for its actions and encodes them. If the bot raises an exception or does not return an action
+    per observation, all its actions are error actions; an action that can not be encoded is an error action.
+    """
+    if not bot.observes:
+        observations = [
+            (valid_actions, _wire_state(valid_actions, observation)) for valid_actions, observation in observations
+        ]
+    try:
+        actions = list(bot.play_batch(observations))
+    except Exception:  # The bot's own code can raise anything: it is what the worker isolates the game from.
+        return _ERROR_ACTION * len(observations)
+    if len(actions) != len(observations):
+        return _ERROR_ACTION * len(observations)
+    return b"".join(_encoded_action(action) for action in actions)
+
+
+def _encoded_action(action: tuple[str, float]) -> bytes:
+    """
+    Encodes an action of a hosted bot, or returns an error action if it is not an action with an i32 amount.
+    """
+    if not isinstance(action, tuple) or len(action) != 2:
+        return _ERROR_ACTION
+    action, amount = action
+    action_index = _ACTION_INDEX.get(action) if isinstance(action, str) else None
+    if action_index is None or not isinstance(amount, numbers.Real) or not _MIN_AMOUNT <= amount <= _MAX_AMOUNT:
+        return _ERROR_ACTION
+    return _ACTION.pack(action_index, round(amount))
+
+
+def _serve(connection: Connection):
+    """
+    Main loop of a worker process: loads bots and answers decide messages until the pipe is closed.
+    """
+    bot = None
+    while True:
+        try:
+            message = connection.recv_bytes()
+        except (EOFError, OSError):
+            return
+
+        if message[0] == LOAD:
+            bot = pickle.loads(message[1:])
+            connection.send_bytes(b"\x01")
+        else:
+            connection.send_bytes(_decide(bot, decode_observations(message)))
+
+
+class _Worker:
+    """
+    A worker process and the parent's end of its pipe.
+    """
+
+    def __init__(self, context: BaseContext):
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(target=_serve, args=(child_connection,), daemon=True)
+        self.process.start()
+        child_connection.close()
+
+    def load(self, bot_bytes: bytes, timeout: float) -> bool:
+        """
+        Loads a bot into the worker and waits until it is ready.
+        """
+        try:
+            self.connection.send_bytes(bytes([LOAD]) + bot_bytes)
+            return self.connection.poll(timeout) and self.connection.recv_bytes() == b"\x01"
+        except (EOFError, OSError):
+            return False
+
+    def stop(self):
+        """
+        Closes the pipe and kills the process if it does not exit at once.
+        """
+        self.connection.close()
+        self.process.join(timeout=0.1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+
+
+class _Slot:
+    """
+    The worker of a WorkerPlayer. The pool keeps the slots, not the players, so that it can recycle the worker of a
+    player that is garbage collected.
+    """
+
+    __slots__ = ("worker", "__weakref__")
+
+    def __init__(self):
+        self.worker = None
+
+
+class WorkerPlayer(BasePlayer):
+    """
+    A player whose decisions are made by a copy of a bot hosted in a worker process (see BotWorkerPool.host).
+
+    The worker is started (or taken from the idle workers of the pool) at the first decision, and goes back to the
+    pool when the player is released or garbage collected. Copying the player (e.g. as SimulationRunner and
+    BatchSimulator do with their players) hosts a fresh copy of the bot in another worker.
+
+    A decision that takes longer than `timeout`, a worker that dies, a bot that raises an exception and an invalid
+    action all make the player check if checking is free and fold otherwise. A worker that timed out or died is
+    stopped, and a fresh copy of the bot is started for the next decision.
+
+    Attributes:
+        name (str): Name of the bot.
+        timeout (float): Maximum time per decision (or per `play_batch` call) in seconds.
+        n_decisions (int): Number of decisions asked.
+        n_timeouts (int): Number of calls that timed out.
+        n_crashes (int): Number of times the worker died (or could not load the bot).
+        n_errors (int): Number of decisions for which the bot raised an exception or returned an invalid action.
+    """
+
+    observes = True
+
+    def __init__(self, pool: BotWorkerPool, bot_bytes: bytes, *, name: str, timeout: float):
+        super().__init__(name=name)
+        self.timeout = timeout
+        self.n_decisions = 0
+        self.n_timeouts = 0
+        self.n_crashes = 0
+        self.n_errors = 0
+        self.__pool = pool
+        self.__bot_bytes = bot_bytes
+        self.__slot = pool.register(self)
+
+    def play(self, valid_actions: dict[str, float], state: Observation) -> tuple[str, float]:
+        return self.play_batch([(valid_actions, state)])[0]
+
+    def play_batch(self, observations: list[tuple[dict[str], Observation]]) -> list[tuple[str, float]]:
+        """
+        Asks the hosted bot for its actions at several tables in a single message (see `BasePlayer.play_batch`).
+
+        Args:
+            observations (list[tuple[dict[str], Observation]]): The valid actions and the observation of each
+                table.
+
+        Returns:
+            list[tuple[str, float]]: The action and amount chosen at each table, in the same order.
+        """
+        self.n_decisions += len(observations)
+        replies = self.__ask(encode_observations(observations))
+        if replies is None:
+            return [_fallback(valid_actions) for valid_actions, _ in observations]
+
+        actions = []
+        for index, (valid_actions, _) in enumerate(observations):
+            action_index, amount = _ACTION.unpack_from(replies, index * _ACTION.size)
+            action = _checked_action(valid_actions, action_index, amount)
+            if action is None:
+                self.n_errors += 1
+                action = _fallback(valid_actions)
+            actions.append(action)
+        return actions
+
+    def __ask(self, message: bytes) -> bytes | None:
+        """
+        Sends a decide message and waits for the actions. Returns None if the worker timed out or died.
+        """
+        slot = self.__slot
+        if slot.worker is None:
+            slot.worker = self.__pool.acquire_worker(self.__bot_bytes)
+            if slot.worker is None:
+                self.n_crashes += 1
+                return None
+
+        connection = slot.worker.connection
+        try:
+            connection.send_bytes(message)
+            if connection.poll(self.timeout):
+                return connection.recv_bytes()
+            self.n_timeouts += 1
+        except (EOFError, OSError):
+            self.n_crashes += 1
+
+        slot.worker.stop()
+        slot.worker = None
+        return None
+
+    def release(self):
+        """
+        Gives the worker back to the pool, so that the next hosted bot reuses its process. The player can still play:
+        it then gets a fresh copy of its bot.
+        """
+        self.__pool.recycle(self.__slot)
+
+    def __deepcopy__(self, memo: dict) -> WorkerPlayer:
+        return self.__pool.host_pickled(self.__bot_bytes, name=self.name, timeout=self.timeout)
+
+    def __reduce__(self):
+        raise TypeError("A WorkerPlayer can not be pickled: host the bot in a pool of the other process instead.")
+
+
+def _checked_action(valid_actions: dict, action_index: int, amount: int) -> tuple[str, int] | None:
+    """
+    Decodes an action, or returns None if it is an error or is not valid.
+    """
+    if action_index >= len(ACTIONS):
+        return None
+    action = ACTIONS[action_index]
+    if action not in valid_actions:
+        return None
+    if action == "complete_bet_or_raise_to":
+        min_amount, max_amount = valid_actions[action]
+        if not min_amount <= amount <= max_amount:
+            return None
+    return action, amount
+
+
+def _fallback(valid_actions: dict) -> tuple[str, float]:
+    """
+    The action of a bot that failed to decide: check if it is free, fold otherwise.
+    """
+    if valid_actions.get("check_or_call") == 0:
+        return "check_or_call", 0
+    return "fold", 0
+
+
+class BotWorkerPool:
+    """
+    Long-lived worker processes hosting bots (see WorkerPlayer).
+
+    Attributes:
+        timeout (float): Default maximum time per decision in seconds.
+        load_timeout (float): Maximum time to start a worker and load a bot into it, in seconds.
+        n_started (int): Number of worker processes started so far.
+    """
+
+    def __init__(self, *, timeout: float = 1.0, load_timeout: float = 30.0, start_method: str | None = None):
+        """
+        Initializes an empty pool. Workers are started when hosted bots first decide.
+
+        Args:
+            timeout (float): Default maximum time per decision in seconds. Default is 1.0.
+            load_timeout (float): Maximum time to start a worker and load a bot into it, in seconds. Default is 30.0.
+            start_method (str | None): Start method of the processes ("fork", "spawn" or "forkserver"). Default is
+                None (the default of the platform).
+        """
+        self.timeout = timeout
+        self.load_timeout = load_timeout
+        self.n_started = 0
+        self.__context = multiprocessing.get_context(start_method)
+        self.__idle_workers = []
+        self.__slots = weakref.WeakSet()
+
+    def host(self, bot: BasePlayer, *, timeout: float | None = None) -> WorkerPlayer:
+        """
+        Hosts a copy of a bot in a worker process.
+
+        Args:
+            bot (BasePlayer): The bot. It must be picklable. Its copy keeps its state between decisions.
+            timeout (float | None): Maximum time per decision in seconds. Default is None (the pool's timeout).
+
+        Returns:
+            WorkerPlayer: The player to seat in games.
+        """
+        return self.host_pickled(pickle.dumps(bot), name=bot.name, timeout=timeout)
+
+    def host_pickled(self, bot_bytes: bytes, *, name: str, timeout: float | None = None) -> WorkerPlayer:
+        """
+        Hosts a pickled bot in a worker process (see `host`).
+
+        Args:
+            bot_bytes (bytes): The pickled bot.
+            name (str): Name of the bot.
+            timeout (float | None): Maximum time per decision in seconds. Default is None (the pool's timeout).
+
+        Returns:
+            WorkerPlayer: The player to seat in games.
+        """
+        return WorkerPlayer(self, bot_bytes, name=name, timeout=self.timeout if timeout is None else timeout)
+
+    def register(self, player: WorkerPlayer) -> _Slot:
+        """
+        Creates the slot of a new player, whose worker is recycled when the player is garbage collected.
+
+        Args:
+            player (WorkerPlayer): The player.
+
+        Returns:
+            _Slot: The slot.
+        """
+        slot = _Slot()
+        self.__slots.add(slot)
+        weakref.finalize(player, self.recycle, slot)
+        return slot
+
+    def acquire_worker(self, bot_bytes: bytes) -> _Worker | None:
+        """
+        Loads a pickled bot into an idle worker, or into a new one if none is idle.
+
+        Args:
+            bot_bytes (bytes): The pickled bot.
+
+        Returns:
+            _Worker | None: The worker, or None if it could not load the bot.
+        """
+        worker = self.__idle_workers.pop() if self.__idle_workers else None
+        if worker is None or not worker.process.is_alive():
+            if worker is not None:
+                worker.stop()
+            worker = _Worker(self.__context)
+            self.n_started += 1
+
+        if worker.load(bot_bytes, self.load_timeout):
+            return worker
+        worker.stop()
+        return None
+
+    def recycle(self, slot: _Slot):
+        """
+        Makes the worker of a slot idle, so that the next hosted bot reuses its process.
+
+        Args:
+            slot (_Slot): The slot of a player of this pool.
+        """
+        if slot.worker is not None:
+            self.__idle_workers.append(slot.worker)
+            slot.worker = None
+
+    def close(self):
+        """
+        Stops all the workers.
+        """
+        for slot in list(self.__slots):
+            if slot.worker is not None:
+                slot.worker.stop()
+                slot.worker = None
+        for worker in self.__idle_workers:
+            worker.stop()
+        self.__idle_workers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,52 @@
+from __future__ import annotations
+from collections.abc import Iterable
+import pokerkit
+from pokerkit import Deck
+from PokerBots.equity.cards import card_code
+
+# pokerkit cards indexed by card code.
+_CARDS = tuple(Deck.STANDARD)
+
+
+def _clean_cards(cards: Iterable[pokerkit.Card | str | int]) -> tuple[pokerkit.Card, ...]:
+    return tuple(_CARDS[card_code(card)] for card in cards)
+
+
+class Deal:
+    """
+    The preset cards of a hand, to play it again with the same cards (see `Game.play_round`).
+
+    Attributes:
+        hole_cards (tuple[tuple[pokerkit.Card, ...], ...]): Hole cards of each player of the hand, in seat order.
+        board_cards (tuple[pokerkit.Card, ...]): Board cards, up to 5. If the hand needs more, they are dealt from the
+            deck.
+        burn_cards (tuple[pokerkit.Card, ...] | None): Card burnt before each of the flop, the turn and the river, or
+            None to burn unknown cards (they do not change the hand).
+    """
+
+    __slots__ = ("hole_cards", "board_cards", "burn_cards")
+
+    def __init__(
+        self,
+        hole_cards: Iterable[Iterable[pokerkit.Card | str | int]],
+        board_cards: Iterable[pokerkit.Card | str | int] = (),
+        burn_cards: Iterable[pokerkit.Card | str | int] | None = None,
+    ):
+        """
+        Initializes the deal. Cards can be pokerkit cards, strings (e.g. "As") or card codes.
+
+        Args:
+            hole_cards (Iterable[Iterable[pokerkit.Card | str | int]]): Hole cards of each player.
+            board_cards (Iterable[pokerkit.Card | str | int]): Board cards. Default is none.
+            burn_cards (Iterable[pokerkit.Card | str | int] | None): Burnt cards. Default is None (unknown cards).
+        """
+        self.hole_cards = tuple(_clean_cards(cards) for cards in hole_cards)
+        self.board_cards = _clean_cards(board_cards)
+        self.burn_cards = None if burn_cards is None else _clean_cards(burn_cards)
+
+        dealt = [card for cards in self.hole_cards for card in cards] + list(self.board_cards)
+        if len(set(dealt)) != len(dealt):
+            raise ValueError(f"A card is dealt twice in {dealt}.")
+
+    def __repr__(self):
+        return f"Deal(hole_cards={self.hole_cards}, board_cards={self.board_cards}, burn_cards={self.burn_cards})"
@@ -0,0 +1,202 @@
+"""
+Duplicate evaluation of two bots heads-up, with a sequential test that stops as soon as the winner is clear.
+
+Every deal is played twice: once with bot A in the first seat, once with bot B in it, each seat keeping its cards. The
+score of a pair of hands is what A won over both, so the luck of the cards (which seat got the good hand or the good
+runout) cancels out, and far fewer hands are needed to tell the bots apart than with independent hands.
+
+After each pair, a mixture sequential probability ratio test (mSPRT) checks whether the mean score differs from 0.
+Its p-value is valid whenever the evaluation stops, so looking at it after every pair does not inflate the error rate,
+unlike repeating a fixed-sample test.
+"""
+from __future__ import annotations
+import copy
+import math
+import random
+from pokerkit import Deck
+from PokerBots.game.Deal import Deal
+from PokerBots.game.Game import Game
+from PokerBots.players.BasePlayer import BasePlayer
+from PokerBots.equity.EquityCache import shared_equity_cache
+
+_CARDS = tuple(Deck.STANDARD)
+
+
+def msprt_likelihood_ratio(n_samples: int, mean: float, variance: float, mixture_variance: float) -> float:
+    """
+    Computes the mixture likelihood ratio of normal samples against the hypothesis that their mean is 0.
+
+    The alternative means follow a normal mixture N(0, mixture_variance), and the variance of the samples is taken as
+    known (the running estimate is plugged in).
+
+    Args:
+        n_samples (int): Number of samples.
+        mean (float): Mean of the samples.
+        variance (float): Variance of the samples (positive).
+        mixture_variance (float): Variance of the mixture over the alternative means (positive).
+
+    Returns:
+        float: The likelihood ratio. The hypothesis is rejected at level alpha once it reaches 1 / alpha.
+    """
+    spread = variance + n_samples * mixture_variance
+    exponent = n_samples * n_samples * mixture_variance * mean * mean / (2 * variance * spread)
+    return math.sqrt(variance / spread) * math.exp(min(exponent, 700.0))
+
+
+class DuplicateResult:
+    """
+    Outcome of a duplicate evaluation, from the point of view of bot A.
+
+    Attributes:
+        names (tuple[str, str]): Names of bots A and B.
+        n_pairs (int): Number of deals played (twice each).
+        mean (float): Mean chips won by A per pair of hands.
+        std_error (float): Standard error of the mean.
+        p_value (float): Always-valid p-value of the hypothesis that both bots are as good.
+        winner (str | None): Name of the better bot, or None if the difference is not significant.
+    """
+
+    def __init__(
+        self, names: tuple[str, str], n_pairs: int, *, mean: float, std_error: float, p_value: float, winner: str | None
+    ):
+        self.names = names
+        self.n_pairs = n_pairs
+        self.mean = mean
+        self.std_error = std_error
+        self.p_value = p_value
+        self.winner = winner
+
+    @property
+    def n_hands(self) -> int:
+        """
+        Number of hands played.
+        """
+        return 2 * self.n_pairs
+
+    @property
+    def chips_won_per_hand(self) -> float:
+        """
+        Mean chips won by A per hand.
+        """
+        return self.mean / 2
+
+    def __repr__(self):
+        return (
+            f"DuplicateResult(names={self.names}, n_hands={self.n_hands}, "
+            f"chips_won_per_hand={self.chips_won_per_hand:.1f}, p_value={self.p_value:.4f}, winner={self.winner!r})"
+        )
+
+
+class DuplicateEvaluator:
+    """
+    Compares two bots heads-up with duplicate hands and a sequential test (see the module documentation).
+
+    Every hand starts with fresh stacks. The `random` module is seeded with `seed + pair` before each hand of a pair,
+    and the deals are drawn from their own generator, so an evaluation is reproducible and both bots see the same
+    deals, whatever they draw.
+
+    Attributes:
+        players (tuple[BasePlayer, BasePlayer]): Bots A and B. Copies of them play, so the originals are not changed.
+        initial_stack (float): Stack of both bots at the start of every hand.
+        engine (str): Engine of the games ("pokerkit" or "fast").
+        confidence (float): Confidence required to declare a winner.
+        max_hands (int): Maximum number of hands to play.
+        min_pairs (int): Number of pairs played before testing, so that the variance estimate is sound.
+        effect_size (float): Typical difference between the bots, in standard deviations of a pair score. It sets the
+            mixture of the test: the test is most sensitive to differences of about this size.
+        seed (int): Seed of the evaluation.
+    """
+
+    def __init__(
+        self,
+        player_a: BasePlayer,
+        player_b: BasePlayer,
+        *,
+        initial_stack: float = 30_000,
+        engine: str = "fast",
+        confidence: float = 0.95,
+        max_hands: int = 100_000,
+        min_pairs: int = 100,
+        effect_size: float = 0.1,
+        seed: int = 0,
+    ):
+        """
+        Initializes the evaluation.
+
+        Args:
+            player_a (BasePlayer): Bot A.
+            player_b (BasePlayer): Bot B. It must have another name than A.
+            initial_stack (float): Stack of both bots at the start of every hand. Default is 30,000.
+            engine (str): Engine of the games. Default is "fast".
+            confidence (float): Confidence required to declare a winner. Default is 0.95.
+            max_hands (int): Maximum number of hands to play. Default is 100,000.
+            min_pairs (int): Number of pairs played before testing. Default is 100.
+            effect_size (float): Typical difference between the bots, in standard deviations of a pair score.
+                Default is 0.1.
+            seed (int): Seed of the evaluation. Default is 0.
+        """
+        if player_a.name == player_b.name:
+            raise ValueError(f"Both players are named {player_a.name!r}: give them different names.")
+
+        self.players = (player_a, player_b)
+        self.initial_stack = initial_stack
+        self.engine = engine
+        self.confidence = confidence
+        self.max_hands = max_hands
+        self.min_pairs = min_pairs
+        self.effect_size = effect_size
+        self.seed = seed
+
+    def run(self) -> DuplicateResult:
+        """
+        Plays pairs of hands until the winner is significant or `max_hands` hands were played.
+
+        Returns:
+            DuplicateResult: The result.
+        """
+        shared_equity_cache().clear()
+        player_a, player_b = copy.deepcopy(self.players)
+        deals = random.Random(self.seed)
+        threshold = 1 / (1 - self.confidence)
+
+        n_pairs = 0
+        mean = sum_of_squares = 0.0
+        p_value = 1.0
+        while 2 * (n_pairs + 1) <= self.max_hands:
+            cards = deals.sample(_CARDS, 9)
+            deal = Deal(hole_cards=(cards[:2], cards[2:4]), board_cards=cards[4:])
+
+            random.seed(self.seed + n_pairs)
+            score = self.__play_hand([player_a, player_b], deal)[0]
+            random.seed(self.seed + n_pairs)
+            score += self.__play_hand([player_b, player_a], deal)[1]
+
+            # Welford's update of the mean and the sum of squared deviations.
+            n_pairs += 1
+            delta = score - mean
+            mean += delta / n_pairs
+            sum_of_squares += delta * (score - mean)
+
+            if n_pairs < self.min_pairs or sum_of_squares <= 0:
+                continue
+            variance = sum_of_squares / (n_pairs - 1)
+            ratio = msprt_likelihood_ratio(n_pairs, mean, variance, self.effect_size ** 2 * variance)
+            p_value = min(p_value, 1 / ratio)
+            if ratio >= threshold:
+                break
+
+        std_error = math.sqrt(sum_of_squares / (n_pairs - 1) / n_pairs) if n_pairs > 1 else 0.0
+        winner = None
+        if p_value <= 1 - self.confidence:
+            winner = player_a.name if mean > 0 else player_b.name
+        return DuplicateResult(
+            (player_a.name, player_b.name), n_pairs, mean=mean, std_error=std_error, p_value=p_value, winner=winner
+        )
+
+    def __play_hand(self, players: list[BasePlayer], deal: Deal) -> list[int]:
+        """
+        Plays one hand with fresh stacks and returns the payoffs of the seats.
+        """
+        game = Game(initial_stack=self.initial_stack, players=list(players), engine=self.engine)
+        game.play_round(verbose=False, deal=deal)
+        return list(game.state.payoffs)
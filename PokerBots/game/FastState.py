@@ -0,0 +1,652 @@
+"""
+Lightweight no-limit Texas hold'em state for bot-vs-bot simulation.
+
+`FastState` implements the subset of the `pokerkit.State` API that `Game` and the bots use (the actor, the valid
+actions and their amounts, dealing, stacks and payoffs), with the same automations as `Game`: antes, bet collection,
+blinds, showdown, hand killing, chips pushing and chips pulling happen by themselves.
+
+Everything else is dropped: no operation log, no generic streets or hand types, no card objects inside the engine.
+Stacks, bets and payoffs are plain lists of ints, the deck is a list of card codes (see `PokerBots.equity.cards`) and
+hands are ranked with the table-driven `HandEvaluator`. Bots still see `pokerkit.Card` objects in `hole_cards` and
+`board_cards`, and the codes are kept alongside in `hole_codes` and `board_codes`.
+
+The rules follow pokerkit exactly (including how antes are trimmed, who opens each street, which hands are mucked at
+showdown and who gets the odd chips of a split pot), and the deck is shuffled with the same `random.shuffle` call on
+the same initial order. Hence, under the same seed, a game played with `Game(engine="fast")` deals the same cards and
+ends every hand with the same stacks as with the default pokerkit engine.
+
+Search-based bots simulate many continuations of a hand: `fork` copies a state mid-hand for a few microseconds, and
+`determinize` redraws the cards a player can not see. A state created with a generator of its own (`rng`) draws from it
+only, and leaves `random` untouched.
+"""
+from __future__ import annotations
+import random
+from collections.abc import Iterable
+from pokerkit import Card, Deck
+from PokerBots.equity.HandEvaluator import default_hand_evaluator
+from PokerBots.equity.cards import card_code
+
+# pokerkit cards indexed by card code. The standard deck is ordered by rank, then by suit, just like the codes.
+_CARDS = tuple(Deck.STANDARD)
+# A card that can be burnt without being known (as in pokerkit).
+_UNKNOWN_CARD = next(Card.parse("??"))
+
+# Number of board cards dealt on each street: preflop, flop, turn and river.
+_BOARD_DEALING_COUNTS = (0, 3, 1, 1)
+_RIVER = len(_BOARD_DEALING_COUNTS) - 1
+_HOLE_CARD_COUNT = 2
+# Most cards drawn from the deck after the hole cards: the board and a burnt card before each of the last 3 streets.
+_MAX_CARDS_TO_DEAL = sum(_BOARD_DEALING_COUNTS) + 3
+
+
+def _clean_values(values: int | tuple[int, ...], count: int) -> tuple[int, ...]:
+    """
+    Expands a single value or pads a sequence of values with zeros to one value per player (as pokerkit does).
+    """
+    if isinstance(values, int):
+        return (values,) * count
+    values = tuple(values)[:count]
+    return values + (0,) * (count - len(values))
+
+
+class FastState:  # pylint: disable=too-many-instance-attributes
+    """
+    Array-backed state of a single hand of no-limit Texas hold'em with uniform antes.
+
+    Attributes:
+        player_count (int): Number of players.
+        antes (tuple[int, ...]): Ante of each player.
+        blinds_or_straddles (tuple[int, ...]): Blind of each player (in heads-up, player 0 posts the second one).
+        min_bet (int): Minimum bet.
+        starting_stacks (tuple[int, ...]): Stacks at the start of the hand.
+        deck_cards (list[int]): Codes of the cards left in the deck, the next card first.
+        statuses (list[bool]): Whether each player is still in the hand.
+        bets (list[int]): Bet of each player in the current street.
+        stacks (list[int]): Stack of each player.
+        payoffs (list[int]): Net amount of chips won by each player so far.
+        hole_cards (list[list[pokerkit.Card]]): Hole cards of each player (cleared when they fold or muck).
+        board_cards (list[list[pokerkit.Card]]): Board cards, one single-card list per position (as in pokerkit).
+        hole_codes (list[list[int]]): Codes of the hole cards of each player (cleared when they fold or muck).
+        board_codes (list[int]): Codes of the board cards.
+        burn_cards (list[pokerkit.Card]): Burnt cards.
+        mucked_cards (list[pokerkit.Card]): Hole cards of the players who folded or mucked.
+        street_index (int | None): 0 to 3 from preflop to river, None before the hole cards and after the hand.
+        status (bool): True until the chips have been pulled.
+    """
+
+    def __init__(  # pylint: disable=too-many-positional-arguments
+        self,
+        antes: int | tuple[int, ...],
+        blinds_or_straddles: tuple[int, ...],
+        min_bet: int,
+        starting_stacks: int | list[int],
+        player_count: int,
+        *,
+        rng: random.Random | None = None,
+    ):
+        """
+        Shuffles the deck, posts the antes and the blinds and waits for the hole cards to be dealt.
+
+        The arguments mirror `pokerkit.NoLimitTexasHoldem.create_state` with uniform antes.
+
+        Args:
+            antes (int | tuple[int, ...]): The ante of every player, or of each player.
+            blinds_or_straddles (tuple[int, ...]): The blinds, e.g. (small blind, big blind).
+            min_bet (int): The minimum bet.
+            starting_stacks (int | list[int]): The stack of every player, or of each player.
+            player_count (int): The number of players.
+            rng (random.Random | None): Generator of the state. Default is None (the `random` module, drawn from as
+                pokerkit does).
+        """
+        if player_count < 2:
+            raise ValueError(f"There must be at least 2 players (currently {player_count}).")
+
+        self.player_count = player_count
+        self.antes = _clean_values(antes, player_count)
+        self.blinds_or_straddles = _clean_values(blinds_or_straddles, player_count)
+        self.min_bet = min_bet
+        self.starting_stacks = _clean_values(starting_stacks, player_count)
+        if min(self.starting_stacks) <= 0:
+            raise ValueError("Non-positive starting stacks was supplied.")
+
+        # Same call on the same initial order as pokerkit, so that a seeded game deals the same cards.
+        self.deck_cards = list(range(len(_CARDS)))
+        (random if rng is None else rng).shuffle(self.deck_cards)
+
+        self.statuses = [True] * player_count
+        self.bets = [0] * player_count
+        self.stacks = list(self.starting_stacks)
+        self.payoffs = [0] * player_count
+        self.hole_cards = [[] for _ in range(player_count)]
+        self.board_cards = []
+        self.burn_cards = []
+        self.mucked_cards = []
+        self.hole_codes = [[] for _ in range(player_count)]
+        self.board_codes = []
+        self.street_index = None
+        self.status = True
+
+        self.__rng = rng
+        self.__shown = [False] * player_count
+        self.__actor_indices = []
+        self.__opener_index = None
+        self.__completion_betting_or_raising_amount = 0
+        self.__all_in_status = False
+        self.__card_burning_status = False
+        self.__hole_dealing_counts = [0] * player_count
+        self.__board_dealing_count = 0
+
+        for i in range(player_count):
+            ante = self.__get_effective_ante(i)
+            if ante > 0:
+                self.__put_in(i, ante)
+        self.__end_bet_collection()
+
+    # search
+
+    def fork(self) -> FastState:
+        """
+        Copies the state, so that the hand can be played on without changing this one.
+
+        Returns:
+            FastState: The copy. It shares the generator of this state, if any.
+        """
+        state = FastState.__new__(FastState)
+        state.__dict__.update(self.__dict__)
+        FastState.__copy_lists(state)
+        return state
+
+    def __copy_lists(self):
+        """
+        Copies the lists of a fork, which still shares them with the original state.
+        """
+        self.deck_cards = self.deck_cards[:]
+        self.statuses = self.statuses[:]
+        self.bets = self.bets[:]
+        self.stacks = self.stacks[:]
+        self.payoffs = self.payoffs[:]
+        self.hole_cards = [cards[:] for cards in self.hole_cards]
+        self.board_cards = self.board_cards[:]
+        self.burn_cards = self.burn_cards[:]
+        self.mucked_cards = self.mucked_cards[:]
+        self.hole_codes = [codes[:] for codes in self.hole_codes]
+        self.board_codes = self.board_codes[:]
+        self.__shown = self.__shown[:]
+        self.__actor_indices = self.__actor_indices[:]
+        self.__hole_dealing_counts = self.__hole_dealing_counts[:]
+
+    def determinize(self, player_index: int, rng: random.Random | None = None):
+        """
+        Redraws the cards that a player can not see: the hole cards of the opponents still in the hand, the cards of
+        the players who folded and the order of the deck. The board and the player's own cards are kept.
+
+        Args:
+            player_index (int): Index of the player.
+            rng (random.Random | None): Generator to draw from. Default is None (the generator of the state).
+        """
+        unseen = self.deck_cards
+        n_hole_cards = 0
+        for i in range(self.player_count):
+            if i != player_index:
+                n_hole_cards += len(self.hole_codes[i])
+                unseen.extend(self.hole_codes[i])
+        # The cards the folded players mucked are unseen too: they go back to the pool, and the same number is drawn.
+        n_mucked_cards = len(self.mucked_cards)
+        unseen.extend(card_code(card) for card in self.mucked_cards)
+        n_hole_cards += n_mucked_cards
+
+        # Only the hole cards and the next cards of the deck (burnt or dealt to the board) can be drawn, so shuffling
+        # them is enough (a partial Fisher-Yates shuffle).
+        draw = (rng or self.__rng or random).random
+        n_unseen = len(unseen)
+        for i in range(min(n_hole_cards + _MAX_CARDS_TO_DEAL, n_unseen - 1)):
+            j = i + int(draw() * (n_unseen - i))
+            unseen[i], unseen[j] = unseen[j], unseen[i]
+
+        for i in range(self.player_count):
+            n_cards = len(self.hole_codes[i])
+            if i != player_index and n_cards:
+                self.hole_codes[i] = unseen[:n_cards]
+                self.hole_cards[i] = [_CARDS[code] for code in self.hole_codes[i]]
+                del unseen[:n_cards]
+        self.mucked_cards = [_CARDS[code] for code in unseen[:n_mucked_cards]]
+        del unseen[:n_mucked_cards]
+
+    # dealing
+
+    def can_burn_card(self) -> bool:
+        """
+        Returns whether a card must be burnt before dealing the board.
+        """
+        return self.__card_burning_status
+
+    def burn_card(self, card: Card | str | int | None = None):
+        """
+        Burns the next card of the deck, or the given card.
+
+        Args:
+            card (Card | str | int | None): The card to burn, possibly unknown ("??"). Default is None (the next card).
+        """
+        if not self.__card_burning_status:
+            raise ValueError("No card burning is pending.")
+
+        if card is None:
+            self.burn_cards.append(_CARDS[self.__draw(1)[0]])
+        elif card == "??" or (isinstance(card, Card) and card.unknown_status):
+            self.burn_cards.append(_UNKNOWN_CARD)
+        else:
+            self.burn_cards.append(_CARDS[self.__draw([card])[0]])
+        self.__card_burning_status = False
+        self.__update_dealing()
+
+    def deal_hole(self, cards: int | Iterable[Card | str | int] = 1):
+        """
+        Deals the next cards of the deck (or the given cards) to the player with the most pending hole cards (the first
+        one on a tie).
+
+        Args:
+            cards (int | Iterable[Card | str | int]): The number of cards to deal, or the cards. Default is 1.
+        """
+        if self.__card_burning_status or not any(self.__hole_dealing_counts):
+            raise ValueError("Currently, nobody can be dealt hole cards.")
+
+        if not isinstance(cards, int):
+            cards = list(cards)
+        player_index = max(range(self.player_count), key=lambda i: (self.__hole_dealing_counts[i], -i))
+        if (cards if isinstance(cards, int) else len(cards)) > self.__hole_dealing_counts[player_index]:
+            raise ValueError(f"Player {player_index} can not be dealt {cards} more hole cards.")
+
+        codes = self.__draw(cards)
+        self.__hole_dealing_counts[player_index] -= len(codes)
+        self.hole_codes[player_index].extend(codes)
+        self.hole_cards[player_index].extend(_CARDS[code] for code in codes)
+        self.__update_dealing()
+
+    def deal_board(self, cards: int | Iterable[Card | str | int] | None = None):
+        """
+        Deals the next cards of the deck (or the given cards) to the board.
+
+        Args:
+            cards (int | Iterable[Card | str | int] | None): The number of cards to deal, or the cards. Default is None
+                (all the cards of the street).
+        """
+        if self.__card_burning_status:
+            raise ValueError("A card must be burnt before dealing the board.")
+
+        if cards is None:
+            cards = self.__board_dealing_count
+        elif not isinstance(cards, int):
+            cards = list(cards)
+        if not 0 < (cards if isinstance(cards, int) else len(cards)) <= self.__board_dealing_count:
+            raise ValueError(f"{cards} board cards can not be dealt now.")
+
+        codes = self.__draw(cards)
+        self.__board_dealing_count -= len(codes)
+        self.board_codes.extend(codes)
+        self.board_cards.extend([_CARDS[code]] for code in codes)
+        self.__update_dealing()
+
+    def __draw(self, cards: int | Iterable[Card | str | int]) -> list[int]:
+        """
+        Removes the next `cards` cards from the deck, or the given cards (which pokerkit lets be dealt even if they are
+        not in the deck), and returns their codes.
+        """
+        if not isinstance(cards, int):
+            codes = [card_code(card) for card in cards]
+            for code in codes:
+                if code in self.deck_cards:
+                    self.deck_cards.remove(code)
+            return codes
+
+        if cards > len(self.deck_cards):
+            raise ValueError("There are not enough cards to be dealt.")
+
+        codes = self.deck_cards[:cards]
+        del self.deck_cards[:cards]
+        return codes
+
+    def __begin_dealing(self):
+        self.street_index = 0 if self.street_index is None else self.street_index + 1
+        # pokerkit shuffles a copy of the burnt and mucked cards when a street begins (to count the dealable cards).
+        # The shuffle is useless here, but it draws from `random`, which the bots share.
+        if self.__rng is None:
+            random.shuffle(self.burn_cards + self.mucked_cards)
+
+        self.__card_burning_status = self.street_index > 0
+        self.__board_dealing_count = _BOARD_DEALING_COUNTS[self.street_index]
+        if self.street_index == 0:
+            for i in range(self.player_count):
+                if self.statuses[i]:
+                    self.__hole_dealing_counts[i] = _HOLE_CARD_COUNT
+
+    def __update_dealing(self):
+        if not self.__card_burning_status and not any(self.__hole_dealing_counts) and not self.__board_dealing_count:
+            self.__begin_betting()
+
+    # betting
+
+    @property
+    def actor_index(self) -> int | None:
+        """
+        Index of the player in turn to act, or None if nobody can act.
+        """
+        return self.__actor_indices[0] if self.__actor_indices else None
+
+    def can_check_or_call(self) -> bool:
+        """
+        Returns whether the actor can check or call.
+        """
+        return bool(self.__actor_indices)
+
+    @property
+    def checking_or_calling_amount(self) -> int | None:
+        """
+        Amount the actor has to put in to check or call (capped by their stack), or None if nobody can act.
+        """
+        if not self.__actor_indices:
+            return None
+
+        player_index = self.__actor_indices[0]
+        return min(self.stacks[player_index], max(self.bets) - self.bets[player_index])
+
+    def can_complete_bet_or_raise_to(self, amount: int | None = None) -> bool:
+        """
+        Returns whether the actor can bet or raise (to the given amount, if any).
+        """
+        try:
+            self.__verify_completion_betting_or_raising_to(amount)
+        except ValueError:
+            return False
+        return True
+
+    @property
+    def min_completion_betting_or_raising_to_amount(self) -> int | None:
+        """
+        Smallest amount the actor can bet or raise to, or None if they can not bet or raise.
+        """
+        try:
+            self.__verify_completion_betting_or_raising()
+        except ValueError:
+            return None
+        return self.__min_completion_betting_or_raising_to_amount()
+
+    @property
+    def max_completion_betting_or_raising_to_amount(self) -> int | None:
+        """
+        Largest amount the actor can bet or raise to (all-in), or None if they can not bet or raise.
+        """
+        try:
+            self.__verify_completion_betting_or_raising()
+        except ValueError:
+            return None
+
+        player_index = self.__actor_indices[0]
+        return self.stacks[player_index] + self.bets[player_index]
+
+    def fold(self):
+        """
+        Folds the hand of the actor.
+        """
+        if not self.__actor_indices:
+            raise ValueError("There is no player to act.")
+
+        player_index = self.__actor_indices[0]
+        if self.bets[player_index] >= max(self.bets):
+            raise ValueError("There is no reason for this player to fold.")
+
+        self.__actor_indices.pop(0)
+        self.__muck_hole_cards(player_index)
+        self.__update_betting()
+
+    def check_or_call(self):
+        """
+        Checks or calls the largest bet (all-in if the stack of the actor is too small).
+        """
+        amount = self.checking_or_calling_amount
+        if amount is None:
+            raise ValueError("There is no player to act.")
+
+        self.__put_in(self.__actor_indices.pop(0), amount)
+        self.__update_betting()
+
+    def complete_bet_or_raise_to(self, amount: int | None = None):
+        """
+        Bets or raises to the given amount, which reopens the betting for all other players who can act.
+
+        Args:
+            amount (int | None): The total bet of the actor after the raise. Default is None (the minimum).
+        """
+        amount = self.__verify_completion_betting_or_raising_to(amount)
+
+        player_index = self.__actor_indices.pop(0)
+        self.__completion_betting_or_raising_amount = max(
+            self.__completion_betting_or_raising_amount, amount - max(self.bets)
+        )
+        self.__put_in(player_index, amount - self.bets[player_index])
+
+        self.__opener_index = player_index
+        self.__actor_indices = [
+            i % self.player_count
+            for i in range(player_index + 1, player_index + self.player_count)
+            if self.statuses[i % self.player_count] and self.stacks[i % self.player_count]
+        ]
+        self.__update_betting()
+
+    def __verify_completion_betting_or_raising(self):
+        if not self.__actor_indices:
+            raise ValueError("There is no player to act.")
+
+        player_index = self.__actor_indices[0]
+        max_bet = max(self.bets)
+        if self.stacks[player_index] <= max_bet - self.bets[player_index]:
+            raise ValueError("The player is already covered by a previous bet/raise.")
+
+        for i in range(self.player_count):
+            if i != player_index and self.statuses[i] and self.stacks[i] + self.bets[i] > max_bet:
+                return
+        raise ValueError("There is no reason to bet or raise since every other player has folded or gone all-in.")
+
+    def __verify_completion_betting_or_raising_to(self, amount: int | None) -> int:
+        self.__verify_completion_betting_or_raising()
+
+        player_index = self.__actor_indices[0]
+        min_amount = self.__min_completion_betting_or_raising_to_amount()
+        max_amount = self.stacks[player_index] + self.bets[player_index]
+        if amount is None:
+            amount = min_amount
+        if amount < min_amount:
+            raise ValueError(f"The amount {amount} is below the minimum allowed {min_amount}.")
+        if amount > max_amount:
+            raise ValueError(f"The amount {amount} is above the maximum allowed {max_amount}.")
+        return amount
+
+    def __min_completion_betting_or_raising_to_amount(self) -> int:
+        player_index = self.__actor_indices[0]
+        amount = max(self.__completion_betting_or_raising_amount, self.min_bet) + max(self.bets)
+        return min(self.__get_effective_stack(player_index) + self.bets[player_index], amount)
+
+    def __begin_betting(self):
+        # The player after the largest blind opens preflop, the first player after the button on later streets.
+        max_bet_index = max(
+            range(self.player_count), key=lambda i: (self.bets[i] * (self.blinds_or_straddles[i] > 0), i)
+        )
+        self.__opener_index = (max_bet_index + 1) % self.player_count
+        self.__actor_indices = [
+            i % self.player_count
+            for i in range(self.__opener_index, self.__opener_index + self.player_count)
+            if self.statuses[i % self.player_count]
+            and self.stacks[i % self.player_count]
+            and self.__get_effective_stack(i % self.player_count)
+        ]
+        self.__completion_betting_or_raising_amount = 0
+
+        self.__update_betting(
+            status=len(self.__actor_indices) == 1 and self.bets[self.__actor_indices[0]] >= max(self.bets)
+        )
+
+    def __update_betting(self, status: bool = False):
+        if not self.__actor_indices or sum(self.statuses) <= 1 or status:
+            self.__end_betting()
+
+    def __end_betting(self):
+        self.__actor_indices = []
+
+        if sum(self.statuses) > 1:
+            if sum(1 for i in range(self.player_count) if self.statuses[i] and self.stacks[i]) <= 1:
+                self.__all_in_status = True
+        if not all(self.stacks) and self.street_index == _RIVER:
+            self.__all_in_status = True
+
+        self.__end_bet_collection()
+
+    # bet collection and blinds
+
+    def __end_bet_collection(self):
+        if any(self.bets):
+            self.__collect_bets()
+
+        if sum(self.statuses) == 1:
+            self.__push_and_pull_chips()
+        elif self.street_index is None:
+            self.__post_blinds_or_straddles()
+        elif self.street_index == _RIVER or self.__all_in_status:
+            self.__showdown()
+        else:
+            self.__begin_dealing()
+
+    def __collect_bets(self):
+        # The bet of the last player standing stays in front of them. Uncalled bets (and, before the hole cards are
+        # dealt, the part of an ante no one else could match) go back to the stack.
+        winner_index = self.statuses.index(True) if sum(self.statuses) == 1 else None
+        bet_cutoff = sorted(self.bets)[-2]
+
+        for i in range(self.player_count):
+            if i == winner_index:
+                continue
+            if self.bets[i] > bet_cutoff:
+                overbet = self.bets[i] - bet_cutoff
+                self.stacks[i] += overbet
+                self.payoffs[i] += overbet
+            self.bets[i] = 0
+
+    def __post_blinds_or_straddles(self):
+        for i in range(self.player_count):
+            blind_or_straddle = self.__get_effective_blind_or_straddle(i)
+            if blind_or_straddle > 0:
+                self.__put_in(i, blind_or_straddle)
+        self.__begin_dealing()
+
+    def __get_effective_ante(self, player_index: int) -> int:
+        ante = self.antes[not player_index] if self.player_count == 2 else self.antes[player_index]
+        return min(ante, self.starting_stacks[player_index])
+
+    def __get_effective_blind_or_straddle(self, player_index: int) -> int:
+        if self.player_count == 2:
+            blind_or_straddle = self.blinds_or_straddles[not player_index]
+        else:
+            blind_or_straddle = self.blinds_or_straddles[player_index]
+        return min(blind_or_straddle, self.starting_stacks[player_index] - self.__get_effective_ante(player_index))
+
+    def __get_effective_stack(self, player_index: int) -> int:
+        if self.street_index is None or not self.statuses[player_index]:
+            return 0
+
+        effective_stacks = sorted(self.bets[i] + self.stacks[i] for i in range(self.player_count) if self.statuses[i])
+        return min(self.stacks[player_index], max(0, effective_stacks[-2] - self.bets[player_index]))
+
+    def __put_in(self, player_index: int, amount: int):
+        self.bets[player_index] += amount
+        self.stacks[player_index] -= amount
+        self.payoffs[player_index] -= amount
+
+    # showdown
+
+    def __showdown(self):
+        # Players show in turn, starting from the last aggressor, and muck if a hand shown before beats them.
+        # Everyone shows when all but one of them are all-in.
+        for i in range(self.__opener_index, self.__opener_index + self.player_count):
+            i %= self.player_count
+            if not self.statuses[i] or self.__shown[i]:
+                continue
+            if self.__all_in_status or self.__can_win_now(i):
+                self.__shown[i] = True
+            else:
+                self.__muck_hole_cards(i)
+
+        if self.__all_in_status and self.street_index != _RIVER:
+            self.__begin_dealing()
+            return
+
+        # Hands that can not win any pot are killed.
+        dead_hands = [i for i in range(self.player_count) if self.statuses[i] and not self.__can_win_now(i)]
+        for i in dead_hands:
+            self.__muck_hole_cards(i)
+        self.__push_and_pull_chips()
+
+    def __can_win_now(self, player_index: int) -> bool:
+        # Like pokerkit, this checks every pot, including the ones the player is not eligible for.
+        if len(self.board_codes) < 3:
+            return False
+
+        rank = self.__get_hand_rank(player_index)
+        for _, player_indices in self.__pots():
+            shown_ranks = [self.__get_hand_rank(i) for i in player_indices if self.__shown[i]]
+            if not shown_ranks or rank <= min(shown_ranks):
+                return True
+        return False
+
+    def __get_hand_rank(self, player_index: int) -> int:
+        return default_hand_evaluator().evaluate_codes(self.hole_codes[player_index] + self.board_codes)
+
+    def __muck_hole_cards(self, player_index: int):
+        self.statuses[player_index] = False
+        self.mucked_cards.extend(self.hole_cards[player_index])
+        self.hole_cards[player_index].clear()
+        self.hole_codes[player_index].clear()
+
+    # chips pushing and pulling
+
+    def __pots(self) -> list[tuple[int, tuple[int, ...]]]:
+        """
+        Computes the main pot and the side pots as (amount, indices of the players still in the hand who can win it).
+        """
+        if sum(self.payoffs) == -sum(self.bets):
+            return []
+
+        contributions = [-payoff - bet for payoff, bet in zip(self.payoffs, self.bets)]
+        pots = []
+        previous_contribution = 0
+        for contribution in sorted(set(contributions)):
+            amount = sum(contribution - previous_contribution for c in contributions if c >= contribution)
+            player_indices = tuple(
+                i for i in range(self.player_count) if -self.payoffs[i] >= contribution and self.statuses[i]
+            )
+            while pots and pots[-1][1] == player_indices:
+                amount += pots.pop()[0]
+            if amount:
+                pots.append((amount, player_indices))
+            previous_contribution = contribution
+        return pots
+
+    def __push_and_pull_chips(self):
+        self.street_index = None
+
+        pots = self.__pots()
+        if sum(self.statuses) == 1:
+            for amount, player_indices in pots:
+                self.bets[player_indices[0]] += amount
+        else:
+            for amount, player_indices in pots:
+                ranks = [self.__get_hand_rank(i) for i in player_indices]
+                winners = [i for i, rank in zip(player_indices, ranks) if rank == min(ranks)]
+                quotient, remainder = divmod(amount, len(winners))
+                for i in winners:
+                    self.bets[i] += quotient
+                self.bets[winners[0]] += remainder
+
+        for i in range(self.player_count):
+            if self.bets[i] > 0:
+                self.stacks[i] += self.bets[i]
+                self.payoffs[i] += self.bets[i]
+                self.bets[i] = 0
+        self.status = False
@@ -1,9 +1,20 @@
+from __future__ import annotations
+from collections.abc import Callable
 from pokerkit import Automation, NoLimitTexasHoldem
+from PokerBots.game.Deal import Deal
+from PokerBots.game.FastState import FastState
+from PokerBots.game.GameStats import GameStats, HandTimer
+from PokerBots.game.Observation import Observation, ObservationBuilder
+from PokerBots.game.GameEvents import (
+    GameEvent, HandStarted, BlindPosted, HoleCardsDealt, ActionTaken, StreetDealt, Showdown, PayoffsSettled,
+    PlayerEliminated, GameWon
+)
+from PokerBots.game.VerboseLogger import VerboseLogger
 from PokerBots.players.BasePlayer import BasePlayer 
 from PokerBots.players.CallingPlayer import CallingPlayer
 from PokerBots.players.RandomPlayer import RandomPlayer
 
-class Game:
+class Game:  # pylint: disable=too-many-instance-attributes
     """
     Represents a game of No-Limit Texas Hold'em poker.
 
@@ -11,42 +22,252 @@ class Game:
         players (list[BasePlayer]): List of player objects participating in the game.
         n_players (int): Number of players in the game.
         stacks (list[float]): Current stack for each player.
-        state (NoLimitTexasHoldem.State): Current game state.
+        engine (str): "pokerkit" or "fast" (see FastState).
+        state (NoLimitTexasHoldem.State | FastState): Current game state.
+        n_hands (int): Number of hands started so far.
+        stats (GameStats | None): Timings of the hands, or None to play without timing anything.
+        ante (int): Ante of every player. It can be changed between hands.
+        blinds (tuple[int, int]): Small and big blinds. They can be changed between hands.
+        min_bet (int): Minimum bet. It can be changed between hands.
     """
 
-    def __init__ (self, initial_stack: float = 30_000, players: list[BasePlayer] = None):
+    ENGINES = ("pokerkit", "fast")
+
+    def __init__ (
+        self,
+        initial_stack: float = 30_000,
+        players: list[BasePlayer] = None,
+        engine: str = "pokerkit",
+        *,
+        stats: GameStats | None = None,
+        ante: int = 500,
+        blinds: tuple[int, int] = (1000, 2000),
+        min_bet: int | None = None,
+    ):
         """
         Initializes the Game instance with the given players and initial stack (the same for each player).
 
         Args:
             initial_stack (float): Starting chip count for each player. Default is 30,000.
             players (list[BasePlayer]): List of player objects. Default is [RandomPlayer(), CallingPlayer()].
+            engine (str): "pokerkit" to play each hand with a full pokerkit state, or "fast" to use the array-backed
+                FastState, which plays the same hands (under the same seed) many times faster. Default is "pokerkit".
+            stats (GameStats | None): Stats to record the timings of the hands into (e.g. `GameStats(sample_every=100)`
+                to time 1% of the hands). Default is None (no timing).
+            ante (int): Ante of every player. Default is 500.
+            blinds (tuple[int, int]): Small and big blinds. Default is (1000, 2000).
+            min_bet (int | None): Minimum bet. Default is None (the big blind).
         """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine: {engine}. Valid engines are {list(self.ENGINES)}")
+
         if players is None:
             self.players = [RandomPlayer(), CallingPlayer()]
         else:
             self.players = players
         self.n_players = len(players)
         self.stacks = [initial_stack] * self.n_players
+        self.engine = engine
 
         self.state = None
+        self.n_hands = 0
+        self.stats = stats
+        self.ante = ante
+        self.blinds = blinds
+        self.min_bet = blinds[-1] if min_bet is None else min_bet
+        self.__deal = None
 
-    def play_round(self, verbose: bool = True):
+        self.__subscribers = []
+        # Subscribers of the current hand, including the verbose logger if requested.
+        self.__listeners = ()
+        self.__verbose_logger = VerboseLogger()
+        # Follows the current hand if a player observes it (see BasePlayer.observes).
+        self.__observer = None
+
+    def subscribe(self, subscriber: Callable[[GameEvent], None]) -> Callable[[GameEvent], None]:
+        """
+        Registers a callable that receives every event of the game (see PokerBots.game.GameEvents).
+
+        Events are only built when the game has at least one subscriber (or is verbose), so unobserved games pay
+        nothing. Subscribers are called synchronously from the game loop: to write events to a file, buffer them and
+        flush in batches.
+
+        Args:
+            subscriber (Callable[[GameEvent], None]): The callable. It takes effect from the next hand.
+
+        Returns:
+            Callable[[GameEvent], None]: The subscriber, so that this method can be used as a decorator.
+        """
+        self.__subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Callable[[GameEvent], None]):
+        """
+        Removes a subscriber. It takes effect from the next hand.
+
+        Args:
+            subscriber (Callable[[GameEvent], None]): A subscriber registered with `subscribe`.
+        """
+        self.__subscribers.remove(subscriber)
+
+    def play_round(self, verbose: bool = True, deal: Deal | None = None):
         """
         Plays a single round of No-Limit Texas Hold'em poker.
 
         Args:
             verbose (bool): If True, logs detailed information about the round. Default is True.
+            deal (Deal | None): Preset cards of the round (e.g. to replay a recorded hand). Default is None (cards are
+                dealt from the shuffled deck).
+
+        Returns:
+            bool: True if the game is over, otherwise False.
+        """
+        decisions = self.play_round_step_by_step(verbose=verbose, deal=deal)
+        action = None
+        while True:
+            try:
+                player_index, valid_actions = decisions.send(action)
+            except StopIteration as stop:
+                return bool(stop.value)
+            action = self.players[player_index].play(valid_actions=valid_actions, state=self.view(player_index))
+
+    def seat_players(self, players: list[BasePlayer], stacks: list[int]):
+        """
+        Replaces the players and their stacks between hands, e.g. when a tournament moves players between tables.
+
+        Args:
+            players (list[BasePlayer]): The players, in seat order (the first one posts the small blind).
+            stacks (list[int]): Their stacks.
+        """
+        if len(players) != len(stacks):
+            raise ValueError(f"{len(players)} players but {len(stacks)} stacks.")
+        self.players = list(players)
+        self.stacks = list(stacks)
+        self.n_players = len(self.players)
+
+    def view(self, player_index: int) -> Observation | NoLimitTexasHoldem.State | FastState:
+        """
+        What a player to act is given with their valid actions: an Observation if the player observes the hand (see
+        `BasePlayer.observes`), the game state otherwise. Drivers of `play_round_step_by_step` pass it to the players.
+
+        Args:
+            player_index (int): Index of the player to act.
+
+        Returns:
+            Observation | NoLimitTexasHoldem.State | FastState: The observation or the state.
+        """
+        if self.players[player_index].observes:
+            return self.__observer.observe(self.state)
+        return self.state
+
+    def play_round_step_by_step(self, verbose: bool = True, deal: Deal | None = None):
+        """
+        Plays a single round like `play_round`, but hands every decision to the caller instead of asking the player.
+
+        This lets a driver advance many games side by side (see BatchSimulator).
+
+        Args:
+            verbose (bool): If True, logs detailed information about the round. Default is True.
+            deal (Deal | None): Preset cards of the round. Default is None (cards are dealt from the shuffled deck).
+
+        Yields:
+            tuple[int, dict]: The index of the player to act and their valid actions. The chosen (action, amount) pair
+                must be sent back.
 
         Returns:
             bool: True if the game is over, otherwise False.
         """
-        if verbose:
-            print("INFO: ROUND STARTS")
-            print(f"INFO: stacks = {self.stacks}")
+        if deal is not None and len(deal.hole_cards) != self.n_players:
+            raise ValueError(f"The deal has hole cards for {len(deal.hole_cards)} players, not {self.n_players}.")
+        self.__deal = deal
+        # A copy, so that subscribing or unsubscribing during the hand takes effect from the next one.
+        self.__listeners = (*self.__subscribers, self.__verbose_logger) if verbose else tuple(self.__subscribers)
+        self.n_hands += 1
+        if self.__listeners:
+            names = tuple(player.name for player in self.players)
+            self.__emit(HandStarted(
+                self.n_hands, names, tuple(self.stacks), ante=self.ante, blinds=tuple(self.blinds), min_bet=self.min_bet
+            ))
+
+        timer = HandTimer() if self.stats is not None and self.stats.start_hand() else None
 
         # Initialize the game state
-        self.state = NoLimitTexasHoldem.create_state(
+        self.state = self.__create_state()
+        if timer:
+            timer.lap("state_creation")
+
+        # Deal hole cards and announce the blinds
+        self.__deal_cards()
+        self.__observer = ObservationBuilder() if any(player.observes for player in self.players) else None
+        if self.__observer is not None:
+            self.__observer.start_hand(self.n_hands, self.state)
+        if self.__listeners:
+            self.__emit_posting_of_blinds_or_straddles()
+            self.__emit(HoleCardsDealt(tuple(tuple(cards) for cards in self.state.hole_cards)))
+            self.__emit(StreetDealt("PREFLOP", ()))
+
+        # Play the streets (Preflop, Flop, Turn, River)
+        n_folds = yield from self.__play_streets(timer)
+
+        # Update stacks and announce the results
+        self.stacks = self.state.stacks
+        if self.__listeners:
+            self.__emit_results(showdown=self.n_players - n_folds > 1)
+
+        # Remove bankrupt players and check if the game is over
+        self.__remove_bankrupt_players()
+        is_over = self.__check_if_game_is_over()
+        if timer:
+            timer.lap("payout")
+            self.stats.record_hand(timer.phase_seconds, timer.elapsed())
+        return is_over
+
+
+    def __play_streets(self, timer: HandTimer | None):
+        """
+        Deals and plays the streets of the hand.
+
+        Args:
+            timer (HandTimer | None): Timer of the hand, if it is timed.
+
+        Yields:
+            tuple[int, dict]: The index of the player to act and their valid actions, for each decision.
+
+        Returns:
+            int: The number of players who folded.
+        """
+        n_folds = 0
+        for street_name, cards_to_deal in (("PREFLOP", 0), ("FLOP", 3), ("TURN", 1), ("RIVER", 1)):
+            # Dealing might be impossible if all players except for one folded.
+            if cards_to_deal > 0 and self.__try_to_burn_and_deal_cards(n_cards=cards_to_deal):
+                if self.__observer is not None:
+                    self.__observer.deal_board(self.state)
+                if self.__listeners:
+                    self.__emit(StreetDealt(street_name, tuple(card[0] for card in self.state.board_cards)))
+            if timer:
+                timer.lap("dealing")
+
+            if self.state.actor_index is not None:
+                n_folds += yield from self.__play_street(timer)
+        return n_folds
+
+    def __create_state(self):
+        """
+        Creates the state of a new hand with the current stacks, using the engine of the game.
+
+        Returns:
+            NoLimitTexasHoldem.State | FastState: The state, with antes and blinds posted.
+        """
+        if self.engine == "fast":
+            return FastState(
+                self.ante,  # Antes
+                self.blinds,  # Blinds or straddles
+                self.min_bet,  # Min-bet
+                self.stacks,  # Starting stacks
+                self.n_players,  # Number of players
+            )
+
+        return NoLimitTexasHoldem.create_state(
             (
                 Automation.ANTE_POSTING,
                 Automation.BET_COLLECTION,
@@ -57,77 +278,66 @@ class Game:
                 Automation.CHIPS_PULLING,
             ),
             True,  # Uniform antes
-            500,  # Antes
-            (1000, 2000),  # Blinds or straddles
-            2000,  # Min-bet
+            self.ante,  # Antes
+            self.blinds,  # Blinds or straddles
+            self.min_bet,  # Min-bet
             self.stacks,  # Starting stacks
             self.n_players,  # Number of players
         )
 
-        # Deal hole cards and log initial game state
-        self.__deal_cards()
-        if verbose:
-            self.__log_posting_of_blinds_or_straddles()
-
-        # Play the streets (Preflop, Flop, Turn, River)
-        for street_name, cards_to_deal in (("PREFLOP", 0), ("FLOP", 3), ("TURN", 1), ("RIVER", 1)):
-            if cards_to_deal > 0:
-                # Dealing might be impossible if all players except for one folded.
-                self.__try_to_burn_and_deal_cards(n_cards=cards_to_deal)
-
-            if self.state.actor_index is not None:
-                if verbose:
-                    print(f"INFO: ===== {street_name} =====")
-                self.__play_street(verbose=verbose)
-
-        # Update stacks and log results
-        self.stacks = self.state.stacks
-        if verbose:
-            self.__log_results()
-
-        # Remove bankrupt players and check if the game is over
-        self.__remove_bankrupt_players()
-        return self.__check_if_game_is_over(verbose=verbose)
-
-
     def __deal_cards(self):
         """
-        Deals two hole cards to each player in the game.
+        Deals two hole cards to each player in the game (the preset ones if the round has a deal).
         """
-        for _ in range(self.state.player_count):
-            self.state.deal_hole(2)
+        for player_index in range(self.state.player_count):
+            self.state.deal_hole(2 if self.__deal is None else self.__deal.hole_cards[player_index])
 
-    def __play_street(self, verbose: bool = True):
+    def __play_street(self, timer: HandTimer | None):
         """
         Manages the betting actions of players for a single betting street.
 
         Args:
-            verbose (bool): Whether to log player actions. Default is True.
+            timer (HandTimer | None): Timer of the hand, if it is timed.
+
+        Yields:
+            tuple[int, dict]: The index of the player to act and their valid actions, for each decision.
+
+        Returns:
+            int: The number of players who folded.
         """
+        n_folds = 0
+        street_index = self.state.street_index
         while self.state.actor_index is not None:
             current_player_idx = self.state.actor_index
             valid_actions = self.__get_valid_actions()
-            action, amount = self.players[current_player_idx].play(valid_actions=valid_actions, state=self.state)
+            if timer:
+                timer.lap("betting")
+            action, amount = yield current_player_idx, valid_actions
+            if timer:
+                self.stats.record_decision(self.players[current_player_idx].name, timer.lap("decisions"))
 
             match action:
                 case "fold":
                     self.state.fold()
-                    if verbose:
-                        print(f"INFO: Player {self.players[current_player_idx].name} folds.")
+                    n_folds += 1
+                    amount = 0
                 case "check_or_call":
                     self.state.check_or_call()
-                    if verbose:
-                        if amount == 0:
-                            print(f"INFO: Player {self.players[current_player_idx].name} checks.")
-                        else:
-                            print(f"INFO: Player {self.players[current_player_idx].name} calls {amount}.")
+                    amount = valid_actions["check_or_call"]
                 case "complete_bet_or_raise_to":
                     self.state.complete_bet_or_raise_to(amount=amount)
-                    if verbose:
-                        print(f"INFO: Player {self.players[current_player_idx].name} raises to {amount}")
                 case _:
                     raise ValueError(f"Unknown action: {action}. Valid actions are ['fold', 'check_or_call', 'complete_bet_or_raise_to']")
 
+            if self.__observer is not None:
+                self.__observer.record_action(current_player_idx, street_index, action, amount)
+            if self.__listeners:
+                self.__emit(ActionTaken(current_player_idx, self.players[current_player_idx].name, action, amount))
+
+        if timer:
+            timer.lap("betting")
+        return n_folds
+
     def __get_valid_actions(self):
         """
         Determines the valid actions available to the current player.
@@ -148,6 +358,14 @@ class Game:
         """
         Removes players with zero stack from the game.
         """
+        if min(self.stacks) > 0:
+            return
+
+        if self.__listeners:
+            for stack, player in zip(self.stacks, self.players):
+                if stack <= 0:
+                    self.__emit(PlayerEliminated(player.name, self.n_hands))
+
         self.stacks, self.players = zip(
             *[(stack, player) for stack, player in zip(self.stacks, self.players) if stack > 0]
         )
@@ -156,35 +374,37 @@ class Game:
         self.n_players = len(self.players)
 
 
-    def __check_if_game_is_over(self, verbose: bool = True):
+    def __check_if_game_is_over(self):
         """
         Checks whether the game is over (only one player remains).
 
-        Args:
-            verbose (bool): Whether to log the winner. Default is True.
-
         Returns:
             bool: True if the game is over, False otherwise.
         """
         if len(self.stacks) == 1:
-            if verbose:
-                print(f"INFO: Player {self.players[0].name} won the Tournament.")
+            if self.__listeners:
+                self.__emit(GameWon(self.players[0].name))
             return True
         
         return False
     
-    def __log_results(self):
+    def __emit(self, event: GameEvent):
+        """
+        Sends an event to the listeners of the current hand.
+        """
+        for listener in self.__listeners:
+            listener(event)
+
+    def __emit_results(self, showdown: bool):
         """
-        Logs the results of the round, including winnings or losses for each player.
+        Emits the showdown (if at least two players did not fold) and the payoffs of the round.
         """
-        print("INFO: ===== ROUND RESULTS =====")
-        for idx in range(self.n_players):
-            payoff = self.state.payoffs[idx]
-            if payoff >= 0:
-                print(f"INFO: Player {self.players[idx].name} won {payoff}")
-            else:
-                print(f"INFO: Player {self.players[idx].name} lost {-payoff}")
-        print("==========================================")
+        board_cards = tuple(card[0] for card in self.state.board_cards)
+        if showdown:
+            self.__emit(Showdown(tuple(tuple(cards) for cards in self.state.hole_cards), board_cards))
+
+        names = tuple(player.name for player in self.players)
+        self.__emit(PayoffsSettled(names, tuple(self.state.payoffs), tuple(self.state.stacks)))
 
     def __try_to_burn_and_deal_cards(self, n_cards: int = 1):
         """
@@ -192,15 +412,32 @@ class Game:
 
         Args:
             n_cards (int): Number of community cards to deal. Default is 1.
+
+        Returns:
+            bool: True if the cards were dealt.
         """
-        if self.state.can_burn_card():
+        if not self.state.can_burn_card():
+            return False
+
+        if self.__deal is None:
             self.state.burn_card()
             self.state.deal_board(n_cards)
+            return True
+
+        n_dealt = len(self.state.board_cards)
+        burn_cards = self.__deal.burn_cards
+        self.state.burn_card("??" if burn_cards is None else burn_cards[len(self.state.burn_cards)])
+        board_cards = self.__deal.board_cards[n_dealt:n_dealt + n_cards]
+        if board_cards:
+            self.state.deal_board(board_cards)
+        if len(board_cards) < n_cards:
+            self.state.deal_board(n_cards - len(board_cards))
+        return True
 
-    def __log_posting_of_blinds_or_straddles(self):
+    def __emit_posting_of_blinds_or_straddles(self):
         """
-        Logs the posting of blinds or straddles at the start of the round.
+        Emits the posting of blinds or straddles at the start of the round.
         """
         for idx, straddle in enumerate(self.state.blinds_or_straddles):
             if straddle > 0:
-                print(f"INFO: Player {self.players[idx].name} bets {straddle}.")
+                self.__emit(BlindPosted(idx, self.players[idx].name, straddle))
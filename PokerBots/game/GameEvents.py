@@ -0,0 +1,196 @@
+"""
+Events emitted by a Game to its subscribers (see Game.subscribe).
+
+Events are small `__slots__` objects holding references to data the game already has (names, card objects and
+tuples of amounts), so building them is cheap, and they are only built when the game has at least one subscriber.
+Cards are pokerkit cards, whatever the engine of the game.
+"""
+from __future__ import annotations
+import pokerkit
+
+
+class GameEvent:
+    """
+    Base class of all game events.
+    """
+
+    __slots__ = ()
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __hash__(self):
+        return hash((type(self), *(getattr(self, name) for name in self.__slots__)))
+
+
+class HandStarted(GameEvent):
+    """
+    A new hand starts.
+
+    Attributes:
+        hand_number (int): Number of the hand in the game, starting from 1.
+        player_names (tuple[str, ...]): Names of the players dealt into the hand, in seat order.
+        stacks (tuple[int, ...]): Stacks of these players before antes and blinds.
+        ante (int): Ante of every player.
+        blinds (tuple[int, int]): Small and big blinds.
+        min_bet (int): Minimum bet.
+    """
+
+    __slots__ = ("hand_number", "player_names", "stacks", "ante", "blinds", "min_bet")
+
+    def __init__(
+        self,
+        hand_number: int,
+        player_names: tuple[str, ...],
+        stacks: tuple[int, ...],
+        *,
+        ante: int,
+        blinds: tuple[int, int],
+        min_bet: int,
+    ):
+        self.hand_number = hand_number
+        self.player_names = player_names
+        self.stacks = stacks
+        self.ante = ante
+        self.blinds = blinds
+        self.min_bet = min_bet
+
+
+class BlindPosted(GameEvent):
+    """
+    A player posts a blind (or a straddle).
+
+    Attributes:
+        player_index (int): Index of the player in the hand.
+        player_name (str): Name of the player.
+        amount (int): Amount of the blind.
+    """
+
+    __slots__ = ("player_index", "player_name", "amount")
+
+    def __init__(self, player_index: int, player_name: str, amount: int):
+        self.player_index = player_index
+        self.player_name = player_name
+        self.amount = amount
+
+
+class HoleCardsDealt(GameEvent):
+    """
+    The hole cards are dealt. Only subscribers see every player's cards: the players only see their own.
+
+    Attributes:
+        hole_cards (tuple[tuple[pokerkit.Card, ...], ...]): Hole cards of each player of the hand.
+    """
+
+    __slots__ = ("hole_cards",)
+
+    def __init__(self, hole_cards: tuple[tuple[pokerkit.Card, ...], ...]):
+        self.hole_cards = hole_cards
+
+
+class ActionTaken(GameEvent):
+    """
+    A player acts.
+
+    Attributes:
+        player_index (int): Index of the player in the hand.
+        player_name (str): Name of the player.
+        action (str): "fold", "check_or_call" or "complete_bet_or_raise_to".
+        amount (int): 0 for a fold or a check, the amount called for a call, and the total bet for a bet or a raise.
+    """
+
+    __slots__ = ("player_index", "player_name", "action", "amount")
+
+    def __init__(self, player_index: int, player_name: str, action: str, amount: int):
+        self.player_index = player_index
+        self.player_name = player_name
+        self.action = action
+        self.amount = amount
+
+
+class StreetDealt(GameEvent):
+    """
+    A betting street begins: the hole cards are dealt (preflop), or board cards are (flop, turn and river).
+
+    Streets that are not dealt because all players but one folded are not emitted. Streets dealt after all remaining
+    players are all-in are, even though nobody acts on them.
+
+    Attributes:
+        street (str): "PREFLOP", "FLOP", "TURN" or "RIVER".
+        board_cards (tuple[pokerkit.Card, ...]): All board cards dealt so far.
+    """
+
+    __slots__ = ("street", "board_cards")
+
+    def __init__(self, street: str, board_cards: tuple[pokerkit.Card, ...]):
+        self.street = street
+        self.board_cards = board_cards
+
+
+class Showdown(GameEvent):
+    """
+    At least two players reach the end of the hand, and their hands are shown or mucked.
+
+    Attributes:
+        hole_cards (tuple[tuple[pokerkit.Card, ...], ...]): Hole cards shown by each player of the hand (empty if the
+            player folded or mucked).
+        board_cards (tuple[pokerkit.Card, ...]): The board.
+    """
+
+    __slots__ = ("hole_cards", "board_cards")
+
+    def __init__(self, hole_cards: tuple[tuple[pokerkit.Card, ...], ...], board_cards: tuple[pokerkit.Card, ...]):
+        self.hole_cards = hole_cards
+        self.board_cards = board_cards
+
+
+class PayoffsSettled(GameEvent):
+    """
+    The pots are awarded and the hand is over.
+
+    Attributes:
+        player_names (tuple[str, ...]): Names of the players of the hand, in seat order.
+        payoffs (tuple[int, ...]): Net chips won (or lost, if negative) by each of them.
+        stacks (tuple[int, ...]): Their stacks after the hand.
+    """
+
+    __slots__ = ("player_names", "payoffs", "stacks")
+
+    def __init__(self, player_names: tuple[str, ...], payoffs: tuple[int, ...], stacks: tuple[int, ...]):
+        self.player_names = player_names
+        self.payoffs = payoffs
+        self.stacks = stacks
+
+
+class PlayerEliminated(GameEvent):
+    """
+    A player lost all their chips and leaves the game.
+
+    Attributes:
+        player_name (str): Name of the player.
+        hand_number (int): Number of the hand the player lost their last chips in.
+    """
+
+    __slots__ = ("player_name", "hand_number")
+
+    def __init__(self, player_name: str, hand_number: int):
+        self.player_name = player_name
+        self.hand_number = hand_number
+
+
+class GameWon(GameEvent):
+    """
+    Only one player has chips left, so the game is over.
+
+    Attributes:
+        player_name (str): Name of the winner.
+    """
+
+    __slots__ = ("player_name",)
+
+    def __init__(self, player_name: str):
+        self.player_name = player_name
@@ -0,0 +1,244 @@
+from __future__ import annotations
+import bisect
+import time
+
+# Upper bounds of the latency buckets in seconds: powers of two from 1 microsecond to about 18 minutes. The last
+# bucket holds everything above.
+BUCKET_BOUNDS = tuple(2.0 ** exponent * 1e-6 for exponent in range(31))
+
+PHASES = ("state_creation", "dealing", "betting", "decisions", "payout")
+
+
+class LatencyHistogram:
+    """
+    Histogram of durations with logarithmic buckets (see BUCKET_BOUNDS), so that it takes constant memory and merges
+    by adding counts.
+
+    Attributes:
+        counts (list[int]): Number of durations in each bucket.
+        count (int): Number of durations.
+        total (float): Sum of the durations in seconds.
+        max (float): Longest duration in seconds.
+    """
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        """
+        Adds a duration.
+
+        Args:
+            seconds (float): The duration.
+        """
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    @property
+    def mean(self) -> float:
+        """
+        Mean duration in seconds (0.0 if empty).
+        """
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        Upper bound of the bucket that holds the q-quantile, so the result is within a factor 2 of the exact value.
+
+        Args:
+            q (float): The quantile, in [0, 1].
+
+        Returns:
+            float: The bound in seconds (0.0 if empty, the longest duration for the last bucket).
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if count and cumulative >= rank:
+                return BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else self.max
+        return self.max
+
+    def merge(self, other: "LatencyHistogram"):
+        """
+        Adds the durations of another histogram.
+
+        Args:
+            other (LatencyHistogram): Histogram to merge in.
+        """
+        self.counts = [mine + theirs for mine, theirs in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def __repr__(self):
+        return (
+            f"LatencyHistogram(count={self.count}, mean={self.mean * 1e6:.1f}us, "
+            f"p50<={self.quantile(0.5) * 1e6:.0f}us, p99<={self.quantile(0.99) * 1e6:.0f}us, max={self.max * 1e6:.0f}us)"
+        )
+
+
+class HandTimer:
+    """
+    Splits the duration of a hand into phases: every lap adds the time elapsed since the previous lap to a phase.
+
+    Attributes:
+        phase_seconds (dict[str, float]): Time spent in each phase so far.
+        start (float): `time.perf_counter()` at the start of the hand.
+    """
+
+    __slots__ = ("phase_seconds", "start", "__last")
+
+    def __init__(self):
+        self.phase_seconds = dict.fromkeys(PHASES, 0.0)
+        self.start = self.__last = time.perf_counter()
+
+    def lap(self, phase: str) -> float:
+        """
+        Adds the time elapsed since the previous lap to a phase.
+
+        Args:
+            phase (str): The phase.
+
+        Returns:
+            float: The elapsed time in seconds.
+        """
+        now = time.perf_counter()
+        elapsed = now - self.__last
+        self.phase_seconds[phase] += elapsed
+        self.__last = now
+        return elapsed
+
+    def elapsed(self) -> float:
+        """
+        Time since the start of the hand in seconds.
+        """
+        return time.perf_counter() - self.start
+
+
+class GameStats:
+    """
+    Timings of the hands played by one or more games (see `Game.stats`).
+
+    Only one hand every `sample_every` hands is timed, to bound the overhead; the other hands are only counted. Timed
+    hands measure:
+
+    - "state_creation": creating the engine state (antes and blinds included);
+    - "dealing": dealing the hole cards and the board (and the showdown of an all-in runout, which happens as the last
+      card is dealt);
+    - "betting": everything else from the first to the last action: listing the valid actions, applying the actions
+      and, when the last action ends the hand, the showdown and the pushing of the pots;
+    - "decisions": waiting for the players, i.e. their `play` calls (also recorded per player in `decision_latency`).
+      When a driver plays the hand step by step (see BatchSimulator), it is the time the driver took to answer;
+    - "payout": updating the stacks and removing the eliminated players.
+
+    Stats are plain data, so they can be pickled and merged across games and processes.
+
+    Attributes:
+        sample_every (int): Time one hand out of this many.
+        n_hands (int): Number of hands played.
+        n_timed_hands (int): Number of timed hands.
+        timed_seconds (float): Total duration of the timed hands.
+        phase_seconds (dict[str, float]): Time spent in each phase of the timed hands.
+        decision_latency (dict[str, LatencyHistogram]): Decision latencies of each player (by name) in timed hands.
+    """
+
+    def __init__(self, sample_every: int = 1):
+        """
+        Initializes empty stats.
+
+        Args:
+            sample_every (int): Time one hand out of this many. Default is 1 (every hand).
+        """
+        if sample_every < 1:
+            raise ValueError(f"sample_every must be at least 1, got {sample_every}.")
+
+        self.sample_every = sample_every
+        self.n_hands = 0
+        self.n_timed_hands = 0
+        self.timed_seconds = 0.0
+        self.phase_seconds = dict.fromkeys(PHASES, 0.0)
+        self.decision_latency = {}
+
+    def start_hand(self) -> bool:
+        """
+        Counts a new hand.
+
+        Returns:
+            bool: Whether the hand should be timed.
+        """
+        self.n_hands += 1
+        return (self.n_hands - 1) % self.sample_every == 0
+
+    def record_decision(self, player_name: str, seconds: float):
+        """
+        Adds the latency of a decision.
+
+        Args:
+            player_name (str): The player.
+            seconds (float): Time the player took to decide.
+        """
+        histogram = self.decision_latency.get(player_name)
+        if histogram is None:
+            histogram = self.decision_latency[player_name] = LatencyHistogram()
+        histogram.record(seconds)
+
+    def record_hand(self, phase_seconds: dict[str, float], seconds: float):
+        """
+        Adds the timings of a timed hand.
+
+        Args:
+            phase_seconds (dict[str, float]): Time spent in each phase of the hand.
+            seconds (float): Total duration of the hand.
+        """
+        self.n_timed_hands += 1
+        self.timed_seconds += seconds
+        for phase, phase_time in phase_seconds.items():
+            self.phase_seconds[phase] += phase_time
+
+    @property
+    def hands_per_second(self) -> float:
+        """
+        Throughput measured on the timed hands (0.0 before the first one).
+        """
+        return self.n_timed_hands / self.timed_seconds if self.timed_seconds else 0.0
+
+    def merge(self, other: "GameStats"):
+        """
+        Adds the stats of other games.
+
+        Args:
+            other (GameStats): Stats to merge in.
+        """
+        self.n_hands += other.n_hands
+        self.n_timed_hands += other.n_timed_hands
+        self.timed_seconds += other.timed_seconds
+        for phase, seconds in other.phase_seconds.items():
+            self.phase_seconds[phase] = self.phase_seconds.get(phase, 0.0) + seconds
+        for player_name, histogram in other.decision_latency.items():
+            self.decision_latency.setdefault(player_name, LatencyHistogram()).merge(histogram)
+
+    def report(self) -> str:
+        """
+        Formats the stats as a short text report.
+
+        Returns:
+            str: One line for the throughput, one per phase and one per player.
+        """
+        lines = [f"{self.n_hands} hands ({self.n_timed_hands} timed), {self.hands_per_second:.1f} hands/s"]
+        for phase, seconds in self.phase_seconds.items():
+            share = seconds / self.timed_seconds if self.timed_seconds else 0.0
+            lines.append(f"  {phase:<15}{seconds:10.3f}s {share:7.1%}")
+        for player_name, histogram in self.decision_latency.items():
+            lines.append(f"  {player_name}: {histogram}")
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return f"GameStats(n_hands={self.n_hands}, hands_per_second={self.hands_per_second:.1f})"
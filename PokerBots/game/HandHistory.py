@@ -0,0 +1,475 @@
+"""
+Compact, append-only binary hand histories.
+
+A `HandHistoryWriter` subscribes to a game (see Game.subscribe) and appends one record per hand. A
+`HandHistoryReader` memory-maps the file and reads the hands back, either one by one or as NumPy columns.
+
+File layout (little-endian):
+
+- The file starts with the 5 bytes `b"PBHH"` + version.
+- Then come records, each made of a payload length (u32), a record type (u8) and the payload.
+- A name record (type 1) holds a player id (u16) and the UTF-8 name of the player. It is written before the first
+  hand of that player, so hands only store ids.
+- A hand record (type 2) holds:
+  - a fixed part: hand number (u32), number of players n (u8), number of board cards b (u8),
+    number of actions a (u16), flags (u8, bit 0 set if the hand went to showdown), and the forced bets: ante,
+    small blind, big blind and minimum bet (i64);
+  - n player ids (u16);
+  - n stacks before the hand (i64);
+  - 2n hole cards (u8);
+  - b board cards (u8);
+  - a actions of 10 bytes: the player's index in the hand (u8), street << 2 | action (u8), and the amount (i64);
+  - n payoffs (i64).
+
+Cards are stored as codes (see PokerBots.equity.cards), streets as 0 (preflop) to 3 (river), and actions as 0 (fold),
+1 (check or call) and 2 (bet or raise). The amount of an action is the one of the ActionTaken event. A file cut in the
+middle of a record (e.g. by a crash) is read up to its last complete record, and a writer appending to it first drops
+the partial record.
+"""
+from __future__ import annotations
+import mmap
+import os
+import struct
+from collections.abc import Iterator
+import numpy as np
+from PokerBots.equity.cards import CARD_STRINGS, card_codes
+from PokerBots.game.GameEvents import (
+    GameEvent, HandStarted, HoleCardsDealt, ActionTaken, StreetDealt, Showdown, PayoffsSettled
+)
+
+MAGIC = b"PBHH\x02"
+
+NAME_RECORD = 1
+HAND_RECORD = 2
+
+STREETS = ("PREFLOP", "FLOP", "TURN", "RIVER")
+ACTIONS = ("fold", "check_or_call", "complete_bet_or_raise_to")
+
+_PREFIX = struct.Struct("<IB")
+_NAME = struct.Struct("<H")
+_HAND = struct.Struct("<IBBHBqqqq")
+_ACTION = struct.Struct("<BBq")
+
+_STREET_INDEX = {street: index for index, street in enumerate(STREETS)}
+_ACTION_INDEX = {action: index for index, action in enumerate(ACTIONS)}
+
+
+class HandRecord:
+    """
+    A hand read back from a history file.
+
+    Attributes:
+        hand_number (int): Number of the hand in its game.
+        player_names (tuple[str, ...]): Names of the players of the hand, in seat order.
+        stacks (tuple[int, ...]): Their stacks before the hand.
+        ante (int): Ante of every player.
+        blinds (tuple[int, int]): Small and big blinds.
+        min_bet (int): Minimum bet.
+        hole_cards (tuple[tuple[str, str], ...]): Their hole cards.
+        board_cards (tuple[str, ...]): The board.
+        actions (tuple[tuple[int, str, str, int], ...]): The player index, street, action and amount of each action.
+        payoffs (tuple[int, ...]): Net chips won by each player.
+        showdown (bool): Whether the hand went to showdown.
+    """
+
+    __slots__ = (
+        "hand_number", "player_names", "stacks", "ante", "blinds", "min_bet", "hole_cards", "board_cards", "actions",
+        "payoffs", "showdown",
+    )
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        hand_number: int,
+        player_names: tuple[str, ...],
+        stacks: tuple[int, ...],
+        hole_cards: tuple[tuple[str, str], ...],
+        *,
+        ante: int,
+        blinds: tuple[int, int],
+        min_bet: int,
+        board_cards: tuple[str, ...],
+        actions: tuple[tuple[int, str, str, int], ...],
+        payoffs: tuple[int, ...],
+        showdown: bool,
+    ):
+        self.hand_number = hand_number
+        self.player_names = player_names
+        self.stacks = stacks
+        self.ante = ante
+        self.blinds = blinds
+        self.min_bet = min_bet
+        self.hole_cards = hole_cards
+        self.board_cards = board_cards
+        self.actions = actions
+        self.payoffs = payoffs
+        self.showdown = showdown
+
+    def __repr__(self):
+        return (
+            f"HandRecord(hand_number={self.hand_number}, player_names={self.player_names}, "
+            f"board_cards={self.board_cards}, payoffs={self.payoffs})"
+        )
+
+
+class HandHistoryWriter:
+    """
+    Subscriber that appends every hand of the games it listens to to a hand-history file.
+
+    Records are accumulated in memory and written in bulk whenever `buffer_size` bytes are pending, and when the
+    writer is flushed or closed. It can listen to several games as long as their hands do not interleave, e.g. games
+    played one after the other. Games played in lockstep, like the tables of a BatchSimulator, need a writer each.
+
+    Attributes:
+        path (str): The file. Existing files are appended to.
+        buffer_size (int): Number of pending bytes that triggers a write.
+        n_hands (int): Number of hands recorded by this writer.
+    """
+
+    def __init__(self, path: str, *, buffer_size: int = 1 << 20):
+        """
+        Opens the file for appending. If the file ends with a record cut short (e.g. by a crash), it is dropped first.
+
+        Args:
+            path (str): The file. It is created if it does not exist.
+            buffer_size (int): Number of pending bytes that triggers a write. Default is 1 MiB.
+        """
+        self.path = path
+        self.buffer_size = buffer_size
+        self.n_hands = 0
+
+        self.__player_ids = {}
+        self.__buffer = bytearray(MAGIC)
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self.__resume()
+        self.__file = open(path, "ab")  # pylint: disable=consider-using-with
+
+        self.__hand = None
+        self.__actions = bytearray()
+        self.__street = 0
+        self.__board = ()
+
+    def __resume(self):
+        """
+        Reads the player ids of the existing file, and drops the record it ends with if it was cut short, so that the
+        new records follow the last complete one.
+        """
+        with open(self.path, "rb") as file:
+            header = file.read(len(MAGIC))
+        if len(header) < len(MAGIC) and MAGIC.startswith(header):
+            # Cut while the header was written: start over.
+            os.truncate(self.path, 0)
+            return
+
+        with HandHistoryReader(self.path) as reader:
+            self.__player_ids = {name: player_id for player_id, name in enumerate(reader.player_names)}
+            complete_size = reader.complete_size
+        if os.path.getsize(self.path) > complete_size:
+            os.truncate(self.path, complete_size)
+        self.__buffer.clear()
+
+    def __call__(self, event: GameEvent):
+        match event:
+            case HandStarted():
+                self.__hand = [event.hand_number, [self.__player_id(name) for name in event.player_names],
+                               event.stacks, (), False, (event.ante, *event.blinds, event.min_bet)]
+                self.__actions.clear()
+                self.__board = ()
+            case HoleCardsDealt():
+                self.__hand[3] = [code for cards in event.hole_cards for code in card_codes(cards)]
+            case StreetDealt():
+                self.__street = _STREET_INDEX[event.street]
+                self.__board = event.board_cards
+            case ActionTaken():
+                self.__actions += _ACTION.pack(
+                    event.player_index, self.__street << 2 | _ACTION_INDEX[event.action], int(event.amount)
+                )
+            case Showdown():
+                self.__hand[4] = True
+            case PayoffsSettled():
+                self.__write_hand(event.payoffs)
+
+    def __player_id(self, name: str) -> int:
+        """
+        Returns the id of a player, writing a name record first if the player is new.
+        """
+        player_id = self.__player_ids.get(name)
+        if player_id is None:
+            player_id = self.__player_ids[name] = len(self.__player_ids)
+            encoded = name.encode()
+            self.__buffer += _PREFIX.pack(_NAME.size + len(encoded), NAME_RECORD)
+            self.__buffer += _NAME.pack(player_id) + encoded
+        return player_id
+
+    def __write_hand(self, payoffs: tuple[int, ...]):
+        hand_number, player_ids, stacks, hole_cards, showdown, forced_bets = self.__hand
+        n_players = len(player_ids)
+        board = card_codes(self.__board)
+        n_actions = len(self.__actions) // _ACTION.size
+
+        payload = b"".join((
+            _HAND.pack(hand_number, n_players, len(board), n_actions, int(showdown), *[int(amount) for amount in forced_bets]),
+            struct.pack(f"<{n_players}H", *player_ids),
+            struct.pack(f"<{n_players}q", *[int(stack) for stack in stacks]),
+            bytes(hole_cards),
+            bytes(board),
+            self.__actions,
+            struct.pack(f"<{n_players}q", *[int(payoff) for payoff in payoffs]),
+        ))
+        self.__buffer += _PREFIX.pack(len(payload), HAND_RECORD)
+        self.__buffer += payload
+        self.__hand = None
+        self.n_hands += 1
+
+        if len(self.__buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the pending records to the file.
+        """
+        if self.__buffer:
+            self.__file.write(self.__buffer)
+            self.__buffer.clear()
+        self.__file.flush()
+
+    def close(self):
+        """
+        Writes the pending records and closes the file.
+        """
+        if not self.__file.closed:
+            self.flush()
+            self.__file.close()
+
+    def __enter__(self) -> "HandHistoryWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class HandHistoryReader:
+    """
+    Memory-maps a hand-history file and reads its hands without loading the whole file.
+
+    Attributes:
+        path (str): The file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Opens and memory-maps the file.
+
+        Args:
+            path (str): The file.
+
+        Raises:
+            ValueError: If the file is not a hand history.
+        """
+        self.path = path
+        self.__player_names = []
+
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            self.__data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        if self.__data[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a hand history (version {MAGIC[-1]}).")
+
+        self.__hand_offsets = None
+        self.__complete_size = len(MAGIC)
+
+    @property
+    def complete_size(self) -> int:
+        """
+        Size of the file up to the end of its last complete record (indexes the file on first use).
+        """
+        self.__index()
+        return self.__complete_size
+
+    @property
+    def player_names(self) -> list[str]:
+        """
+        Name of each player id (indexes the file on first use).
+        """
+        self.__index()
+        return self.__player_names
+
+    def __iter__(self) -> Iterator[HandRecord]:
+        """
+        Yields the hands one by one, decoding each record only when it is reached.
+        """
+        for record_type, offset in self.__records():
+            if record_type == HAND_RECORD:
+                yield self.__decode(offset)
+
+    def __len__(self) -> int:
+        """
+        Number of hands in the file (indexes the file on first use).
+        """
+        return len(self.__index())
+
+    def hand(self, index: int) -> HandRecord:
+        """
+        Reads a single hand (indexes the file on first use).
+
+        Args:
+            index (int): Index of the hand in the file (not its hand number).
+
+        Returns:
+            HandRecord: The hand.
+        """
+        return self.__decode(int(self.__index()[index]))
+
+    def __decode(self, offset: int) -> HandRecord:
+        """
+        Decodes the hand record whose payload starts at `offset`.
+        """
+        data = self.__data
+        hand_number, n_players, n_board, n_actions, flags, ante, *blinds, min_bet = _HAND.unpack_from(data, offset)
+        offset += _HAND.size
+        player_ids = struct.unpack_from(f"<{n_players}H", data, offset)
+        offset += 2 * n_players
+        stacks = struct.unpack_from(f"<{n_players}q", data, offset)
+        offset += 8 * n_players
+        hole_cards = [CARD_STRINGS[code] for code in data[offset:offset + 2 * n_players]]
+        offset += 2 * n_players
+        board_cards = data[offset:offset + n_board]
+        offset += n_board
+        actions = tuple(
+            (player_index, STREETS[code >> 2], ACTIONS[code & 3], amount)
+            for player_index, code, amount in _ACTION.iter_unpack(data[offset:offset + _ACTION.size * n_actions])
+        )
+        offset += _ACTION.size * n_actions
+        payoffs = struct.unpack_from(f"<{n_players}q", data, offset)
+
+        return HandRecord(
+            hand_number,
+            tuple(self.__player_names[player_id] for player_id in player_ids),
+            stacks,
+            tuple(zip(hole_cards[::2], hole_cards[1::2])),
+            ante=ante,
+            blinds=tuple(blinds),
+            min_bet=min_bet,
+            board_cards=tuple(CARD_STRINGS[code] for code in board_cards),
+            actions=actions,
+            payoffs=payoffs,
+            showdown=bool(flags & 1),
+        )
+
+    def __records(self) -> Iterator[tuple[int, int]]:
+        """
+        Yields the type and the payload offset of every complete record, reading name records on the way.
+        """
+        data = self.__data
+        offset = len(MAGIC)
+        while offset + _PREFIX.size <= len(data):
+            length, record_type = _PREFIX.unpack_from(data, offset)
+            offset += _PREFIX.size
+            if offset + length > len(data):
+                break
+
+            if record_type == NAME_RECORD:
+                (player_id,) = _NAME.unpack_from(data, offset)
+                name = bytes(data[offset + _NAME.size:offset + length]).decode()
+                if player_id == len(self.__player_names):
+                    self.__player_names.append(name)
+            yield record_type, offset
+            offset += length
+            self.__complete_size = offset
+
+    def columns(self) -> dict[str, np.ndarray]:
+        """
+        Decodes the whole file into NumPy arrays, for aggregate queries (e.g. the total payoff of each player is
+        `np.bincount(columns["player_id"], weights=columns["payoff"])`).
+
+        Only the positions of the records are found in Python: the fields are then gathered from the memory map with
+        vectorized indexing.
+
+        Returns:
+            dict[str, np.ndarray]: Arrays of three kinds:
+                - one row per hand: "hand_number", "n_players", "n_actions", "showdown", "ante", "small_blind",
+                  "big_blind", "min_bet" and "board_cards" (shape (n_hands, 5), 255 for cards not dealt);
+                - one row per player and hand: "hand_index" (row of the hand in the arrays above), "seat" (index of
+                  the player in the hand), "player_id" (index into `player_names`), "stack", "hole_cards" (shape
+                  (n_rows, 2)) and "payoff";
+                - one row per action: "action_hand_index", "action_seat", "action_street", "action" (index into
+                  ACTIONS) and "action_amount".
+        """
+        starts = self.__index()
+        data = np.frombuffer(self.__data, dtype=np.uint8) if len(starts) else np.zeros(0, dtype=np.uint8)
+
+        def gather(positions: np.ndarray, dtype: str) -> np.ndarray:
+            width = np.dtype(dtype).itemsize
+            return np.ascontiguousarray(data[positions[:, np.newaxis] + np.arange(width)]).view(dtype).ravel()
+
+        n_players = data[starts + 4].astype(np.int64)
+        n_board = data[starts + 5].astype(np.int64)
+        n_actions = gather(starts + 6, "<u2").astype(np.int64)
+        players_start = starts + _HAND.size
+        board_start = players_start + 12 * n_players
+        actions_start = board_start + n_board
+
+        # One row per player and hand.
+        hand_index = np.repeat(np.arange(len(starts)), n_players)
+        seat = np.arange(len(hand_index)) - np.repeat(np.cumsum(n_players) - n_players, n_players)
+        row_start = players_start[hand_index]
+        row_players = n_players[hand_index]
+
+        # One row per action.
+        action_hand_index = np.repeat(np.arange(len(starts)), n_actions)
+        action_position = actions_start[action_hand_index] + _ACTION.size * (
+            np.arange(len(action_hand_index)) - np.repeat(np.cumsum(n_actions) - n_actions, n_actions)
+        )
+        action_codes = data[action_position + 1]
+
+        board_cards = np.full((len(starts), 5), 255, dtype=np.uint8)
+        for i in range(5):
+            dealt = n_board > i
+            board_cards[dealt, i] = data[board_start[dealt] + i]
+
+        hole_position = row_start + 10 * row_players + 2 * seat
+        return {
+            "hand_number": gather(starts, "<u4"),
+            "n_players": n_players,
+            "n_actions": n_actions,
+            "showdown": (data[starts + 8] & 1).astype(bool),
+            "ante": gather(starts + 9, "<i8"),
+            "small_blind": gather(starts + 17, "<i8"),
+            "big_blind": gather(starts + 25, "<i8"),
+            "min_bet": gather(starts + 33, "<i8"),
+            "board_cards": board_cards,
+            "hand_index": hand_index,
+            "seat": seat,
+            "player_id": gather(row_start + 2 * seat, "<u2"),
+            "stack": gather(row_start + 2 * row_players + 8 * seat, "<i8"),
+            "hole_cards": np.stack((data[hole_position], data[hole_position + 1]), axis=1),
+            "payoff": gather(actions_start[hand_index] + _ACTION.size * n_actions[hand_index] + 8 * seat, "<i8"),
+            "action_hand_index": action_hand_index,
+            "action_seat": data[action_position],
+            "action_street": action_codes >> 2,
+            "action": action_codes & 3,
+            "action_amount": gather(action_position + 2, "<i8"),
+        }
+
+    def __index(self) -> np.ndarray:
+        """
+        Returns the payload offsets of all hand records (computed once).
+        """
+        if self.__hand_offsets is None:
+            self.__hand_offsets = np.array(
+                [offset for record_type, offset in self.__records() if record_type == HAND_RECORD], dtype=np.int64
+            )
+        return self.__hand_offsets
+
+    def close(self):
+        """
+        Closes the memory map.
+        """
+        if isinstance(self.__data, mmap.mmap):
+            self.__data.close()
+
+    def __enter__(self) -> "HandHistoryReader":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,313 @@
+"""
+Replays recorded hands (see HandHistory) with new versions of some bots, to find where their decisions changed.
+
+Every recorded hand is played again with the same stacks, the same cards (see Deal) and the same opponent actions. The
+replayed bots decide again at each of their turns, and the hand stops at the first decision that differs from the
+recording: after it, the recorded actions of the opponents no longer apply.
+"""
+from __future__ import annotations
+import copy
+import random
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from PokerBots.players.BasePlayer import BasePlayer
+from PokerBots.game.Deal import Deal
+from PokerBots.game.Game import Game
+from PokerBots.game.HandHistory import HandHistoryReader, HandRecord
+from PokerBots.equity.EquityCache import shared_equity_cache
+
+
+class Divergence:
+    """
+    The first decision of a hand that differs from the recording.
+
+    Attributes:
+        hand_index (int): Index of the hand in the history file.
+        hand_number (int): Number of the hand in its game.
+        player_name (str): Name of the replayed bot.
+        street (str): "PREFLOP", "FLOP", "TURN" or "RIVER".
+        decision (int): Index of the decision among all the actions of the hand.
+        recorded (tuple[str, int]): The recorded action and amount.
+        replayed (tuple[str, float]): The action and amount chosen by the bot now.
+    """
+
+    __slots__ = ("hand_index", "hand_number", "player_name", "street", "decision", "recorded", "replayed")
+
+    def __init__(
+        self,
+        hand_index: int,
+        hand_number: int,
+        player_name: str,
+        *,
+        street: str,
+        decision: int,
+        recorded: tuple[str, int],
+        replayed: tuple[str, float],
+    ):
+        self.hand_index = hand_index
+        self.hand_number = hand_number
+        self.player_name = player_name
+        self.street = street
+        self.decision = decision
+        self.recorded = recorded
+        self.replayed = replayed
+
+    def __repr__(self):
+        return (
+            f"Divergence(hand_index={self.hand_index}, player_name={self.player_name!r}, street={self.street!r}, "
+            f"recorded={self.recorded}, replayed={self.replayed})"
+        )
+
+
+class ReplayResult:
+    """
+    Results of a replay.
+
+    Attributes:
+        n_hands (int): Number of hands replayed.
+        n_decisions (int): Number of decisions of the replayed bots compared with the recording.
+        divergences (list[Divergence]): First divergent decision of each hand that has one, in file order.
+    """
+
+    def __init__(self):
+        self.n_hands = 0
+        self.n_decisions = 0
+        self.divergences = []
+
+    @property
+    def first_divergence(self) -> Divergence | None:
+        """
+        The divergence of the earliest hand, or None if all decisions are the same.
+        """
+        return self.divergences[0] if self.divergences else None
+
+    def merge(self, other: "ReplayResult"):
+        """
+        Adds the results of the replay of later hands.
+
+        Args:
+            other (ReplayResult): Results to merge in.
+        """
+        self.n_hands += other.n_hands
+        self.n_decisions += other.n_decisions
+        self.divergences.extend(other.divergences)
+
+    def __repr__(self):
+        return (
+            f"ReplayResult(n_hands={self.n_hands}, n_decisions={self.n_decisions}, "
+            f"n_divergences={len(self.divergences)})"
+        )
+
+
+def _same_action(recorded: tuple[str, int], replayed: tuple[str, float]) -> bool:
+    """
+    Whether two decisions are the same. The amount only matters for bets and raises.
+    """
+    if recorded[0] != replayed[0]:
+        return False
+    return recorded[0] != "complete_bet_or_raise_to" or recorded[1] == replayed[1]
+
+
+def replay_hand(
+    record: HandRecord, players: dict[str, BasePlayer], *, engine: str = "fast", hand_index: int = 0
+) -> tuple[int, Divergence | None]:
+    """
+    Replays one recorded hand, with its recorded stacks, cards and forced bets.
+
+    Args:
+        record (HandRecord): The hand.
+        players (dict[str, BasePlayer]): The replayed bots, by the name of their seat. Other seats repeat their
+            recorded actions.
+        engine (str): Engine of the game. Default is "fast".
+        hand_index (int): Index of the hand in its file, reported in the divergence. Default is 0.
+
+    Returns:
+        tuple[int, Divergence | None]: The number of decisions compared, and the first divergent one (None if the
+            bots decided as recorded).
+
+    Raises:
+        ValueError: If the recorded actions can not be played (the recording does not follow the rules of `Game`).
+    """
+    game = Game(
+        players=[players.get(name) or BasePlayer(name=name) for name in record.player_names],
+        engine=engine,
+        ante=record.ante,
+        blinds=record.blinds,
+        min_bet=record.min_bet,
+    )
+    game.stacks = list(record.stacks)
+    decisions = game.play_round_step_by_step(verbose=False, deal=Deal(record.hole_cards, record.board_cards))
+
+    n_decisions = 0
+    action = None
+    for decision, (player_index, street, recorded_action, amount) in enumerate(record.actions):
+        try:
+            actor_index, valid_actions = decisions.send(action)
+        except StopIteration as stop:
+            raise ValueError(f"Hand {hand_index} ends before its recorded actions.") from stop
+        if actor_index != player_index:
+            raise ValueError(f"Hand {hand_index}: player {actor_index} acts instead of player {player_index}.")
+
+        action = (recorded_action, amount)
+        player = game.players[actor_index]
+        if player.name in players:
+            n_decisions += 1
+            replayed = player.play(valid_actions=valid_actions, state=game.view(actor_index))
+            if not _same_action(action, replayed):
+                decisions.close()
+                return n_decisions, Divergence(
+                    hand_index,
+                    record.hand_number,
+                    player.name,
+                    street=street,
+                    decision=decision,
+                    recorded=action,
+                    replayed=replayed,
+                )
+
+    try:
+        decisions.send(action)
+    except StopIteration:
+        pass
+    else:
+        raise ValueError(f"Hand {hand_index} goes on after its recorded actions.")
+
+    if tuple(game.state.payoffs) != record.payoffs:
+        raise ValueError(f"Hand {hand_index} ends with payoffs {game.state.payoffs}, not {record.payoffs}.")
+    return n_decisions, None
+
+
+def replay_hands(
+    reader: HandHistoryReader, players: list[BasePlayer], hand_indices: range, *, engine: str = "fast", seed: int = 0
+) -> ReplayResult:
+    """
+    Replays a range of hands of a history with fresh copies of the bots.
+
+    The `random` module is seeded with `seed + hand_index` before each hand, and the shared equity cache is cleared
+    first, so the result only depends on the range of hands, not on the process that replays it.
+
+    Args:
+        reader (HandHistoryReader): The history.
+        players (list[BasePlayer]): Template bots, matched with the recorded seats by name.
+        hand_indices (range): Indices of the hands in the file.
+        engine (str): Engine of the games. Default is "fast".
+        seed (int): Seed of the replay. Default is 0.
+
+    Returns:
+        ReplayResult: Results of these hands.
+    """
+    shared_equity_cache().clear()
+    players = {player.name: player for player in copy.deepcopy(players)}
+
+    result = ReplayResult()
+    for hand_index in hand_indices:
+        random.seed(seed + hand_index)
+        n_decisions, divergence = replay_hand(reader.hand(hand_index), players, engine=engine, hand_index=hand_index)
+        result.n_hands += 1
+        result.n_decisions += n_decisions
+        if divergence is not None:
+            result.divergences.append(divergence)
+    return result
+
+
+# Settings and open history of the current worker process, set once by the pool initializer.
+_worker_config = None
+
+
+def _init_worker(path: str, players: list[BasePlayer], engine: str, seed: int):
+    global _worker_config  # pylint: disable=global-statement
+    _worker_config = (HandHistoryReader(path), players, engine, seed)
+
+
+def _replay_in_worker(hand_indices: range) -> ReplayResult:
+    reader, players, engine, seed = _worker_config
+    return replay_hands(reader, players, hand_indices, engine=engine, seed=seed)
+
+
+def _merge_results(results: Iterable[ReplayResult], max_divergences: int | None) -> ReplayResult:
+    """
+    Merges the results of consecutive chunks, stopping once `max_divergences` hands diverged.
+    """
+    merged = ReplayResult()
+    for result in results:
+        merged.merge(result)
+        if max_divergences is not None and len(merged.divergences) >= max_divergences:
+            del merged.divergences[max_divergences:]
+            break
+    return merged
+
+
+class HandReplayer:
+    """
+    Replays the hands of a history file with new versions of some bots, across a pool of processes.
+
+    Hands are split into chunks of `chunk_size` consecutive hands. Each chunk is replayed with fresh copies of the bots,
+    and every hand gets its own seed, so the result is the same for any number of workers.
+
+    Attributes:
+        players (list[BasePlayer]): The replayed bots. Each one takes the seats recorded under its name.
+        engine (str): Engine of the games ("pokerkit" or "fast").
+        n_workers (int): Number of worker processes. 1 replays all hands in the current process.
+        seed (int): Seed of the replay.
+        chunk_size (int): Number of hands per task.
+    """
+
+    def __init__(
+        self,
+        players: list[BasePlayer],
+        *,
+        engine: str = "fast",
+        n_workers: int = 1,
+        seed: int = 0,
+        chunk_size: int = 1_000,
+    ):
+        """
+        Initializes the replayer.
+
+        Args:
+            players (list[BasePlayer]): The replayed bots. They must be picklable if n_workers > 1.
+            engine (str): Engine of the games. Default is "fast".
+            n_workers (int): Number of worker processes. Default is 1 (no pool).
+            seed (int): Seed of the replay. Default is 0.
+            chunk_size (int): Number of hands per task. Default is 1,000.
+        """
+        self.players = players
+        self.engine = engine
+        self.n_workers = n_workers
+        self.seed = seed
+        self.chunk_size = chunk_size
+
+    def run(self, path: str, *, start: int = 0, stop: int | None = None, max_divergences: int | None = None
+            ) -> ReplayResult:
+        """
+        Replays the hands of a history file.
+
+        Args:
+            path (str): The history file.
+            start (int): Index of the first hand to replay. Default is 0.
+            stop (int | None): Index after the last hand to replay. Default is None (the end of the file).
+            max_divergences (int | None): Stop once this many hands diverged. Chunks are replayed whole, so up to
+                `chunk_size` hands more may be replayed (their divergences are dropped). Default is None (replay all
+                hands).
+
+        Returns:
+            ReplayResult: Results of the replayed hands.
+        """
+        with HandHistoryReader(path) as reader:
+            stop = len(reader) if stop is None else min(stop, len(reader))
+            chunks = [range(first, min(first + self.chunk_size, stop)) for first in range(start, stop, self.chunk_size)]
+
+            if self.n_workers == 1:
+                results = (replay_hands(reader, self.players, chunk, engine=self.engine, seed=self.seed)
+                           for chunk in chunks)
+                return _merge_results(results, max_divergences)
+
+        with ProcessPoolExecutor(
+            max_workers=self.n_workers,
+            initializer=_init_worker,
+            initargs=(path, self.players, self.engine, self.seed),
+        ) as executor:
+            result = _merge_results(executor.map(_replay_in_worker, chunks), max_divergences)
+            # Do not wait for the chunks that are not needed anymore.
+            executor.shutdown(cancel_futures=True)
+        return result
@@ -0,0 +1,421 @@
+"""
+Round-robin leagues between many bots, with Elo ratings and checkpoints.
+
+Every pairing of bots plays matches of duplicate heads-up hands (see DuplicateEvaluator). The league is played in
+rounds: each round gives one more match to every pairing whose winner is not significant yet, so hands go to the close
+pairings instead of the ones already resolved. The significance is tested with the same always-valid sequential test as
+DuplicateEvaluator, so testing after every match does not inflate the error rate. Pairings of bots too close to tell
+apart stop once their result is precise enough, or at a maximum number of hands.
+
+The Elo ratings are updated as the matches finish, in the order they were scheduled, and every finished match is
+appended to the checkpoint file. A league run again with the same checkpoint reads the matches back instead of playing
+them, and schedules the same matches as an uninterrupted run would have.
+"""
+from __future__ import annotations
+import json
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from PokerBots.players.BasePlayer import BasePlayer
+from PokerBots.game.DuplicateEvaluator import DuplicateEvaluator, msprt_likelihood_ratio
+
+
+class PairingRecord:
+    """
+    Results of all the matches of a pairing, from the point of view of its first bot.
+
+    Attributes:
+        names (tuple[str, str]): Names of the two bots.
+        n_matches (int): Number of matches played.
+        n_pairs (int): Number of deals played (twice each).
+        mean (float): Mean chips won by the first bot per pair of hands.
+        sum_of_squares (float): Sum of the squared deviations of the pair scores from their mean.
+        resolved (bool): Whether the pairing gets no more matches.
+    """
+
+    def __init__(self, names: tuple[str, str]):
+        self.names = names
+        self.n_matches = 0
+        self.n_pairs = 0
+        self.mean = 0.0
+        self.sum_of_squares = 0.0
+        self.resolved = False
+
+    @property
+    def n_hands(self) -> int:
+        """
+        Number of hands played.
+        """
+        return 2 * self.n_pairs
+
+    @property
+    def std_error(self) -> float:
+        """
+        Standard error of the mean (0.0 before two pairs are played).
+        """
+        if self.n_pairs < 2:
+            return 0.0
+        return math.sqrt(self.sum_of_squares / (self.n_pairs - 1) / self.n_pairs)
+
+    def add_match(self, n_pairs: int, mean: float, sum_of_squares: float):
+        """
+        Adds the result of a match.
+
+        Args:
+            n_pairs (int): Number of deals of the match.
+            mean (float): Mean chips won by the first bot per pair of hands.
+            sum_of_squares (float): Sum of the squared deviations of the pair scores of the match from its mean.
+        """
+        # Chan's update of the mean and the sum of squared deviations of two groups of samples.
+        total = self.n_pairs + n_pairs
+        delta = mean - self.mean
+        self.mean += delta * n_pairs / total
+        self.sum_of_squares += sum_of_squares + delta * delta * self.n_pairs * n_pairs / total
+        self.n_pairs = total
+        self.n_matches += 1
+
+    def p_value(self, effect_size: float) -> float:
+        """
+        Always-valid p-value of the hypothesis that both bots are as good (see DuplicateEvaluator).
+
+        Args:
+            effect_size (float): Typical difference between the bots, in standard deviations of a pair score.
+
+        Returns:
+            float: The p-value.
+        """
+        if self.n_pairs < 2 or self.sum_of_squares <= 0:
+            return 1.0
+        variance = self.sum_of_squares / (self.n_pairs - 1)
+        return min(1.0, 1 / msprt_likelihood_ratio(self.n_pairs, self.mean, variance, effect_size ** 2 * variance))
+
+    def __repr__(self):
+        return (
+            f"PairingRecord(names={self.names}, n_matches={self.n_matches}, n_hands={self.n_hands}, "
+            f"chips_won_per_hand={self.mean / 2:.1f}, resolved={self.resolved})"
+        )
+
+
+class LeagueResult:
+    """
+    Standings of a league.
+
+    Attributes:
+        ratings (dict[str, float]): Elo rating of each bot.
+        pairings (list[PairingRecord]): Results of each pairing.
+        complete (bool): False if the league stopped at `max_matches` with pairings still unresolved.
+    """
+
+    def __init__(self, ratings: dict[str, float], pairings: list[PairingRecord], complete: bool):
+        self.ratings = ratings
+        self.pairings = pairings
+        self.complete = complete
+
+    @property
+    def n_hands(self) -> int:
+        """
+        Number of hands played over all pairings.
+        """
+        return sum(pairing.n_hands for pairing in self.pairings)
+
+    def ranking(self) -> list[str]:
+        """
+        The names of the bots, from the highest rating to the lowest.
+        """
+        return sorted(self.ratings, key=lambda name: -self.ratings[name])
+
+    def chips_won_per_hand(self) -> dict[str, float]:
+        """
+        Mean chips won per hand by each bot, averaged over its opponents (each pairing weighs the same).
+        """
+        totals = {name: [] for name in self.ratings}
+        for pairing in self.pairings:
+            name_a, name_b = pairing.names
+            totals[name_a].append(pairing.mean / 2)
+            totals[name_b].append(-pairing.mean / 2)
+        return {name: sum(values) / len(values) if values else 0.0 for name, values in totals.items()}
+
+    def __repr__(self):
+        return f"LeagueResult(ranking={self.ranking()}, n_hands={self.n_hands}, complete={self.complete})"
+
+
+def play_match(  # pylint: disable=too-many-positional-arguments
+    player_a: BasePlayer,
+    player_b: BasePlayer,
+    hands_per_match: int,
+    initial_stack: float,
+    engine: str,
+    seed: int,
+) -> tuple[int, float, float]:
+    """
+    Plays a match of duplicate hands between two bots (see DuplicateEvaluator), without stopping early.
+
+    Returns:
+        tuple[int, float, float]: The number of pairs of hands, the mean chips won by A per pair, and the sum of the
+            squared deviations of the pair scores from their mean.
+    """
+    # More pairs than the match can play before testing, so that all its hands are played.
+    evaluator = DuplicateEvaluator(
+        player_a, player_b, initial_stack=initial_stack, engine=engine, max_hands=hands_per_match,
+        min_pairs=hands_per_match, seed=seed,
+    )
+    result = evaluator.run()
+    return result.n_pairs, result.mean, result.std_error ** 2 * result.n_pairs * (result.n_pairs - 1)
+
+
+# Bots and match settings of the current worker process, set once by the pool initializer.
+_worker_config = None
+
+
+def _init_worker(players: list[BasePlayer], hands_per_match: int, initial_stack: float, engine: str):
+    global _worker_config  # pylint: disable=global-statement
+    _worker_config = (players, hands_per_match, initial_stack, engine)
+
+
+def _play_match_in_worker(task: tuple[int, int, int]) -> tuple[int, float, float]:
+    players, hands_per_match, initial_stack, engine = _worker_config
+    index_a, index_b, seed = task
+    return play_match(players[index_a], players[index_b], hands_per_match, initial_stack, engine, seed)
+
+
+class League:  # pylint: disable=too-many-instance-attributes
+    """
+    A round-robin league between bots, played heads-up with duplicate hands (see the module documentation).
+
+    Every match gets its own seed derived from the master seed, the names of its bots and its number in the pairing,
+    so for a given seed the result is the same no matter how many workers are used or how often the league was resumed.
+
+    Attributes:
+        players (list[BasePlayer]): The bots. They must have different names.
+        hands_per_match (int): Number of hands of each match.
+        max_hands_per_pairing (int): Maximum number of hands of a pairing.
+        initial_stack (float): Stack of both bots at the start of every hand.
+        engine (str): Engine of the games ("pokerkit" or "fast").
+        confidence (float): Confidence required to resolve a pairing.
+        precision (float): Standard error of the chips won per hand below which a pairing is resolved, winner or not.
+        effect_size (float): Typical difference between bots, in standard deviations of a pair score (see
+            DuplicateEvaluator).
+        k_factor (float): Elo K-factor: the most a rating moves after a match.
+        n_workers (int): Number of worker processes. 1 plays all matches in the current process.
+        seed (int): Master seed.
+        checkpoint (str | os.PathLike | None): File the finished matches are appended to, or None.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        players: list[BasePlayer],
+        *,
+        hands_per_match: int = 200,
+        max_hands_per_pairing: int = 20_000,
+        initial_stack: float = 30_000,
+        engine: str = "fast",
+        confidence: float = 0.95,
+        precision: float = 10.0,
+        effect_size: float = 0.1,
+        k_factor: float = 16.0,
+        n_workers: int = 1,
+        seed: int = 0,
+        checkpoint: str | os.PathLike | None = None,
+    ):
+        """
+        Initializes the league.
+
+        Args:
+            players (list[BasePlayer]): The bots. They must have different names, and be picklable if n_workers > 1.
+            hands_per_match (int): Number of hands of each match (even). Default is 200.
+            max_hands_per_pairing (int): Maximum number of hands of a pairing. Default is 20,000.
+            initial_stack (float): Stack of both bots at the start of every hand. Default is 30,000.
+            engine (str): Engine of the games. Default is "fast".
+            confidence (float): Confidence required to resolve a pairing. Default is 0.95.
+            precision (float): Standard error of the chips won per hand below which a pairing is resolved.
+                Default is 10 (half a big blind per 100 hands at the default blinds).
+            effect_size (float): Typical difference between bots, in standard deviations of a pair score.
+                Default is 0.1.
+            k_factor (float): Elo K-factor. Default is 16.
+            n_workers (int): Number of worker processes. Default is 1 (no pool).
+            seed (int): Master seed. Default is 0.
+            checkpoint (str | os.PathLike | None): File the finished matches are appended to. If it exists, its
+                matches are read back instead of being played again. Default is None (no checkpoint).
+        """
+        names = [player.name for player in players]
+        if len(players) < 2:
+            raise ValueError("A league needs at least 2 players.")
+        if len(set(names)) != len(names):
+            raise ValueError(f"The players must have different names, not {names}.")
+        if hands_per_match < 2 or hands_per_match % 2:
+            raise ValueError(f"Invalid number of hands per match: {hands_per_match}. It must be even.")
+
+        self.players = list(players)
+        self.hands_per_match = hands_per_match
+        self.max_hands_per_pairing = max_hands_per_pairing
+        self.initial_stack = initial_stack
+        self.engine = engine
+        self.confidence = confidence
+        self.precision = precision
+        self.effect_size = effect_size
+        self.k_factor = k_factor
+        self.n_workers = n_workers
+        self.seed = seed
+        self.checkpoint = checkpoint
+
+    def match_seed(self, pairing: PairingRecord) -> int:
+        """
+        Derives the seed of the next match of a pairing.
+
+        Args:
+            pairing (PairingRecord): The pairing.
+
+        Returns:
+            int: A 32-bit seed.
+        """
+        name_a, name_b = pairing.names
+        return random.Random(f"{self.seed}/{name_a}/{name_b}/{pairing.n_matches}").getrandbits(32)
+
+    def run(self, max_matches: int | None = None) -> LeagueResult:
+        """
+        Plays matches until every pairing is resolved, resuming from the checkpoint if there is one.
+
+        Args:
+            max_matches (int | None): Maximum number of matches to play in this run (the matches of the checkpoint do
+                not count). Default is None (no limit).
+
+        Returns:
+            LeagueResult: The standings.
+        """
+        pairings = [
+            PairingRecord((player_a.name, player_b.name))
+            for index_a, player_a in enumerate(self.players)
+            for player_b in self.players[index_a + 1:]
+        ]
+        ratings = {player.name: 1500.0 for player in self.players}
+        for pairing_index, match in self.__read_checkpoint():
+            self.__record(ratings, pairings[pairing_index], match)
+
+        indices = {player.name: index for index, player in enumerate(self.players)}
+        n_played = 0
+        executor = None
+        if self.n_workers > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=self.n_workers,
+                initializer=_init_worker,
+                initargs=(self.players, self.hands_per_match, self.initial_stack, self.engine),
+            )
+        try:
+            while max_matches is None or n_played < max_matches:
+                scheduled = self.__schedule(pairings)
+                if not scheduled:
+                    break
+                if max_matches is not None:
+                    scheduled = scheduled[:max_matches - n_played]
+                tasks = [
+                    (indices[pairings[index].names[0]], indices[pairings[index].names[1]],
+                     self.match_seed(pairings[index]))
+                    for index in scheduled
+                ]
+                if executor is None:
+                    results = (
+                        play_match(self.players[index_a], self.players[index_b], self.hands_per_match,
+                                   self.initial_stack, self.engine, seed)
+                        for index_a, index_b, seed in tasks
+                    )
+                else:
+                    results = executor.map(_play_match_in_worker, tasks)
+
+                for pairing_index, match in zip(scheduled, results):
+                    self.__record(ratings, pairings[pairing_index], match)
+                    self.__append_to_checkpoint(pairing_index, match)
+                    n_played += 1
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        return LeagueResult(ratings, pairings, complete=not self.__schedule(pairings))
+
+    def __schedule(self, pairings: list[PairingRecord]) -> list[int]:
+        """
+        Lists the pairings of the next round: the unresolved ones with the fewest matches.
+        """
+        unresolved = [index for index, pairing in enumerate(pairings) if not pairing.resolved]
+        if not unresolved:
+            return []
+        n_matches = min(pairings[index].n_matches for index in unresolved)
+        return [index for index in unresolved if pairings[index].n_matches == n_matches]
+
+    def __record(self, ratings: dict[str, float], pairing: PairingRecord, match: tuple[int, float, float]):
+        """
+        Adds a match to its pairing, updates the Elo ratings of its bots, and resolves the pairing if it is done.
+        """
+        pairing.add_match(*match)
+        name_a, name_b = pairing.names
+        expected = 1 / (1 + 10 ** ((ratings[name_b] - ratings[name_a]) / 400))
+        mean = match[1]
+        score = 1.0 if mean > 0 else 0.0 if mean < 0 else 0.5
+        ratings[name_a] += self.k_factor * (score - expected)
+        ratings[name_b] -= self.k_factor * (score - expected)
+
+        # A single pair has no spread to measure, whatever the number of hands per match.
+        if pairing.n_pairs >= 2 and (
+            pairing.p_value(self.effect_size) <= 1 - self.confidence or pairing.std_error / 2 <= self.precision
+        ):
+            pairing.resolved = True
+        elif pairing.n_hands + self.hands_per_match > self.max_hands_per_pairing:
+            pairing.resolved = True
+
+    def __settings(self) -> dict:
+        """
+        The settings a checkpoint must have been written with to be resumed.
+        """
+        return {
+            "names": [player.name for player in self.players],
+            "seed": self.seed,
+            "hands_per_match": self.hands_per_match,
+            "max_hands_per_pairing": self.max_hands_per_pairing,
+            "initial_stack": self.initial_stack,
+            "engine": self.engine,
+            "confidence": self.confidence,
+            "precision": self.precision,
+            "effect_size": self.effect_size,
+            "k_factor": self.k_factor,
+        }
+
+    def __read_checkpoint(self) -> list[tuple[int, tuple[int, float, float]]]:
+        """
+        Reads the finished matches from the checkpoint, in the order they were played.
+
+        The first line of the file holds the settings of the league, and every other line a match. A last line cut
+        short by an interruption is dropped.
+        """
+        if self.checkpoint is None:
+            return []
+        if not os.path.exists(self.checkpoint):
+            with open(self.checkpoint, "w", encoding="utf-8") as file:
+                file.write(json.dumps(self.__settings()) + "\n")
+            return []
+
+        with open(self.checkpoint, encoding="utf-8") as file:
+            content = file.read()
+        # Every line ends with a newline once it is complete: what follows the last one was cut short.
+        *lines, partial_line = content.split("\n")
+        if not lines or json.loads(lines[0]) != self.__settings():
+            raise ValueError(f"The checkpoint {self.checkpoint} was written by a league with other settings.")
+        if partial_line:
+            with open(self.checkpoint, "w", encoding="utf-8") as file:
+                file.write(content[:len(content) - len(partial_line)])
+
+        matches = []
+        for line in lines[1:]:
+            pairing_index, n_pairs, mean, sum_of_squares = json.loads(line)
+            matches.append((pairing_index, (n_pairs, mean, sum_of_squares)))
+        return matches
+
+    def __append_to_checkpoint(self, pairing_index: int, match: tuple[int, float, float]):
+        """
+        Appends a finished match to the checkpoint, and flushes it to disk.
+        """
+        if self.checkpoint is None:
+            return
+        with open(self.checkpoint, "a", encoding="utf-8") as file:
+            file.write(json.dumps([pairing_index, *match]) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
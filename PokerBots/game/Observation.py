@@ -0,0 +1,252 @@
+"""
+Compact snapshots of a hand, passed to the players that ask for them (see `BasePlayer.observes`) instead of the game
+state.
+
+Game keeps an ObservationBuilder up to date as the hand goes: it converts the cards to codes once (the hole cards of a
+player at their first decision, the board once per street), or takes them as they are from a FastState, and appends
+every action to the history, so that a snapshot costs a few tuples per decision, whatever the engine.
+
+Search-based bots turn an observation back into a FastState with `Observation.sample_state`, which draws the cards the
+player can not see, and then fork it (see `FastState.fork`) to simulate continuations of the hand.
+"""
+from __future__ import annotations
+import random
+from PokerBots.equity.cards import card_codes
+from PokerBots.game.FastState import FastState
+from PokerBots.game.HandHistory import ACTIONS
+
+_ACTION_INDEX = {action: index for index, action in enumerate(ACTIONS)}
+
+
+class Observation:  # pylint: disable=too-many-instance-attributes
+    """
+    What the player to act knows about the hand. All sequences are tuples, so the snapshot can be kept and shared.
+
+    Cards are codes (see PokerBots.equity.cards), which the equity tools take as they are. Only the actor's hole cards
+    are known.
+
+    Attributes:
+        hand_number (int): Number of the hand in its game.
+        actor_index (int): Index of the player to act. Players are in seat order, starting from the small blind.
+        player_count (int): Number of players of the hand (including those who folded).
+        street_index (int): 0 (preflop) to 3 (river).
+        hole_codes (tuple[int, int]): Codes of the actor's hole cards.
+        board_codes (tuple[int, ...]): Codes of the board cards.
+        stacks (tuple[int, ...]): Stacks of the players.
+        bets (tuple[int, ...]): Bets of the players on the current street.
+        pot (int): All the chips put in so far, bets of the current street included.
+        statuses (tuple[bool, ...]): Whether each player is still in the hand.
+        history (tuple[tuple[int, int, int, int], ...]): The player index, street index, action (index in
+            HandHistory.ACTIONS) and amount of each action so far. The amount is 0 for a fold or a check, the amount
+            called for a call, and the total bet for a bet or a raise.
+        starting_stacks (tuple[int, ...]): Stacks of the players at the start of the hand.
+        antes (tuple[int, ...]): Ante of each player.
+        blinds_or_straddles (tuple[int, ...]): Blind of each player.
+        min_bet (int): Minimum bet.
+    """
+
+    __slots__ = (
+        "hand_number",
+        "actor_index",
+        "player_count",
+        "street_index",
+        "hole_codes",
+        "board_codes",
+        "stacks",
+        "bets",
+        "pot",
+        "statuses",
+        "history",
+        "starting_stacks",
+        "antes",
+        "blinds_or_straddles",
+        "min_bet",
+    )
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        hand_number: int,
+        actor_index: int,
+        player_count: int,
+        street_index: int,
+        *,
+        hole_codes: tuple[int, int],
+        board_codes: tuple[int, ...],
+        stacks: tuple[int, ...],
+        bets: tuple[int, ...],
+        pot: int,
+        statuses: tuple[bool, ...],
+        history: tuple[tuple[int, int, int, int], ...],
+        starting_stacks: tuple[int, ...],
+        antes: tuple[int, ...],
+        blinds_or_straddles: tuple[int, ...],
+        min_bet: int,
+    ):
+        self.hand_number = hand_number
+        self.actor_index = actor_index
+        self.player_count = player_count
+        self.street_index = street_index
+        self.hole_codes = hole_codes
+        self.board_codes = board_codes
+        self.stacks = stacks
+        self.bets = bets
+        self.pot = pot
+        self.statuses = statuses
+        self.history = history
+        self.starting_stacks = starting_stacks
+        self.antes = antes
+        self.blinds_or_straddles = blinds_or_straddles
+        self.min_bet = min_bet
+
+    def sample_state(self, rng: random.Random | None = None) -> FastState:
+        """
+        Rebuilds the hand up to this decision, with random hole cards for the opponents and a random deck.
+
+        Args:
+            rng (random.Random | None): Generator of the state (see FastState), also used to draw the cards. Default is
+                None (a new generator seeded from `random`).
+
+        Returns:
+            FastState: A state where the actor is to act, as in the hand.
+        """
+        rng = random.Random(random.getrandbits(64)) if rng is None else rng
+        state = FastState(
+            self.antes, self.blinds_or_straddles, self.min_bet, self.starting_stacks, self.player_count, rng=rng
+        )
+        known = set(self.hole_codes) | set(self.board_codes)
+        state.deck_cards = [code for code in state.deck_cards if code not in known]
+        for player_index in range(self.player_count):
+            state.deal_hole(self.hole_codes if player_index == self.actor_index else 2)
+
+        for player_index, street_index, action_index, amount in self.history:
+            self.__deal_board_until(state, street_index)
+            if state.actor_index != player_index:
+                raise ValueError(f"Player {player_index} can not act at this point of the hand.")
+            match ACTIONS[action_index]:
+                case "fold":
+                    state.fold()
+                case "check_or_call":
+                    state.check_or_call()
+                case _:
+                    state.complete_bet_or_raise_to(amount)
+        self.__deal_board_until(state, self.street_index)
+
+        if state.actor_index != self.actor_index:
+            raise ValueError("The history does not lead to the decision of the actor.")
+        return state
+
+    def __deal_board_until(self, state: FastState, street_index: int):
+        """
+        Deals the board cards of the observation for the streets that begin until the given one.
+        """
+        while state.can_burn_card() and state.street_index <= street_index:
+            state.burn_card("??")
+            n_dealt = len(state.board_codes)
+            state.deal_board(self.board_codes[n_dealt:n_dealt + (3 if n_dealt == 0 else 1)])
+
+    def __eq__(self, other):
+        return isinstance(other, Observation) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+    def __hash__(self):
+        return hash(tuple(getattr(self, name) for name in self.__slots__))
+
+    def __repr__(self):
+        return (
+            f"Observation(hand_number={self.hand_number}, actor_index={self.actor_index}, "
+            f"street_index={self.street_index}, hole_codes={self.hole_codes}, board_codes={self.board_codes}, "
+            f"stacks={self.stacks}, pot={self.pot})"
+        )
+
+
+class ObservationBuilder:
+    """
+    Follows a hand to build the observations of its decisions (see Game).
+    """
+
+    def __init__(self):
+        self.__hand_number = 0
+        self.__hole_codes = []
+        self.__board_codes = ()
+        self.__chips = 0
+        self.__history = []
+        self.__rules = ((), (), (), 0)
+
+    def start_hand(self, hand_number: int, state):
+        """
+        Starts a hand once the hole cards are dealt.
+
+        Args:
+            hand_number (int): Number of the hand in its game.
+            state (NoLimitTexasHoldem.State | FastState): The state of the hand.
+        """
+        self.__hand_number = hand_number
+        if isinstance(state, FastState):
+            self.__hole_codes = [tuple(codes) for codes in state.hole_codes]
+            min_bet = state.min_bet
+        else:
+            self.__hole_codes = [None] * state.player_count
+            min_bet = state.streets[0].min_completion_betting_or_raising_amount
+        self.__rules = (tuple(state.starting_stacks), tuple(state.antes), tuple(state.blinds_or_straddles), min_bet)
+        self.__board_codes = ()
+        self.__chips = sum(state.starting_stacks)
+        self.__history = []
+
+    def deal_board(self, state):
+        """
+        Takes the board cards dealt for a new street.
+
+        Args:
+            state (NoLimitTexasHoldem.State | FastState): The state of the hand.
+        """
+        if isinstance(state, FastState):
+            self.__board_codes = tuple(state.board_codes)
+        else:
+            self.__board_codes = tuple(card_codes(cards[0] for cards in state.board_cards))
+
+    def record_action(self, player_index: int, street_index: int, action: str, amount: int):
+        """
+        Appends an action to the history.
+
+        Args:
+            player_index (int): Index of the player.
+            street_index (int): Index of the street.
+            action (str): "fold", "check_or_call" or "complete_bet_or_raise_to".
+            amount (int): Amount of the action (see Observation.history).
+        """
+        self.__history.append((player_index, street_index, _ACTION_INDEX[action], amount))
+
+    def observe(self, state) -> Observation:
+        """
+        Takes a snapshot for the player to act.
+
+        Args:
+            state (NoLimitTexasHoldem.State | FastState): The state of the hand.
+
+        Returns:
+            Observation: The snapshot.
+        """
+        actor_index = state.actor_index
+        hole_codes = self.__hole_codes[actor_index]
+        if hole_codes is None:
+            hole_codes = self.__hole_codes[actor_index] = tuple(card_codes(state.hole_cards[actor_index]))
+        stacks = tuple(state.stacks)
+        starting_stacks, antes, blinds_or_straddles, min_bet = self.__rules
+        return Observation(
+            self.__hand_number,
+            actor_index,
+            state.player_count,
+            state.street_index,
+            hole_codes=hole_codes,
+            board_codes=self.__board_codes,
+            stacks=stacks,
+            bets=tuple(state.bets),
+            pot=self.__chips - sum(stacks),
+            statuses=tuple(state.statuses),
+            history=tuple(self.__history),
+            starting_stacks=starting_stacks,
+            antes=antes,
+            blinds_or_straddles=blinds_or_straddles,
+            min_bet=min_bet,
+        )
@@ -0,0 +1,276 @@
+from __future__ import annotations
+import copy
+import random
+from concurrent.futures import ProcessPoolExecutor
+from PokerBots.players.BasePlayer import BasePlayer
+from PokerBots.game.Game import Game
+from PokerBots.game.GameStats import GameStats
+from PokerBots.equity.EquityCache import shared_equity_cache
+
+
+class PlayerSummary:
+    """
+    Aggregated results of a single seat across many games.
+
+    Attributes:
+        name (str): The name of the player sitting in this seat.
+        final_stacks (list[int]): Stack at the end of each game, in game order.
+        hands_played (int): Number of hands the player was dealt into.
+        hands_won (int): Number of hands with a positive payoff.
+        chips_won (int): Net amount of chips won over all games.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.final_stacks = []
+        self.hands_played = 0
+        self.hands_won = 0
+        self.chips_won = 0
+
+    @property
+    def chips_won_per_100_hands(self) -> float:
+        """
+        Net chips won per 100 hands played (0.0 if the player never played a hand).
+        """
+        if self.hands_played == 0:
+            return 0.0
+        return 100 * self.chips_won / self.hands_played
+
+    def merge(self, other: "PlayerSummary"):
+        """
+        Adds the results of another summary of the same seat to this one.
+
+        Args:
+            other (PlayerSummary): Results to merge in. Its games are appended after the current ones.
+        """
+        self.final_stacks.extend(other.final_stacks)
+        self.hands_played += other.hands_played
+        self.hands_won += other.hands_won
+        self.chips_won += other.chips_won
+
+    def __repr__(self):
+        return (
+            f"PlayerSummary(name={self.name!r}, games={len(self.final_stacks)}, hands_played={self.hands_played}, "
+            f"hands_won={self.hands_won}, chips_won_per_100_hands={self.chips_won_per_100_hands:.1f})"
+        )
+
+
+class SimulationSummary:
+    """
+    Results of a batch of independent games, one PlayerSummary per seat.
+
+    Attributes:
+        players (list[PlayerSummary]): Per-seat results, in the seat order of the simulated players.
+        n_games (int): Number of games played.
+        n_hands (int): Total number of hands played over all games.
+        stats (GameStats | None): Timings of the games, if they were collected.
+    """
+
+    def __init__(self, names: list[str]):
+        self.players = [PlayerSummary(name) for name in names]
+        self.n_games = 0
+        self.n_hands = 0
+        self.stats = None
+
+    def merge(self, other: "SimulationSummary"):
+        """
+        Adds the results of another summary over the same seats to this one.
+
+        Args:
+            other (SimulationSummary): Results to merge in.
+        """
+        if len(other.players) != len(self.players):
+            raise ValueError("Cannot merge summaries with a different number of seats.")
+
+        for mine, theirs in zip(self.players, other.players):
+            mine.merge(theirs)
+        self.n_games += other.n_games
+        self.n_hands += other.n_hands
+        if other.stats is not None:
+            if self.stats is None:
+                self.stats = GameStats(sample_every=other.stats.sample_every)
+            self.stats.merge(other.stats)
+
+    def record_hand(self, seats: list[int], payoffs: list[int]):
+        """
+        Adds the result of one hand.
+
+        Args:
+            seats (list[int]): Seat of each player dealt into the hand.
+            payoffs (list[int]): Payoff of each of these players.
+        """
+        self.n_hands += 1
+        for seat_index, payoff in zip(seats, payoffs):
+            seat = self.players[seat_index]
+            seat.hands_played += 1
+            seat.chips_won += payoff
+            if payoff > 0:
+                seat.hands_won += 1
+
+    def __repr__(self):
+        return f"SimulationSummary(n_games={self.n_games}, n_hands={self.n_hands}, players={self.players})"
+
+
+def play_seeded_game(
+    players: list[BasePlayer],
+    initial_stack: float,
+    rounds: int,
+    seed: int,
+    engine: str = "pokerkit",
+    *,
+    stats_sample_every: int | None = None,
+) -> SimulationSummary:
+    """
+    Plays one game with fresh copies of the given players and the `random` module seeded with `seed`.
+
+    The players are deep-copied, so the same template players can be reused for every game and the outcome only
+    depends on the seed.
+
+    Args:
+        players (list[BasePlayer]): Template players, one per seat.
+        initial_stack (float): Starting chip count for each player.
+        rounds (int): Maximum number of rounds to play.
+        seed (int): Seed of the `random` module for this game.
+        engine (str): Engine of the game ("pokerkit" or "fast"). Default is "pokerkit".
+        stats_sample_every (int | None): Time one hand out of this many (see GameStats). Default is None (no timing).
+
+    Returns:
+        SimulationSummary: Results of this single game.
+    """
+    random.seed(seed)
+    # A hit in the shared cache skips a simulation and its random draws, so the cache must not outlive the game.
+    shared_equity_cache().clear()
+    players = copy.deepcopy(players)
+    seat_of = {id(player): seat for seat, player in enumerate(players)}
+
+    summary = SimulationSummary([player.name for player in players])
+    summary.n_games = 1
+
+    stats = None if stats_sample_every is None else GameStats(sample_every=stats_sample_every)
+    game = Game(players=players, initial_stack=initial_stack, engine=engine, stats=stats)
+    summary.stats = stats
+    for _ in range(rounds):
+        seats = [seat_of[id(player)] for player in game.players]
+        is_over = game.play_round(verbose=False)
+        summary.record_hand(seats, game.state.payoffs)
+
+        if is_over:
+            break
+
+    final_stacks = {id(player): stack for player, stack in zip(game.players, game.stacks)}
+    for player, seat in zip(players, summary.players):
+        seat.final_stacks.append(final_stacks.get(id(player), 0))
+
+    return summary
+
+
+# Template players and game settings of the current worker process, set once by the pool initializer.
+_worker_config = None
+
+
+def _init_worker(
+    players: list[BasePlayer], initial_stack: float, rounds: int, engine: str, stats_sample_every: int | None
+):
+    global _worker_config  # pylint: disable=global-statement
+    _worker_config = (players, initial_stack, rounds, engine, stats_sample_every)
+
+
+def _play_game_in_worker(seed: int) -> SimulationSummary:
+    players, initial_stack, rounds, engine, stats_sample_every = _worker_config
+    return play_seeded_game(players, initial_stack, rounds, seed, engine, stats_sample_every=stats_sample_every)
+
+
+class SimulationRunner:
+    """
+    Plays many independent games across a pool of processes and merges the results.
+
+    Every game gets its own seed derived from the master seed and the index of the game, and results are merged in
+    game order. Hence, for a given master seed the summary is the same no matter how many workers are used.
+
+    Attributes:
+        players (list[BasePlayer]): Template players, one per seat. Every game is played with fresh copies.
+        initial_stack (float): Starting chip count for each player.
+        rounds (int): Maximum number of rounds in each game.
+        n_workers (int): Number of worker processes. 1 plays all games in the current process.
+        seed (int): Master seed.
+        engine (str): Engine of the games ("pokerkit" or "fast").
+        stats_sample_every (int | None): Time one hand out of this many (see GameStats), or None to time nothing.
+    """
+
+    def __init__(
+        self,
+        players: list[BasePlayer],
+        *,
+        initial_stack: float = 30_000,
+        rounds: int = 100,
+        n_workers: int = 1,
+        seed: int = 0,
+        engine: str = "pokerkit",
+        stats_sample_every: int | None = None,
+    ):
+        """
+        Initializes the runner.
+
+        Args:
+            players (list[BasePlayer]): Template players, one per seat. They must be picklable if n_workers > 1.
+            initial_stack (float): Starting chip count for each player. Default is 30,000.
+            rounds (int): Maximum number of rounds in each game. Default is 100.
+            n_workers (int): Number of worker processes. Default is 1 (no pool).
+            seed (int): Master seed. Default is 0.
+            engine (str): Engine of the games, "pokerkit" or "fast" (same results, many times faster).
+                Default is "pokerkit".
+            stats_sample_every (int | None): Time one hand out of this many. The merged timings are returned in
+                `SimulationSummary.stats`. Default is None (no timing).
+        """
+        self.players = players
+        self.initial_stack = initial_stack
+        self.rounds = rounds
+        self.n_workers = n_workers
+        self.seed = seed
+        self.engine = engine
+        self.stats_sample_every = stats_sample_every
+
+    def game_seeds(self, n_games: int) -> list[int]:
+        """
+        Derives the seeds of the first `n_games` games from the master seed.
+
+        Args:
+            n_games (int): Number of games.
+
+        Returns:
+            list[int]: One 64-bit seed per game.
+        """
+        rng = random.Random(self.seed)
+        return [rng.getrandbits(64) for _ in range(n_games)]
+
+    def run(self, n_games: int) -> SimulationSummary:
+        """
+        Plays `n_games` independent games.
+
+        Args:
+            n_games (int): Number of games to play.
+
+        Returns:
+            SimulationSummary: Merged per-seat results of all games.
+        """
+        summary = SimulationSummary([player.name for player in self.players])
+        seeds = self.game_seeds(n_games)
+
+        if self.n_workers == 1:
+            for seed in seeds:
+                summary.merge(play_seeded_game(
+                    self.players, self.initial_stack, self.rounds, seed, self.engine,
+                    stats_sample_every=self.stats_sample_every,
+                ))
+            return summary
+
+        with ProcessPoolExecutor(
+            max_workers=self.n_workers,
+            initializer=_init_worker,
+            initargs=(self.players, self.initial_stack, self.rounds, self.engine, self.stats_sample_every),
+        ) as executor:
+            chunksize = max(1, n_games // (4 * self.n_workers))
+            for result in executor.map(_play_game_in_worker, seeds, chunksize=chunksize):
+                summary.merge(result)
+
+        return summary
@@ -0,0 +1,530 @@
+"""
+Multi-table freezeout tournaments.
+
+Entrants are plain integers: a PlayerRegistry keeps their stacks, tables and finish positions in arrays, and an entrant
+only gets a bot (a copy of one of the template players) while its table is playing, so a tournament of tens of
+thousands of entrants takes a few hundred kilobytes between segments.
+
+The tournament is played in segments of `balance_every` hands. During a segment the tables are independent games (see
+`play_table`), so they can be played by a pool of processes; between segments, the busted entrants are ranked, tables
+are broken and the remaining ones balanced. The blinds follow the hand clock of the tournament, which is the same at
+every table.
+"""
+from __future__ import annotations
+import copy
+import math
+import random
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from PokerBots.players.BasePlayer import BasePlayer
+from PokerBots.game.Game import Game
+from PokerBots.equity.EquityCache import shared_equity_cache
+
+
+class BlindLevel:
+    """
+    The forced bets of a level of a tournament.
+
+    Attributes:
+        small_blind (int): Small blind.
+        big_blind (int): Big blind, also the minimum bet.
+        ante (int): Ante of every player.
+    """
+
+    __slots__ = ("small_blind", "big_blind", "ante")
+
+    def __init__(self, small_blind: int, big_blind: int, ante: int = 0):
+        if not 0 < small_blind <= big_blind or ante < 0:
+            raise ValueError(f"Invalid level: {small_blind}/{big_blind} with an ante of {ante}.")
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.ante = ante
+
+    def __eq__(self, other):
+        return isinstance(other, BlindLevel) and (self.small_blind, self.big_blind, self.ante) == (
+            other.small_blind, other.big_blind, other.ante
+        )
+
+    def __hash__(self):
+        return hash((self.small_blind, self.big_blind, self.ante))
+
+    def __repr__(self):
+        return f"BlindLevel({self.small_blind}/{self.big_blind}, ante={self.ante})"
+
+
+class BlindSchedule:
+    """
+    Blind levels that go up every `hands_per_level` hands of the tournament clock. The last level lasts forever.
+
+    Attributes:
+        levels (list[BlindLevel]): The levels, in order.
+        hands_per_level (int): Number of hands of each level.
+    """
+
+    def __init__(self, levels: list[BlindLevel], hands_per_level: int = 10):
+        """
+        Initializes the schedule.
+
+        Args:
+            levels (list[BlindLevel]): The levels, in order.
+            hands_per_level (int): Number of hands of each level. Default is 10.
+        """
+        if not levels:
+            raise ValueError("A schedule needs at least one level.")
+        if hands_per_level < 1:
+            raise ValueError(f"Invalid number of hands per level: {hands_per_level}.")
+        self.levels = list(levels)
+        self.hands_per_level = hands_per_level
+
+    @classmethod
+    def geometric(
+        cls,
+        big_blind: int = 200,
+        *,
+        growth: float = 1.5,
+        n_levels: int = 30,
+        hands_per_level: int = 10,
+        ante_ratio: float = 0.125,
+    ) -> BlindSchedule:
+        """
+        Builds a schedule whose blinds grow by the same factor at every level.
+
+        Args:
+            big_blind (int): Big blind of the first level. Default is 200.
+            growth (float): Ratio of the big blinds of consecutive levels. Default is 1.5.
+            n_levels (int): Number of levels. Default is 30.
+            hands_per_level (int): Number of hands of each level. Default is 10.
+            ante_ratio (float): Ante of each level as a fraction of its big blind. Default is 0.125.
+
+        Returns:
+            BlindSchedule: The schedule.
+        """
+        levels = []
+        for level_index in range(n_levels):
+            level_big_blind = max(2, round(big_blind * growth ** level_index))
+            levels.append(BlindLevel(level_big_blind // 2, level_big_blind, int(level_big_blind * ante_ratio)))
+        return cls(levels, hands_per_level)
+
+    def level(self, hand_number: int) -> BlindLevel:
+        """
+        The level of a hand.
+
+        Args:
+            hand_number (int): Number of the hand on the tournament clock, from 0.
+
+        Returns:
+            BlindLevel: Its level.
+        """
+        return self.levels[min(hand_number // self.hands_per_level, len(self.levels) - 1)]
+
+
+class PlayerRegistry:
+    """
+    The entrants of a tournament, stored in arrays indexed by entrant number.
+
+    Entrant i plays with the template player `players[i % len(players)]`.
+
+    Attributes:
+        players (list[BasePlayer]): Template players.
+        stacks (array): Stack of each entrant (0 once busted).
+        tables (array): Table of each entrant (-1 once busted).
+        finish_positions (array): Finish position of each entrant (1 for the winner), 0 while they are still in.
+        n_remaining (int): Number of entrants still in.
+    """
+
+    def __init__(self, players: list[BasePlayer], n_entrants: int, initial_stack: int):
+        """
+        Registers the entrants.
+
+        Args:
+            players (list[BasePlayer]): Template players.
+            n_entrants (int): Number of entrants.
+            initial_stack (int): Starting stack of every entrant.
+        """
+        if not players:
+            raise ValueError("A tournament needs at least one template player.")
+        if n_entrants < 2:
+            raise ValueError(f"A tournament needs at least 2 entrants, not {n_entrants}.")
+        self.players = list(players)
+        self.stacks = array("q", [initial_stack]) * n_entrants
+        self.tables = array("i", [-1]) * n_entrants
+        self.finish_positions = array("i", [0]) * n_entrants
+        self.n_remaining = n_entrants
+
+    def __len__(self):
+        return len(self.stacks)
+
+    def player(self, entrant: int) -> BasePlayer:
+        """
+        The template player of an entrant.
+        """
+        return self.players[entrant % len(self.players)]
+
+    def name(self, entrant: int) -> str:
+        """
+        The name of an entrant: the name of its template player and its number.
+        """
+        return f"{self.player(entrant).name} #{entrant}"
+
+    def eliminate(self, entrant: int):
+        """
+        Busts an entrant, who finishes in the best position not taken yet.
+        """
+        self.finish_positions[entrant] = self.n_remaining
+        self.stacks[entrant] = 0
+        self.tables[entrant] = -1
+        self.n_remaining -= 1
+
+
+class TournamentResult:
+    """
+    Outcome of a tournament.
+
+    Entrant i played with the template player `player_names[i % len(player_names)]`.
+
+    Attributes:
+        player_names (list[str]): Names of the template players.
+        finish_positions (list[int]): Finish position of each entrant (1 for the winner).
+        n_hands (int): Number of hands on the tournament clock.
+        n_table_hands (int): Number of hands played, summed over the tables.
+        complete (bool): False if the tournament was stopped at `max_hands` or by its time budget. The entrants still in
+            are then ranked by stack.
+    """
+
+    def __init__(
+        self, player_names: list[str], finish_positions: list[int], *, n_hands: int, n_table_hands: int, complete: bool
+    ):
+        self.player_names = player_names
+        self.finish_positions = finish_positions
+        self.n_hands = n_hands
+        self.n_table_hands = n_table_hands
+        self.complete = complete
+
+    def name(self, entrant: int) -> str:
+        """
+        The name of an entrant (see `PlayerRegistry.name`).
+        """
+        return f"{self.player_names[entrant % len(self.player_names)]} #{entrant}"
+
+    @property
+    def winner(self) -> int:
+        """
+        The entrant who finished first.
+        """
+        return self.finish_positions.index(1)
+
+    def ranking(self) -> list[int]:
+        """
+        The entrants from the winner to the first one busted.
+        """
+        return sorted(range(len(self.finish_positions)), key=self.finish_positions.__getitem__)
+
+    def average_finish(self) -> dict[str, float]:
+        """
+        Average finish position of the entrants of each template player, keyed by its name.
+        """
+        totals = {}
+        for entrant, position in enumerate(self.finish_positions):
+            player_name = self.player_names[entrant % len(self.player_names)]
+            total, count = totals.get(player_name, (0, 0))
+            totals[player_name] = (total + position, count + 1)
+        return {name: total / count for name, (total, count) in totals.items()}
+
+    def __repr__(self):
+        return (
+            f"TournamentResult(n_entrants={len(self.finish_positions)}, winner={self.name(self.winner)!r}, "
+            f"n_hands={self.n_hands}, n_table_hands={self.n_table_hands}, complete={self.complete})"
+        )
+
+
+def play_table(  # pylint: disable=too-many-positional-arguments
+    players: list[BasePlayer],
+    schedule: BlindSchedule,
+    engine: str,
+    seed: int,
+    entrants: list[int],
+    stacks: list[int],
+    first_hand: int,
+    n_hands: int,
+) -> tuple[list[int], list[int], list[tuple[int, int, int]], int]:
+    """
+    Plays up to `n_hands` hands at a table, with fresh copies of the players and the `random` module seeded with `seed`.
+
+    The button moves one seat every hand. The table stops early when a single entrant is left.
+
+    Args:
+        players (list[BasePlayer]): Template players (see PlayerRegistry).
+        schedule (BlindSchedule): Blind schedule of the tournament.
+        engine (str): Engine of the game ("pokerkit" or "fast").
+        seed (int): Seed of the `random` module for this table.
+        entrants (list[int]): Entrants of the table, in seat order (the first one posts the small blind).
+        stacks (list[int]): Their stacks.
+        first_hand (int): Number of the first hand on the tournament clock.
+        n_hands (int): Maximum number of hands to play.
+
+    Returns:
+        tuple: The entrants in seat order for the next hand, their stacks (0 for the busted ones), the eliminations as
+            (hand index in the segment, starting stack of the hand, entrant), and the number of hands played.
+    """
+    random.seed(seed)
+    # A hit in the shared cache skips a simulation and its random draws, so the cache must not outlive the table.
+    shared_equity_cache().clear()
+    bots = [copy.deepcopy(players[entrant % len(players)]) for entrant in entrants]
+    stacks = list(stacks)
+    seats = list(range(len(entrants)))
+    eliminations = []
+
+    game = Game(players=bots, engine=engine)
+    hand_index = 0
+    while hand_index < n_hands:
+        seats = [seat for seat in seats if stacks[seat] > 0]
+        if len(seats) < 2:
+            break
+        level = schedule.level(first_hand + hand_index)
+        game.ante, game.blinds, game.min_bet = level.ante, (level.small_blind, level.big_blind), level.big_blind
+        game.seat_players([bots[seat] for seat in seats], [stacks[seat] for seat in seats])
+        game.play_round(verbose=False)
+
+        for seat, stack in zip(seats, game.state.stacks):
+            if stack == 0:
+                eliminations.append((hand_index, stacks[seat], entrants[seat]))
+            stacks[seat] = stack
+        seats = seats[1:] + seats[:1]
+        hand_index += 1
+
+    return [entrants[seat] for seat in seats], [stacks[seat] for seat in seats], eliminations, hand_index
+
+
+# Template players and tournament settings of the current worker process, set once by the pool initializer.
+_worker_config = None
+
+
+def _init_worker(players: list[BasePlayer], schedule: BlindSchedule, engine: str):
+    global _worker_config  # pylint: disable=global-statement
+    _worker_config = (players, schedule, engine)
+
+
+def _play_table_in_worker(task: tuple) -> tuple:
+    players, schedule, engine = _worker_config
+    return play_table(players, schedule, engine, *task)
+
+
+class Tournament:
+    """
+    A multi-table freezeout tournament between copies of template players.
+
+    Entrants are seated at random at tables of at most `table_size` players. Every segment, each table plays up to
+    `balance_every` hands; then the busted entrants are ranked (those busted in an earlier hand of the segment finish
+    lower, and among those busted in the same hand, the one who started it with fewer chips), tables are broken while
+    the others have enough empty seats for their players, and players are moved from the largest tables to the smallest
+    ones until their sizes differ by at most one. The player moved is the next big blind of their table.
+
+    Every table of every segment gets its own seed derived from the master seed, so for a given seed the result is the
+    same no matter how many workers are used.
+
+    Attributes:
+        registry (PlayerRegistry): The entrants.
+        schedule (BlindSchedule): Blind schedule.
+        table_size (int): Maximum number of players per table.
+        balance_every (int): Number of hands between two balancings.
+        engine (str): Engine of the games ("pokerkit" or "fast").
+        n_workers (int): Number of worker processes. 1 plays all tables in the current process.
+        seed (int): Master seed.
+        max_hands (int | None): Maximum number of hands on the tournament clock, or None to play until a single entrant
+            is left.
+        time_budget (float | None): Maximum duration of `run` in seconds, or None for no limit.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        players: list[BasePlayer],
+        *,
+        n_entrants: int | None = None,
+        initial_stack: int = 30_000,
+        schedule: BlindSchedule | None = None,
+        table_size: int = 9,
+        balance_every: int = 10,
+        engine: str = "fast",
+        n_workers: int = 1,
+        seed: int = 0,
+        max_hands: int | None = None,
+        time_budget: float | None = None,
+    ):
+        """
+        Initializes the tournament.
+
+        Args:
+            players (list[BasePlayer]): Template players. Entrant i plays with `players[i % len(players)]`. They must
+                be picklable if n_workers > 1.
+            n_entrants (int | None): Number of entrants. Default is None (one per template player).
+            initial_stack (int): Starting stack of every entrant. Default is 30,000.
+            schedule (BlindSchedule | None): Blind schedule. Default is None (`BlindSchedule.geometric()`, from
+                100/200 with an ante of 25, up by half every 10 hands).
+            table_size (int): Maximum number of players per table, from 2 to 10. Default is 9.
+            balance_every (int): Number of hands between two balancings. Default is 10.
+            engine (str): Engine of the games, "pokerkit" or "fast". Default is "fast".
+            n_workers (int): Number of worker processes. Default is 1 (no pool).
+            seed (int): Master seed. Default is 0.
+            max_hands (int | None): Maximum number of hands on the tournament clock. Default is None (no limit).
+            time_budget (float | None): Maximum duration of `run` in seconds. It is checked after every table played
+                in the current process, or after every segment with a pool. When it runs out, the tables that did not
+                play the last segment keep their stacks and the tournament stops. Results then depend on the speed of
+                the machine. Default is None (no limit).
+        """
+        if not 2 <= table_size <= 10:
+            raise ValueError(f"Invalid table size: {table_size}. Tables seat 2 to 10 players.")
+        if balance_every < 1:
+            raise ValueError(f"Invalid number of hands between balancings: {balance_every}.")
+        self.registry = PlayerRegistry(players, len(players) if n_entrants is None else n_entrants, initial_stack)
+        self.schedule = BlindSchedule.geometric() if schedule is None else schedule
+        self.table_size = table_size
+        self.balance_every = balance_every
+        self.engine = engine
+        self.n_workers = n_workers
+        self.seed = seed
+        self.max_hands = max_hands
+        self.time_budget = time_budget
+
+    def run(self) -> TournamentResult:
+        """
+        Plays the tournament.
+
+        Tables played in the current process (with a single worker) seed the `random` module and clear the shared
+        equity cache, as in a worker. The state of `random` is restored when the tables of a segment are done, but the
+        cache is left empty.
+
+        Returns:
+            TournamentResult: Finish positions of the entrants.
+        """
+        deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+        rng = random.Random(self.seed)
+        tables = self.__seat_entrants(rng)
+        n_hands = 0
+        n_table_hands = 0
+
+        executor = None
+        if self.n_workers > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=self.n_workers,
+                initializer=_init_worker,
+                initargs=(self.registry.players, self.schedule, self.engine),
+            )
+        try:
+            while self.registry.n_remaining > 1 and (self.max_hands is None or n_hands < self.max_hands):
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+                n_segment_hands = self.balance_every
+                if self.max_hands is not None:
+                    n_segment_hands = min(n_segment_hands, self.max_hands - n_hands)
+                tasks = [
+                    (rng.getrandbits(64), entrants, [self.registry.stacks[entrant] for entrant in entrants], n_hands,
+                     n_segment_hands)
+                    for entrants in tables
+                ]
+                if executor is None:
+                    results = self.__play_tables(tasks, deadline)
+                else:
+                    chunksize = max(1, len(tasks) // (4 * self.n_workers))
+                    results = list(executor.map(_play_table_in_worker, tasks, chunksize=chunksize))
+
+                tables, segment_hands = self.__collect(results)
+                n_hands += segment_hands
+                n_table_hands += sum(result[3] for result in results)
+                tables = self.balance(tables)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        return self.__result(n_hands, n_table_hands)
+
+    def balance(self, tables: list[list[int]]) -> list[list[int]]:
+        """
+        Breaks and balances tables (see Tournament), and records the table of every entrant in the registry.
+
+        Args:
+            tables (list[list[int]]): Entrants of each table, in seat order, without the busted ones.
+
+        Returns:
+            list[list[int]]: The new tables. Tables keep their index unless an earlier one was broken.
+        """
+        tables = [entrants for entrants in tables if entrants]
+        n_tables = math.ceil(sum(len(entrants) for entrants in tables) / self.table_size)
+
+        while len(tables) > n_tables:
+            broken = tables.pop(max(range(len(tables)), key=lambda index: (-len(tables[index]), index)))
+            for entrant in broken:
+                min(tables, key=len).append(entrant)
+
+        while True:
+            smallest = min(tables, key=len)
+            largest = max(tables, key=len)
+            if len(largest) - len(smallest) <= 1:
+                break
+            smallest.append(largest.pop(1))
+
+        for table_index, entrants in enumerate(tables):
+            for entrant in entrants:
+                self.registry.tables[entrant] = table_index
+        return tables
+
+    def __play_tables(self, tasks: list[tuple], deadline: float | None) -> list[tuple]:
+        """
+        Plays the tables of a segment in the current process. Once the deadline is passed, the other tables do not play.
+        """
+        results = []
+        random_state = random.getstate()
+        try:
+            for task in tasks:
+                _, entrants, stacks, _, _ = task
+                if deadline is not None and time.perf_counter() >= deadline:
+                    results.append((entrants, stacks, [], 0))
+                else:
+                    results.append(play_table(self.registry.players, self.schedule, self.engine, *task))
+        finally:
+            random.setstate(random_state)
+        return results
+
+    def __seat_entrants(self, rng: random.Random) -> list[list[int]]:
+        """
+        Draws the seats of the entrants.
+        """
+        entrants = list(range(len(self.registry)))
+        rng.shuffle(entrants)
+        n_tables = math.ceil(len(entrants) / self.table_size)
+        return self.balance([entrants[table_index::n_tables] for table_index in range(n_tables)])
+
+    def __collect(self, results: list[tuple]) -> tuple[list[list[int]], int]:
+        """
+        Updates the registry with the results of the tables and ranks the busted entrants.
+
+        Returns:
+            tuple[list[list[int]], int]: The tables without the busted entrants, and the number of hands of the segment
+                on the tournament clock.
+        """
+        tables = []
+        eliminations = []
+        for entrants, stacks, table_eliminations, _ in results:
+            for entrant, stack in zip(entrants, stacks):
+                self.registry.stacks[entrant] = stack
+            tables.append([entrant for entrant, stack in zip(entrants, stacks) if stack > 0])
+            eliminations.extend(table_eliminations)
+
+        # The first ones busted finish last.
+        for _, _, entrant in sorted(eliminations):
+            self.registry.eliminate(entrant)
+        return tables, max(result[3] for result in results)
+
+    def __result(self, n_hands: int, n_table_hands: int) -> TournamentResult:
+        """
+        Ranks the entrants still in by stack and builds the result.
+        """
+        registry = self.registry
+        complete = registry.n_remaining == 1
+        remaining = [entrant for entrant in range(len(registry)) if registry.finish_positions[entrant] == 0]
+        for position, entrant in enumerate(sorted(remaining, key=lambda entrant: -registry.stacks[entrant]), start=1):
+            registry.finish_positions[entrant] = position
+        player_names = [player.name for player in registry.players]
+        return TournamentResult(
+            player_names, list(registry.finish_positions), n_hands=n_hands, n_table_hands=n_table_hands, complete=complete
+        )
@@ -0,0 +1,52 @@
+from PokerBots.game.GameEvents import (
+    GameEvent, HandStarted, BlindPosted, ActionTaken, StreetDealt, PayoffsSettled, GameWon
+)
+
+
+class VerboseLogger:
+    """
+    Subscriber that prints a game as it goes (this is what `Game.play_round(verbose=True)` prints).
+
+    The header of a street is only printed once somebody acts on it.
+    """
+
+    def __init__(self):
+        self.__pending_street = None
+
+    def __call__(self, event: GameEvent):
+        match event:
+            case HandStarted():
+                print("INFO: ROUND STARTS")
+                print(f"INFO: stacks = {list(event.stacks)}")
+            case BlindPosted():
+                print(f"INFO: Player {event.player_name} bets {event.amount}.")
+            case StreetDealt():
+                self.__pending_street = event.street
+            case ActionTaken():
+                self.__log_action(event)
+            case PayoffsSettled():
+                self.__pending_street = None
+                print("INFO: ===== ROUND RESULTS =====")
+                for name, payoff in zip(event.player_names, event.payoffs):
+                    if payoff >= 0:
+                        print(f"INFO: Player {name} won {payoff}")
+                    else:
+                        print(f"INFO: Player {name} lost {-payoff}")
+                print("==========================================")
+            case GameWon():
+                print(f"INFO: Player {event.player_name} won the Tournament.")
+
+    def __log_action(self, event: ActionTaken):
+        if self.__pending_street is not None:
+            print(f"INFO: ===== {self.__pending_street} =====")
+            self.__pending_street = None
+
+        match event.action:
+            case "fold":
+                print(f"INFO: Player {event.player_name} folds.")
+            case "check_or_call" if event.amount == 0:
+                print(f"INFO: Player {event.player_name} checks.")
+            case "check_or_call":
+                print(f"INFO: Player {event.player_name} calls {event.amount}.")
+            case "complete_bet_or_raise_to":
+                print(f"INFO: Player {event.player_name} raises to {event.amount}")
@@ -0,0 +1,35 @@
+from pokerkit import State
+
+
+class AsyncBasePlayer:
+    """
+    Base class of the players of an AsyncGame, whose decisions are coroutines.
+
+    Bots that wait on I/O while deciding (a model server, a database of opponent stats...) should subclass it, so that
+    the other tables of the event loop keep playing while they wait. Synchronous players (BasePlayer) are wrapped in a
+    SyncPlayerAdapter instead.
+
+    Attributes:
+        name (str): The name of the player.
+        observes (bool): If True, `play` is given an Observation as `state` (see `BasePlayer.observes`).
+    """
+
+    observes = False
+
+    def __init__(self, name: str = "NPC"):
+        self.name = name
+
+    async def play(self, valid_actions: dict[str], state: State) -> tuple[str, float]:
+        """
+        Determines the player's action based on the available valid actions (see `BasePlayer.play`).
+
+        The state must not be kept across awaits: it only describes the table until the coroutine returns.
+
+        Args:
+            valid_actions (dict[str]): The valid actions and their amounts.
+            state (State): The current state of the game.
+
+        Returns:
+            tuple[str, float]: The action and its amount.
+        """
+        raise NotImplementedError(f"Player {self.__class__.__name__} must implement the 'play' method.")
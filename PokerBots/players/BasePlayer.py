@@ -1,4 +1,5 @@
-from pokerkit import State
+from pokerkit import Card, State
+from PokerBots.equity.PreflopTable import default_preflop_table
 
 class BasePlayer:
     """
@@ -6,6 +7,8 @@ class BasePlayer:
 
     Attributes:
         name (str): The name of the player.
+        observes (bool): If True, `play` is given an Observation (a compact snapshot of the hand, with cards as codes)
+            as `state` instead of the game state. False by default.
 
     Methods:
         play(self, valid_actions, state: State) -> tuple[str, float]:
@@ -13,6 +16,8 @@ class BasePlayer:
             must be implemented by subclasses.
     """
 
+    observes = False
+
     def __init__(self, name: str = "NPC"):
         self.name = name
 
@@ -29,5 +34,35 @@ class BasePlayer:
         valid_actions["complete_bet_or_raise_to"] = [min_bet, max_bet]
 
         But note that "complete_bet_or_raise_to" may not be among the valid actions.
+
+        `state` is an Observation if the player `observes`, the game state otherwise.
         """
         raise NotImplementedError(f"Player {self.__class__.__name__} must implement the 'play' method.")
+
+    def play_batch(self, observations: list[tuple[dict[str], State]]) -> list[tuple[str, float]]:
+        """
+        Determines the player's actions at several tables at once.
+
+        BatchSimulator calls it with every table where the player is to act, so that bots can make all these
+        decisions in a single vectorized call. By default, `play` is called for each table.
+
+        Args:
+            observations (list[tuple[dict[str], State]]): The valid actions and the state of each table.
+
+        Returns:
+            list[tuple[str, float]]: The action and amount chosen at each table, in the same order.
+        """
+        return [self.play(valid_actions=valid_actions, state=state) for valid_actions, state in observations]
+
+    def preflop_win_rate(self, hole_cards: list[Card], n_players: int) -> float:
+        """
+        Looks up the preflop win rate of the hole cards in the precomputed table shared by all players.
+
+        Args:
+            hole_cards (list[Card]): The two cards in the player's hand.
+            n_players (int): The number of active players, between 2 and 10.
+
+        Returns:
+            float: The share of deals in which no random opponent hand beats the hole cards (ties count as wins).
+        """
+        return default_preflop_table().win_rate(hole_cards, n_players)
@@ -1,95 +1,185 @@
-import random
-import pokerkit
-import treys
+from __future__ import annotations
+from PokerBots.game.Observation import Observation
 from PokerBots.players.BasePlayer import BasePlayer
+from PokerBots.equity.EquityCache import EquityCache, shared_equity_cache
+from PokerBots.equity.EquityEngine import EquityEngine
+from PokerBots.equity.PreflopTable import default_preflop_table
 
 class GamblingPlayer(BasePlayer):
     """
     A poker player that uses Monte-Carlo Simulation to determine when to go all-in.
+
+    When few enough deals are left (e.g. heads-up on the turn and the river), the win rate is computed exactly instead.
+    Otherwise, sampling stops as soon as the win rate is clearly above or below `win_rate_threshold`, so
+    `n_simulations` is only an upper bound. Win rates are cached (see EquityCache). By default, all gambling players
+    of a process share one cache.
+
+    The player observes (see `BasePlayer.observes`): it reads the cards of the hand as codes, which the equity tools
+    take as they are.
     """
 
-    def __init__(self, name: str = "NPC", win_rate_threshold: float = 0.9):
+    observes = True
+
+    def __init__(
+        self,
+        name: str = "NPC",
+        win_rate_threshold: float = 0.9,
+        n_simulations: int = 10_000,
+        *,
+        exact_budget: int = 50_000,
+        equity_cache: EquityCache | None = None,
+        confidence: float = 0.99,
+        time_budget: float | None = None,
+    ):
+        """
+        Initializes the player.
+
+        Args:
+            name (str): The name of the player. Default is "NPC".
+            win_rate_threshold (float): Minimum win rate to go all-in. Default is 0.9.
+            n_simulations (int): Maximum number of simulations per decision. Default is 10,000.
+            exact_budget (int): Maximum number of deals to enumerate exactly. Default is 50,000.
+            equity_cache (EquityCache | None): Cache of win rates. Default is None (the cache shared by the process).
+            confidence (float): Confidence required to stop sampling early. Default is 0.99.
+            time_budget (float | None): Maximum sampling time per decision in seconds. Default is None (no limit).
+                Decisions then depend on the speed of the machine, so seeded games are no longer reproducible.
+        """
         super().__init__(name=name)
         self.win_rate_threshold = win_rate_threshold
+        self.n_simulations = n_simulations
+        self.exact_budget = exact_budget
+        self.equity_cache = equity_cache
+        self.confidence = confidence
+        self.time_budget = time_budget
+
+        self.__equity_engine = EquityEngine()
 
-        self.__cards_treys = [
-            treys.Card.new(card) for card in (
-                "2c", "2d", "2h", "2s", "3c", "3d", "3h", "3s", "4c", "4d", "4h", "4s",
-                "5c", "5d", "5h", "5s", "6c", "6d", "6h", "6s", "7c", "7d", "7h", "7s",
-                "8c", "8d", "8h", "8s", "9c", "9d", "9h", "9s", "Tc", "Td", "Th", "Ts",
-                "Jc", "Jd", "Jh", "Js", "Qc", "Qd", "Qh", "Qs", "Kc", "Kd", "Kh", "Ks",
-                "Ac", "Ad", "Ah", "As"
+    def play(self, valid_actions: dict[str, float], state: Observation) -> tuple[str, float]:
+
+        win_rate = None
+        if "complete_bet_or_raise_to" in valid_actions:
+            win_rate = self.__compute_win_rate_using_monte_carlo_simulation(
+                hole_cards=state.hole_codes,
+                board_cards=state.board_codes,
+                n_players=state.player_count,
+                n_simulations=self.n_simulations,
             )
-        ]
+        return self.__choose_action(valid_actions, win_rate)
 
-    def play(self, valid_actions: dict[str, float], state: pokerkit.State) -> tuple[str, float]:
+    def play_batch(self, observations: list[tuple[dict[str, float], Observation]]) -> list[tuple[str, float]]:
+        """
+        Chooses the actions at several tables at once.
 
-        hole_cards = state.hole_cards[state.actor_index]
-        board_cards = [x[0] for x in state.board_cards]
+        The decisions are the same as in `play`, but the win rates that are neither in the preflop table, nor cached,
+        nor cheap to enumerate exactly are estimated together in a single `EquityEngine.estimate_batch` call. The
+        time budget does not apply to batched decisions.
 
-        n_active_players = state.player_count
+        Args:
+            observations (list[tuple[dict[str, float], Observation]]): The valid actions and the observation of each
+                table.
 
-        if "complete_bet_or_raise_to" in valid_actions:
-            win_rate: float = self.__compute_win_rate_using_monte_carlo_simulation(
-                hole_cards=hole_cards,
-                board_cards=board_cards,
-                n_players=n_active_players,
-                n_simulations=100,
+        Returns:
+            list[tuple[str, float]]: The action and amount chosen at each table.
+        """
+        cache = self.equity_cache if self.equity_cache is not None else shared_equity_cache()
+        context = self.__cache_context(self.n_simulations)
+
+        win_rates = [None] * len(observations)
+        situations = []
+        for index, (valid_actions, state) in enumerate(observations):
+            if "complete_bet_or_raise_to" not in valid_actions:
+                continue
+
+            hole_cards = state.hole_codes
+            board_cards = state.board_codes
+            n_players = state.player_count
+
+            if not board_cards and default_preflop_table().covers(n_players):
+                win_rates[index] = self.preflop_win_rate(hole_cards, n_players)
+                continue
+
+            win_rates[index] = cache.get(hole_cards, board_cards, n_players, context=context)
+            if win_rates[index] is not None:
+                continue
+
+            if EquityEngine.count_deals(len(board_cards), n_players) <= self.exact_budget:
+                result = self.__equity_engine.enumerate_exactly(hole_cards, board_cards, n_players)
+                win_rates[index] = result.win_rate + result.tie_rate
+                cache.put(hole_cards, board_cards, n_players, win_rates[index], context=context)
+            else:
+                situations.append((index, hole_cards, board_cards, n_players))
+
+        if situations:
+            indices, hole_cards, board_cards, n_players = zip(*situations)
+            results = self.__equity_engine.estimate_batch(
+                hole_cards,
+                board_cards,
+                n_players,
+                n_simulations=self.n_simulations,
+                threshold=self.win_rate_threshold,
+                confidence=self.confidence,
             )
-            if win_rate >= self.win_rate_threshold:
-                return "complete_bet_or_raise_to", valid_actions["complete_bet_or_raise_to"][1]
-            
+            for index, hole, board, players, result in zip(indices, hole_cards, board_cards, n_players, results):
+                win_rates[index] = result.win_rate + result.tie_rate
+                cache.put(hole, board, players, win_rates[index], context=context)
+
+        return [
+            self.__choose_action(valid_actions, win_rate)
+            for (valid_actions, _), win_rate in zip(observations, win_rates)
+        ]
+
+    def __choose_action(self, valid_actions: dict[str, float], win_rate: float | None) -> tuple[str, float]:
+        """
+        Goes all-in if the win rate reaches the threshold, otherwise checks if possible and folds if not.
+        """
+        if win_rate is not None and win_rate >= self.win_rate_threshold:
+            return "complete_bet_or_raise_to", valid_actions["complete_bet_or_raise_to"][1]
+
         if valid_actions.get("check_or_call") == 0:
             return "check_or_call", 0
 
         return "fold", 0.0
 
+    def __cache_context(self, n_simulations: int) -> tuple:
+        """
+        Settings the cached win rates depend on.
+        """
+        return n_simulations, self.exact_budget, self.win_rate_threshold, self.confidence, self.time_budget
+
     def __compute_win_rate_using_monte_carlo_simulation(
-        self, hole_cards: list[pokerkit.Card], board_cards: list[pokerkit.Card], n_players: int, n_simulations: int
+        self, hole_cards: tuple[int, int], board_cards: tuple[int, ...], n_players: int, n_simulations: int
     ) -> float:
         """
-        Estimate the win rate using Monte Carlo simulation.
+        Estimate the win rate using Monte Carlo simulation (or exactly if at most `exact_budget` deals are left).
+
+        Sampling stops early once the win rate is known to be above or below `win_rate_threshold`.
 
         Args:
-            hole_cards: The two cards in the player's hand.
-            board_cards: The cards currently on the board.
+            hole_cards: The codes of the two cards in the player's hand.
+            board_cards: The codes of the cards currently on the board.
             n_players: The number of active players.
-            n_simulations: The number of simulations to run.
+            n_simulations: The maximum number of simulations to run.
 
         Returns:
-            The estimated win rate (a float between 0 and 1).
+            The estimated win rate (a float between 0 and 1). Ties for the best hand count as wins.
         """
-        # Prepare the cards
-        evaluator = treys.Evaluator()
-        deck = self.__cards_treys.copy()
-        
-        hole_cards = [treys.Card.new(f"{card.rank}{card.suit}") for card in hole_cards]
-        board_cards = [treys.Card.new(f"{card.rank}{card.suit}") for card in board_cards]
+        if not board_cards and default_preflop_table().covers(n_players):
+            return self.preflop_win_rate(hole_cards, n_players)
 
-        for card in hole_cards + board_cards:
-            deck.remove(card)
-
-        wins = 0
-
-        for _ in range(n_simulations):
-            sampled_cards = random.sample(deck, 5 - len(board_cards) + 2 * (n_players - 1))
-
-            # Create a simulated board
-            simulated_board = board_cards + sampled_cards[:5 - len(board_cards)]
-            my_score = evaluator.evaluate(hand=hole_cards, board=simulated_board)
-
-            # Simulate other players' hands
-            best_score = True
-            for i in range(n_players - 1):
-                start = 5 - len(board_cards) + i * 2
-                enemy_hole_cards = sampled_cards[start:start + 2]
-                enemy_score = evaluator.evaluate(hand=enemy_hole_cards, board=simulated_board)
-
-                if my_score > enemy_score:
-                    best_score = False
-                    break
-
-            if best_score:
-                wins += 1
+        def simulate() -> float:
+            result = self.__equity_engine.equity(
+                hole_cards=hole_cards,
+                board_cards=board_cards,
+                n_players=n_players,
+                n_simulations=n_simulations,
+                exact_budget=self.exact_budget,
+                threshold=self.win_rate_threshold,
+                confidence=self.confidence,
+                time_budget=self.time_budget,
+            )
+            return result.win_rate + result.tie_rate
 
-        return wins / n_simulations
\ No newline at end of file
+        cache = self.equity_cache if self.equity_cache is not None else shared_equity_cache()
+        return cache.get_or_compute(
+            hole_cards, board_cards, n_players, simulate, context=self.__cache_context(n_simulations)
+        )
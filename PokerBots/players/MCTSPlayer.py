@@ -0,0 +1,190 @@
+from __future__ import annotations
+import math
+import random
+import time
+from PokerBots.game.FastState import FastState
+from PokerBots.game.Observation import Observation
+from PokerBots.players.BasePlayer import BasePlayer
+
+
+class _Node:
+    """
+    A node of the search tree: the decision reached by a sequence of actions, whatever the cards.
+    """
+
+    __slots__ = ("children", "visits", "total")
+
+    def __init__(self):
+        self.children = {}
+        self.visits = 0
+        self.total = 0.0
+
+
+class MCTSPlayer(BasePlayer):
+    """
+    A poker player that searches the rest of the hand with Monte Carlo tree search.
+
+    Every iteration draws the cards the player can not see (see `Observation.sample_state` and
+    `FastState.determinize`), walks down the tree of betting sequences, choosing each action of each player with UCB1,
+    adds one node, and plays the hand out with everyone checking or calling. The payoff of every player is backed up
+    along the way, so that opponents choose their actions to win chips too. The tree is shared by all the deals
+    (open-loop search): the player can not tell them apart, so it plays the action that does best on average.
+
+    Bets and raises are limited to the minimum, the pot and all-in. The player draws from its own generator, so that
+    its search does not change the deals of a seeded game.
+    """
+
+    observes = True
+
+    def __init__(
+        self,
+        name: str = "NPC",
+        n_iterations: int = 1_000,
+        *,
+        time_budget: float | None = None,
+        exploration: float = 0.3,
+        seed: int | None = None,
+    ):
+        """
+        Initializes the player.
+
+        Args:
+            name (str): The name of the player. Default is "NPC".
+            n_iterations (int): Maximum number of iterations per decision. Default is 1,000.
+            time_budget (float | None): Maximum search time per decision in seconds. Default is None (no limit).
+                Decisions then depend on the speed of the machine, so seeded games are no longer reproducible.
+            exploration (float): Exploration constant of UCB1, for payoffs measured in average starting stacks.
+                Default is 0.3.
+            seed (int | None): Seed of the generator of the player. Default is None (seeded from `random`).
+        """
+        super().__init__(name=name)
+        self.n_iterations = n_iterations
+        self.time_budget = time_budget
+        self.exploration = exploration
+        self.rng = random.Random(random.getrandbits(64) if seed is None else seed)
+        self.n_rollouts = 0
+
+    def play(self, valid_actions: dict[str, float], state: Observation) -> tuple[str, float]:
+        root_state = state.sample_state(self.rng)
+        root = self.search(root_state)
+        if not root.children:
+            return "check_or_call", valid_actions["check_or_call"]
+
+        action, amount = max(root.children.items(), key=lambda item: item[1].visits)[0]
+        if action == "complete_bet_or_raise_to":
+            min_amount, max_amount = valid_actions[action]
+            return action, min(max(amount, min_amount), max_amount)
+        return action, valid_actions[action]
+
+    def search(self, root_state: FastState) -> _Node:
+        """
+        Runs the search from a decision of the player.
+
+        Args:
+            root_state (FastState): A state where the player is to act. It is not changed.
+
+        Returns:
+            _Node: The root of the tree. Its children are keyed by (action, amount).
+        """
+        player_index = root_state.actor_index
+        scale = sum(root_state.starting_stacks) / root_state.player_count
+        deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+
+        root = _Node()
+        for _ in range(self.n_iterations):
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            state = root_state.fork()
+            state.determinize(player_index, self.rng)
+            path = self.__descend(root, state)
+            _play_out(state)
+            root.visits += 1
+            for node, actor_index in path:
+                node.visits += 1
+                node.total += state.payoffs[actor_index] / scale
+        self.n_rollouts += root.visits
+        return root
+
+    def __descend(self, node: _Node, state: FastState) -> list[tuple[_Node, int]]:
+        """
+        Walks down the tree with UCB1 until a new node is added or the hand ends, acting on the state.
+
+        Returns:
+            list[tuple[_Node, int]]: The nodes visited below the root, with the player who chose each of them.
+        """
+        path = []
+        while _deal_until_decision(state):
+            actor_index = state.actor_index
+            actions = _actions(state)
+            untried = [action for action in actions if action not in node.children]
+            if untried:
+                action = self.rng.choice(untried)
+                node.children[action] = child = _Node()
+            else:
+                log_visits = math.log(node.visits)
+                action = max(actions, key=lambda action: self.__ucb(node.children[action], log_visits))
+                child = node.children[action]
+
+            _apply(state, action)
+            path.append((child, actor_index))
+            node = child
+            if untried:
+                break
+        return path
+
+    def __ucb(self, node: _Node, log_visits: float) -> float:
+        """
+        UCB1 score of a child node.
+        """
+        return node.total / node.visits + self.exploration * math.sqrt(log_visits / node.visits)
+
+
+def _actions(state: FastState) -> list[tuple[str, int]]:
+    """
+    The actions of the search at a decision: fold (unless checking is free), check or call, and bets or raises to the
+    minimum, the pot and all-in.
+    """
+    call = state.checking_or_calling_amount
+    actions = [("check_or_call", call)] if call == 0 else [("fold", 0), ("check_or_call", call)]
+
+    min_amount = state.min_completion_betting_or_raising_to_amount
+    if min_amount is not None:
+        max_amount = state.max_completion_betting_or_raising_to_amount
+        pot = sum(state.starting_stacks) - sum(state.stacks)
+        pot_amount = max(state.bets) + pot + call
+        for amount in sorted({min_amount, min(max(pot_amount, min_amount), max_amount), max_amount}):
+            actions.append(("complete_bet_or_raise_to", amount))
+    return actions
+
+
+def _apply(state: FastState, action: tuple[str, int]):
+    """
+    Takes an action of the search.
+    """
+    name, amount = action
+    if name == "fold":
+        state.fold()
+    elif name == "check_or_call":
+        state.check_or_call()
+    else:
+        state.complete_bet_or_raise_to(amount)
+
+
+def _deal_until_decision(state: FastState) -> bool:
+    """
+    Deals the board until a player has to act. Returns False if the hand is over instead.
+    """
+    while state.actor_index is None:
+        if not state.can_burn_card():
+            return False
+        state.burn_card()
+        state.deal_board()
+    return True
+
+
+def _play_out(state: FastState):
+    """
+    Plays the hand to the end with every player checking or calling.
+    """
+    while _deal_until_decision(state):
+        state.check_or_call()
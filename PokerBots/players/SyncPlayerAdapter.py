@@ -0,0 +1,38 @@
+import asyncio
+import copy
+from pokerkit import State
+from PokerBots.players.AsyncBasePlayer import AsyncBasePlayer
+from PokerBots.players.BasePlayer import BasePlayer
+
+
+class SyncPlayerAdapter(AsyncBasePlayer):
+    """
+    Lets a synchronous player (BasePlayer) play in an AsyncGame.
+
+    By default, `play` is called directly: it is the fastest way for bots that only compute, but the event loop is
+    blocked until they return, so decision timeouts do not apply to them. With `in_thread=True`, `play` runs in a
+    worker thread on a copy of the state, so that bots blocked on I/O do not block the other tables and can time out.
+    A bot that timed out keeps running in its thread, and its late answer is dropped.
+
+    Attributes:
+        player (BasePlayer): The wrapped player.
+        in_thread (bool): Whether `play` runs in a worker thread.
+    """
+
+    def __init__(self, player: BasePlayer, *, in_thread: bool = False):
+        """
+        Wraps a player.
+
+        Args:
+            player (BasePlayer): The player. The adapter takes its name.
+            in_thread (bool): Run `play` in a worker thread. Default is False.
+        """
+        super().__init__(name=player.name)
+        self.player = player
+        self.observes = player.observes
+        self.in_thread = in_thread
+
+    async def play(self, valid_actions: dict[str], state: State) -> tuple[str, float]:
+        if self.in_thread:
+            return await asyncio.to_thread(self.player.play, valid_actions=valid_actions, state=copy.deepcopy(state))
+        return self.player.play(valid_actions=valid_actions, state=state)
@@ -0,0 +1,250 @@
+"""
+Runs the benchmark suite (see `benchmarks/suite.py`), writes the results as JSON, and compares them with a baseline.
+
+    python -m benchmarks.run run -o results.json              # all benchmarks, 3 samples of 1 second each
+    python -m benchmarks.run run --quick -k game.fast         # a quick run of the matching benchmarks only
+    python -m benchmarks.run run -o new.json --baseline results.json
+    python -m benchmarks.run compare results.json new.json    # compare two stored runs
+
+A metric regresses if its median got worse than the baseline by more than the threshold (10% by default). Comparisons
+exit with status 1 if any metric regressed, so they can gate a change.
+"""
+from __future__ import annotations
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+from benchmarks.suite import Measurement, default_benchmarks
+
+SCHEMA_VERSION = 1
+
+
+class Comparison:
+    """
+    Change of one metric between a baseline and a new run.
+
+    Attributes:
+        name (str): Name of the metric.
+        unit (str): Unit of the metric.
+        baseline (float | None): Value in the baseline (None if the metric is new).
+        current (float | None): Value in the new run (None if the metric was not measured).
+        change (float | None): Relative improvement, e.g. 0.2 for 20% better and -0.2 for 20% worse, whatever the
+            direction of the metric (None if either value is missing or the baseline is 0).
+        status (str): "regression", "improvement", "unchanged", "new" or "missing".
+    """
+
+    __slots__ = ("name", "unit", "baseline", "current", "change", "status")
+
+    def __init__(self, name: str, baseline: dict | None, current: dict | None, threshold: float):
+        result = current or baseline
+        self.name = name
+        self.unit = result["unit"]
+        self.baseline = None if baseline is None else baseline["value"]
+        self.current = None if current is None else current["value"]
+        self.change = None
+
+        if baseline is None:
+            self.status = "new"
+        elif current is None:
+            self.status = "missing"
+        else:
+            if self.baseline:
+                self.change = (self.current - self.baseline) / abs(self.baseline)
+                if not result["higher_is_better"]:
+                    self.change = -self.change
+            if self.change is not None and self.change < -threshold:
+                self.status = "regression"
+            elif self.change is not None and self.change > threshold:
+                self.status = "improvement"
+            else:
+                self.status = "unchanged"
+
+    def __repr__(self):
+        return f"Comparison(name={self.name!r}, change={self.change}, status={self.status!r})"
+
+
+def run_suite(*, quick: bool = False, pattern: str | None = None, seed: int = 0) -> dict:
+    """
+    Runs the benchmarks.
+
+    Args:
+        quick (bool): Take one short sample of each benchmark instead of three 1-second samples. Default is False.
+        pattern (str | None): Only run the benchmarks whose name contains this string. Default is None (all).
+        seed (int): Seed of the samples. Default is 0.
+
+    Returns:
+        dict: The results, in the format written by `write_results`.
+    """
+    repeat, duration = (1, 0.2) if quick else (3, 1.0)
+    measurements = []
+    for benchmark in default_benchmarks():
+        if pattern is not None and pattern not in benchmark.name:
+            continue
+        for measurement in benchmark.run(repeat=repeat, duration=duration, seed=seed):
+            print(f"{measurement.name:<45}{measurement.value:14.6g} {measurement.unit}", flush=True)
+            measurements.append(measurement)
+    return results_to_dict(measurements, metadata={"quick": quick, "seed": seed, **_environment()})
+
+
+def results_to_dict(measurements: list[Measurement], metadata: dict) -> dict:
+    """
+    Converts measurements to the JSON representation of a run.
+
+    Args:
+        measurements (list[Measurement]): The measurements.
+        metadata (dict): Settings of the run and description of the machine.
+
+    Returns:
+        dict: The schema version, the metadata and the results by name.
+    """
+    return {
+        "schema": SCHEMA_VERSION,
+        "metadata": metadata,
+        "results": {measurement.name: measurement.to_dict() for measurement in measurements},
+    }
+
+
+def _environment() -> dict:
+    """
+    Describes the machine and the code being measured.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True, timeout=10
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def write_results(results: dict, path: str):
+    """
+    Writes the results of a run to a JSON file.
+
+    Args:
+        results (dict): The results.
+        path (str): The file.
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+        file.write("\n")
+
+
+def read_results(path: str) -> dict:
+    """
+    Reads the results of a run from a JSON file.
+
+    Args:
+        path (str): The file.
+
+    Returns:
+        dict: The results.
+
+    Raises:
+        ValueError: If the file was written by an incompatible version of the suite.
+    """
+    with open(path, encoding="utf-8") as file:
+        results = json.load(file)
+    if results.get("schema") != SCHEMA_VERSION:
+        raise ValueError(f"{path} has schema {results.get('schema')}, expected {SCHEMA_VERSION}.")
+    return results
+
+
+def compare_results(baseline: dict, current: dict, threshold: float = 0.1) -> list[Comparison]:
+    """
+    Compares every metric of two runs.
+
+    Args:
+        baseline (dict): Results of the reference run.
+        current (dict): Results of the new run.
+        threshold (float): Relative change above which a metric counts as regressed or improved. Default is 0.1.
+
+    Returns:
+        list[Comparison]: One comparison per metric of either run, in the order of the new run.
+    """
+    old, new = baseline["results"], current["results"]
+    names = [*new, *(name for name in old if name not in new)]
+    return [Comparison(name, old.get(name), new.get(name), threshold) for name in names]
+
+
+def format_comparisons(comparisons: list[Comparison]) -> str:
+    """
+    Formats comparisons as a table.
+
+    Args:
+        comparisons (list[Comparison]): The comparisons.
+
+    Returns:
+        str: One line per metric, and a summary line.
+    """
+    def number(value: float | None) -> str:
+        return "-" if value is None else f"{value:.6g}"
+
+    lines = [f"{'metric':<45}{'baseline':>14}{'current':>14}{'change':>9}  status"]
+    for comparison in comparisons:
+        change = "-" if comparison.change is None else f"{comparison.change:+.1%}"
+        lines.append(
+            f"{comparison.name:<45}{number(comparison.baseline):>14}{number(comparison.current):>14}{change:>9}  "
+            f"{comparison.status}"
+        )
+    n_regressions = sum(comparison.status == "regression" for comparison in comparisons)
+    lines.append(f"{n_regressions} regression(s) out of {len(comparisons)} metrics.")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Entry point of `python -m benchmarks.run`.
+
+    Args:
+        argv (list[str] | None): Command line arguments. Default is None (`sys.argv`).
+
+    Returns:
+        int: The exit status: 1 if a comparison found a regression, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="Runs and compares the benchmarks.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("-o", "--output", help="write the results to this JSON file")
+    run_parser.add_argument("-k", "--filter", help="only run the benchmarks whose name contains this string")
+    run_parser.add_argument("--quick", action="store_true", help="take one short sample of each benchmark")
+    run_parser.add_argument("--seed", type=int, default=0, help="seed of the samples (default: 0)")
+    run_parser.add_argument("--baseline", help="compare the results with this JSON file")
+
+    compare_parser = commands.add_parser("compare", help="compare two stored runs")
+    compare_parser.add_argument("baseline", help="JSON file of the reference run")
+    compare_parser.add_argument("current", help="JSON file of the new run")
+
+    for command_parser in (run_parser, compare_parser):
+        command_parser.add_argument(
+            "--threshold", type=float, default=0.1, help="relative change counted as a regression (default: 0.1)"
+        )
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        current = run_suite(quick=args.quick, pattern=args.filter, seed=args.seed)
+        if args.output:
+            write_results(current, args.output)
+        if not args.baseline:
+            return 0
+        baseline = read_results(args.baseline)
+    else:
+        baseline, current = read_results(args.baseline), read_results(args.current)
+
+    comparisons = compare_results(baseline, current, args.threshold)
+    print(format_comparisons(comparisons))
+    return int(any(comparison.status == "regression" for comparison in comparisons))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
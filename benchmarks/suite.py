@@ -0,0 +1,370 @@
+"""
+Benchmarks of the game engines, the bots and the equity calculator (see `benchmarks/run.py` to run them).
+
+Every benchmark measures one or more metrics (throughputs, latencies or amounts of memory) a few times. Each sample reseeds
+`random` and clears the shared equity cache first, so samples of the same run only differ by the speed of the machine.
+"""
+from __future__ import annotations
+import gc
+import random
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable
+import pokerkit
+from PokerBots import Game, EquityEngine
+from PokerBots import BasePlayer, CallingPlayer, RandomPlayer, GamblingPlayer, MCTSPlayer
+from PokerBots.equity.EquityCache import shared_equity_cache
+from PokerBots.game.Tournament import Tournament
+
+SEAT_COUNTS = (2, 6, 9)
+# Fewest decisions a latency benchmark measures, whatever its duration.
+_MIN_LATENCY_SAMPLES = 20
+
+PLAYER_MIXES = {
+    "calling": (CallingPlayer,),
+    "random": (RandomPlayer,),
+    "gambling": (GamblingPlayer,),
+    "mixed": (GamblingPlayer, RandomPlayer, CallingPlayer),
+}
+
+
+class Measurement:
+    """
+    Samples of one benchmark.
+
+    Attributes:
+        name (str): Name of the benchmark.
+        unit (str): Unit of the samples.
+        higher_is_better (bool): True for throughputs, False for latencies and memory.
+        samples (list[float]): The measured values.
+    """
+
+    __slots__ = ("name", "unit", "higher_is_better", "samples")
+
+    def __init__(self, name: str, unit: str, higher_is_better: bool, samples: list[float]):
+        self.name = name
+        self.unit = unit
+        self.higher_is_better = higher_is_better
+        self.samples = samples
+
+    @property
+    def value(self) -> float:
+        """
+        Median of the samples, the value compared between runs.
+        """
+        return statistics.median(self.samples)
+
+    def to_dict(self) -> dict:
+        """
+        Converts the measurement to the JSON representation of a result.
+
+        Returns:
+            dict: The unit, the direction, the value and the samples.
+        """
+        return {
+            "unit": self.unit,
+            "higher_is_better": self.higher_is_better,
+            "value": self.value,
+            "samples": self.samples,
+        }
+
+    def __repr__(self):
+        return f"Measurement(name={self.name!r}, value={self.value:.6g}, unit={self.unit!r})"
+
+
+class Benchmark:
+    """
+    A named measurement of one or more metrics.
+
+    Attributes:
+        name (str): Name of the benchmark, e.g. "game.fast.mixed.6_seats".
+        measure (Callable[[int, float], list[float]]): Takes a seed and a duration in seconds and returns one sample
+            of each metric.
+        metrics (tuple[tuple[str, str, bool], ...]): Suffix of the name, unit and direction (True if higher is
+            better) of each metric.
+    """
+
+    def __init__(self, name: str, measure: Callable[[int, float], list[float]], *metrics: tuple[str, str, bool]):
+        self.name = name
+        self.measure = measure
+        self.metrics = metrics
+
+    def run(self, *, repeat: int, duration: float, seed: int = 0) -> list[Measurement]:
+        """
+        Measures the benchmark `repeat` times.
+
+        Args:
+            repeat (int): Number of samples.
+            duration (float): Approximate duration of each sample in seconds.
+            seed (int): Seed of the samples. Default is 0.
+
+        Returns:
+            list[Measurement]: One measurement per metric.
+        """
+        samples = []
+        for _ in range(repeat):
+            random.seed(seed)
+            shared_equity_cache().clear()
+            samples.append(self.measure(seed, duration))
+
+        return [
+            Measurement(self.name + suffix, unit, higher_is_better, [sample[i] for sample in samples])
+            for i, (suffix, unit, higher_is_better) in enumerate(self.metrics)
+        ]
+
+
+def create_players(mix: str, n_seats: int) -> list[BasePlayer]:
+    """
+    Creates the players of a benchmark table.
+
+    Args:
+        mix (str): A key of PLAYER_MIXES. The classes of the mix take the seats in turn.
+        n_seats (int): Number of players.
+
+    Returns:
+        list[BasePlayer]: The players.
+    """
+    classes = PLAYER_MIXES[mix]
+    return [classes[seat % len(classes)](name=f"Seat{seat}") for seat in range(n_seats)]
+
+
+def _game_throughput(engine: str, mix: str, n_seats: int) -> Callable[[int, float], list[float]]:
+    """
+    Hands per second of `Game.play_round`. A new game starts whenever one is over.
+    """
+    def measure(_seed: int, duration: float) -> list[float]:
+        game = None
+        n_hands = 0
+        start = time.perf_counter()
+        while True:
+            if game is None:
+                game = Game(players=create_players(mix, n_seats), engine=engine)
+            if game.play_round(verbose=False):
+                game = None
+            n_hands += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= duration:
+                return [n_hands / elapsed]
+
+    return measure
+
+
+def _random_situations(seed: int, n_situations: int, n_board_cards: int) -> list[tuple[list, list]]:
+    """
+    Draws hole cards and board cards from shuffled decks.
+    """
+    rng = random.Random(seed)
+    situations = []
+    for _ in range(n_situations):
+        cards = rng.sample(list(pokerkit.Deck.STANDARD), 2 + n_board_cards)
+        situations.append((cards[:2], cards[2:]))
+    return situations
+
+
+def _equity_throughput(n_board_cards: int, n_players: int) -> Callable[[int, float], list[float]]:
+    """
+    Simulations per second of `EquityEngine.estimate` (10,000 simulations per estimate).
+    """
+    def measure(seed: int, duration: float) -> list[float]:
+        engine = EquityEngine(seed=seed)
+        situations = _random_situations(seed, 64, n_board_cards)
+        n_simulations = 0
+        start = time.perf_counter()
+        while True:
+            for hole_cards, board_cards in situations:
+                n_simulations += engine.estimate(hole_cards, board_cards, n_players).n_simulations
+                elapsed = time.perf_counter() - start
+                if elapsed >= duration:
+                    return [n_simulations / elapsed]
+
+    return measure
+
+
+class _TimedPlayer(BasePlayer):
+    """
+    Wraps a player to record how long each of its decisions takes.
+    """
+
+    def __init__(self, player: BasePlayer):
+        super().__init__(name=player.name)
+        self.player = player
+        self.observes = player.observes
+        self.latencies = []
+
+    def play(self, valid_actions: dict[str, float], state: pokerkit.State) -> tuple[str, float]:
+        start = time.perf_counter()
+        action = self.player.play(valid_actions=valid_actions, state=state)
+        self.latencies.append(time.perf_counter() - start)
+        return action
+
+
+def _gambling_decisions(n_seats: int) -> Callable[[int, float], list[float]]:
+    """
+    Decisions per second of the gambling players of a "mixed" table, and the median and 99th percentile of their
+    latency in milliseconds. Gambling players alone fold most hands preflop, so the other players of the mix make them
+    reach the streets where win rates are estimated. Hands are played past the duration until the gambling players
+    made enough decisions for the percentiles.
+    """
+    def measure(_seed: int, duration: float) -> list[float]:
+        players = [
+            _TimedPlayer(player) if isinstance(player, GamblingPlayer) else player
+            for player in create_players("mixed", n_seats)
+        ]
+        timed_players = [player for player in players if isinstance(player, _TimedPlayer)]
+        game = Game(players=list(players), engine="fast")
+        start = time.perf_counter()
+        while (
+            time.perf_counter() - start < duration
+            or sum(len(player.latencies) for player in timed_players) < _MIN_LATENCY_SAMPLES
+        ):
+            if game.play_round(verbose=False):
+                game = Game(players=list(players), engine="fast")
+
+        latencies = sorted(latency for player in timed_players for latency in player.latencies)
+        p99 = latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))]
+        return [len(latencies) / sum(latencies), statistics.median(latencies) * 1e3, p99 * 1e3]
+
+    return measure
+
+
+def _search_throughput(n_seats: int) -> Callable[[int, float], list[float]]:
+    """
+    Rollouts per second of `MCTSPlayer.search` from the first decision of a hand, and the time to fork and determinize
+    the state of that decision in microseconds.
+    """
+    def measure(seed: int, duration: float) -> list[float]:
+        game = Game(players=create_players("calling", n_seats), engine="fast")
+        next(game.play_round_step_by_step(verbose=False))
+        root_state = game.state
+        player = MCTSPlayer(n_iterations=100, seed=seed)
+
+        start = time.perf_counter()
+        while time.perf_counter() - start < duration:
+            player.search(root_state)
+        rollouts_per_second = player.n_rollouts / (time.perf_counter() - start)
+
+        rng = random.Random(seed)
+        n_forks = 1_000
+        start = time.perf_counter()
+        for _ in range(n_forks):
+            root_state.fork().determinize(root_state.actor_index, rng)
+        return [rollouts_per_second, (time.perf_counter() - start) / n_forks * 1e6]
+
+    return measure
+
+
+def _tournament_throughput(n_entrants: int) -> Callable[[int, float], list[float]]:
+    """
+    Hands per second (summed over the tables) of a tournament between calling and random players, played in the current
+    process for the duration of the sample (or until it ends).
+    """
+    def measure(seed: int, duration: float) -> list[float]:
+        players = [CallingPlayer(name="Caller"), RandomPlayer(name="Random")]
+        tournament = Tournament(players, n_entrants=n_entrants, seed=seed, time_budget=duration)
+        start = time.perf_counter()
+        result = tournament.run()
+        return [result.n_table_hands / (time.perf_counter() - start)]
+
+    return measure
+
+
+def _game_memory(engine: str, n_seats: int) -> Callable[[int, float], list[float]]:
+    """
+    Memory (in KiB) held by a game after 20 hands, and the peak memory allocated while playing them.
+
+    A first game is played untraced, so that the tables the engines build on first use are not counted. The held
+    memory is averaged over 10 games kept alive together, so that what process-wide caches keep is spread over them.
+    """
+    n_games = 10
+
+    def play() -> Game:
+        game = Game(players=create_players("random", n_seats), engine=engine)
+        for _ in range(20):
+            if game.play_round(verbose=False):
+                break
+        return game
+
+    def measure(seed: int, _duration: float) -> list[float]:
+        play()
+        random.seed(seed)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            baseline = tracemalloc.get_traced_memory()[0]
+            games = []
+            peak = 0
+            for _ in range(n_games):
+                before = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                games.append(play())
+                peak = max(peak, tracemalloc.get_traced_memory()[1] - before)
+            gc.collect()
+            held = (tracemalloc.get_traced_memory()[0] - baseline) / n_games
+        finally:
+            tracemalloc.stop()
+        return [held / 1024, peak / 1024]
+
+    return measure
+
+
+def default_benchmarks() -> list[Benchmark]:
+    """
+    Lists all the benchmarks of the suite.
+
+    Returns:
+        list[Benchmark]: The benchmarks.
+    """
+    benchmarks = [
+        Benchmark(f"game.{engine}.{mix}.{n_seats}_seats", _game_throughput(engine, mix, n_seats), ("", "hands/s", True))
+        for engine in Game.ENGINES
+        for mix in PLAYER_MIXES
+        for n_seats in SEAT_COUNTS
+    ]
+    benchmarks += [
+        Benchmark(
+            f"equity.estimate.{street}.{n_players}_players",
+            _equity_throughput(n_board_cards, n_players),
+            ("", "simulations/s", True),
+        )
+        for street, n_board_cards in (("preflop", 0), ("flop", 3))
+        for n_players in (2, 6)
+    ]
+    benchmarks += [
+        Benchmark(
+            f"gambling.decisions.{n_seats}_seats",
+            _gambling_decisions(n_seats),
+            ("", "decisions/s", True),
+            (".p50_latency", "ms", False),
+            (".p99_latency", "ms", False),
+        )
+        for n_seats in (2, 6)
+    ]
+    benchmarks += [
+        Benchmark(
+            f"search.rollouts.{n_seats}_seats",
+            _search_throughput(n_seats),
+            ("", "rollouts/s", True),
+            (".fork", "us", False),
+        )
+        for n_seats in SEAT_COUNTS
+    ]
+    benchmarks += [
+        Benchmark(
+            f"tournament.{n_entrants}_entrants",
+            _tournament_throughput(n_entrants),
+            ("", "hands/s", True),
+        )
+        for n_entrants in (1_000, 10_000)
+    ]
+    benchmarks += [
+        Benchmark(
+            f"memory.{engine}.{n_seats}_seats",
+            _game_memory(engine, n_seats),
+            (".held", "KiB", False),
+            (".peak", "KiB", False),
+        )
+        for engine in Game.ENGINES
+        for n_seats in (2, 9)
+    ]
+    return benchmarks
@@ -18,13 +18,15 @@ except Exception:
     print("Exception occurred during parsing requirements.txt")
     requirements = [
         'treys==0.1.8',
-        'pokerkit==0.5.4'
+        'pokerkit==0.5.4',
+        'numpy>=1.24'
     ]
 
 setup(
     # Name of the package
     name='PokerBots',
     packages=find_packages('.'),
+    package_data={'PokerBots': ['equity/data/*.npy']},
     version='2.0.6',
     license='MIT',
     description='A Pure Python library to test your Poker Bots in a trivial and simple way.',
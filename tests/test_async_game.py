@@ -0,0 +1,75 @@
+import asyncio
+import random
+import time
+from PokerBots import AsyncGame, AsyncBasePlayer, Game, SyncPlayerAdapter, play_tables
+from PokerBots import CallingPlayer, RandomPlayer, GamblingPlayer
+from PokerBots.equity.EquityCache import shared_equity_cache
+
+
+class SleepingPlayer(AsyncBasePlayer):
+    """
+    Checks or calls after waiting, as a bot querying a server would.
+    """
+
+    def __init__(self, name, delay):
+        super().__init__(name=name)
+        self.delay = delay
+
+    async def play(self, valid_actions, state):
+        await asyncio.sleep(self.delay)
+        return "check_or_call", valid_actions["check_or_call"]
+
+
+def create_players():
+    return [GamblingPlayer(name="Gambler"), RandomPlayer(name="Random"), CallingPlayer(name="Caller")]
+
+def test_sync_players_play_as_in_game():
+    shared_equity_cache().clear()
+    random.seed(5)
+    game = Game(players=create_players(), engine="fast")
+    for _ in range(30):
+        if game.play_round(verbose=False):
+            break
+
+    shared_equity_cache().clear()
+    random.seed(5)
+    async_game = AsyncGame(players=create_players(), engine="fast")
+    asyncio.run(async_game.play(rounds=30))
+
+    assert async_game.n_hands == game.n_hands
+    assert [player.name for player in async_game.players] == [player.name for player in game.players]
+    assert async_game.stacks == game.stacks
+
+def test_slow_decisions_time_out():
+    slow = SleepingPlayer("Slow", delay=10)
+    game = AsyncGame(players=[slow, CallingPlayer(name="Caller")], engine="fast", decision_timeout=0.01)
+
+    start = time.perf_counter()
+    asyncio.run(game.play(rounds=3))
+
+    assert time.perf_counter() - start < 5
+    assert game.n_timeouts["Slow"] >= 3
+    assert "Caller" not in game.n_timeouts
+
+def test_waiting_tables_do_not_block_each_other():
+    def create_game():
+        return AsyncGame(players=[SleepingPlayer("A", delay=0.01), SleepingPlayer("B", delay=0.01)], engine="fast")
+
+    games = [create_game() for _ in range(100)]
+    start = time.perf_counter()
+    rounds = asyncio.run(play_tables(games, rounds=2))
+
+    assert rounds == [2] * 100
+    # Each game waits at least 0.04 seconds, so playing them one after another would take at least 4 seconds.
+    assert time.perf_counter() - start < 2
+
+    games = [create_game() for _ in range(4)]
+    assert asyncio.run(play_tables(games, rounds=1, max_concurrency=2)) == [1] * 4
+
+def test_thread_adapter_runs_sync_players():
+    players = [SyncPlayerAdapter(player, in_thread=True) for player in create_players()]
+    game = AsyncGame(players=players, engine="fast", decision_timeout=5)
+    n_rounds = asyncio.run(game.play(rounds=10))
+
+    assert 1 <= n_rounds <= 10
+    assert sum(game.stacks) == 3 * 30_000
@@ -0,0 +1,39 @@
+import pytest
+from PokerBots import BatchSimulator, CallingPlayer, RandomPlayer, GamblingPlayer
+
+
+class CountingPlayer(CallingPlayer):
+    # A class attribute, so that it is shared with the copies played by the simulator.
+    batch_sizes = []
+
+    def play_batch(self, observations):
+        CountingPlayer.batch_sizes.append(len(observations))
+        return super().play_batch(observations)
+
+def test_chips_are_conserved():
+    players = [GamblingPlayer(name="Gambler", exact_budget=0), RandomPlayer(name="Random"), CallingPlayer()]
+    summary = BatchSimulator(players, n_tables=6, initial_stack=30_000, rounds=20, seed=7).run()
+
+    assert summary.n_games == 6
+    assert sum(seat.chips_won for seat in summary.players) == 0
+    for table in range(6):
+        assert sum(seat.final_stacks[table] for seat in summary.players) == 3 * 30_000
+
+def test_results_are_reproducible_with_seed():
+    players = [GamblingPlayer(name="Gambler", win_rate_threshold=0.6), RandomPlayer(name="Random")]
+    first = BatchSimulator(players, n_tables=4, rounds=15, seed=3).run()
+    second = BatchSimulator(players, n_tables=4, rounds=15, seed=3).run()
+
+    assert [seat.final_stacks for seat in first.players] == [seat.final_stacks for seat in second.players]
+
+def test_players_decide_for_all_waiting_tables_at_once():
+    CountingPlayer.batch_sizes.clear()
+    summary = BatchSimulator([CountingPlayer(name="Counter"), CallingPlayer(name="Caller")], n_tables=5, rounds=3).run()
+
+    # Two callers never go broke, so every table plays every round in lockstep.
+    assert summary.n_hands == 15
+    assert set(CountingPlayer.batch_sizes) == {5}
+
+def test_non_positive_number_of_tables_is_rejected():
+    with pytest.raises(ValueError):
+        BatchSimulator([CallingPlayer(), CallingPlayer()], n_tables=0)
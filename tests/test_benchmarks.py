@@ -0,0 +1,41 @@
+import json
+from benchmarks.run import compare_results, main, read_results, results_to_dict
+from benchmarks.suite import Measurement
+
+
+def make_results(**values):
+    measurements = [
+        Measurement(name, "hands/s" if name.startswith("game") else "KiB", name.startswith("game"), [value])
+        for name, value in values.items()
+    ]
+    return results_to_dict(measurements, metadata={})
+
+def test_regressions_depend_on_the_direction_of_the_metric():
+    baseline = make_results(game_a=100.0, game_b=100.0, memory_a=100.0, memory_b=100.0, memory_c=1.0)
+    current = make_results(game_a=80.0, game_b=105.0, memory_a=80.0, memory_b=120.0, memory_d=1.0)
+
+    statuses = {comparison.name: comparison.status for comparison in compare_results(baseline, current, 0.1)}
+    assert statuses == {
+        "game_a": "regression",
+        "game_b": "unchanged",
+        "memory_a": "improvement",
+        "memory_b": "regression",
+        "memory_d": "new",
+        "memory_c": "missing",
+    }
+
+def test_run_writes_results_and_compares_them(tmp_path, capsys):
+    baseline_path = tmp_path / "baseline.json"
+    current_path = tmp_path / "current.json"
+
+    assert main(["run", "--quick", "-k", "memory.fast.2_seats", "-o", str(baseline_path)]) == 0
+    results = read_results(baseline_path)
+    assert set(results["results"]) == {"memory.fast.2_seats.held", "memory.fast.2_seats.peak"}
+    assert results["metadata"]["quick"]
+
+    for result in results["results"].values():
+        result["value"] /= 2
+    current_path.write_text(json.dumps(results), encoding="utf-8")
+    assert main(["compare", str(baseline_path), str(current_path)]) == 0
+    assert main(["compare", str(current_path), str(baseline_path)]) == 1
+    assert "2 regression(s)" in capsys.readouterr().out
@@ -0,0 +1,131 @@
+import gc
+import os
+import random
+import time
+import pytest
+from PokerBots import BasePlayer, BatchSimulator, BotWorkerPool, CallingPlayer, Game
+from PokerBots.game.BotWorkers import ERROR, _ACTION, _decide, _wire_state, decode_observations, encode_observations
+
+
+class RaisingPlayer(BasePlayer):
+    """
+    Raises to the minimum whenever possible, and calls otherwise.
+    """
+
+    def play(self, valid_actions, state):
+        if "complete_bet_or_raise_to" in valid_actions:
+            return "complete_bet_or_raise_to", valid_actions["complete_bet_or_raise_to"][0]
+        return "check_or_call", valid_actions["check_or_call"]
+
+class CrashingPlayer(BasePlayer):
+    def play(self, valid_actions, state):
+        os._exit(1)
+
+class HangingPlayer(BasePlayer):
+    def play(self, valid_actions, state):
+        time.sleep(60)
+
+class FailingPlayer(BasePlayer):
+    def play(self, valid_actions, state):
+        if state.street_index == 0:
+            raise RuntimeError("Bug in the bot")
+        return "complete_bet_or_raise_to", -1
+
+class OverbettingPlayer(BasePlayer):
+    def play(self, valid_actions, state):
+        return "complete_bet_or_raise_to", 2 ** 40
+
+
+def play(players, n_rounds, seed=0):
+    random.seed(seed)
+    game = Game(players=list(players), engine="fast")
+    for _ in range(n_rounds):
+        if game.play_round(verbose=False):
+            break
+    return game
+
+def test_observations_hide_the_cards_of_the_opponents():
+    game = Game(players=[RaisingPlayer(name=str(i)) for i in range(4)], engine="fast")
+    for player in game.players:
+        player.observes = True
+    decisions = game.play_round_step_by_step(verbose=False)
+    actor_index, valid_actions = next(decisions)
+    # Call around until the flop, so that the observation has a board and a history.
+    while game.state.street_index == 0:
+        actor_index, valid_actions = decisions.send(("check_or_call", valid_actions["check_or_call"]))
+    observation = game.view(actor_index)
+
+    decoded_actions, decoded = decode_observations(encode_observations([(valid_actions, observation)]))[0]
+
+    assert decoded_actions == valid_actions
+    assert decoded == observation
+    assert len(decoded.board_codes) == 3 and len(decoded.history) == 4
+
+    state = _wire_state(valid_actions, decoded)
+    assert state.actor_index == actor_index
+    assert state.street_index == 1
+    assert state.stacks == list(game.state.stacks)
+    assert state.hole_cards[actor_index] == list(game.state.hole_cards[actor_index])
+    assert all(not cards for index, cards in enumerate(state.hole_cards) if index != actor_index)
+    assert [cards[0] for cards in state.board_cards] == [cards[0] for cards in game.state.board_cards]
+
+def test_hosted_bots_play_as_in_process():
+    in_process = play([RaisingPlayer(name="Raiser"), CallingPlayer(name="Caller")], n_rounds=20)
+    with BotWorkerPool() as pool:
+        hosted = play([pool.host(RaisingPlayer(name="Raiser")), pool.host(CallingPlayer(name="Caller"))], n_rounds=20)
+
+    assert hosted.n_hands == in_process.n_hands
+    assert hosted.stacks == in_process.stacks
+
+def test_crashes_timeouts_and_errors_fold():
+    with BotWorkerPool(timeout=0.1) as pool:
+        crashing = pool.host(CrashingPlayer(name="Crash"))
+        hanging = pool.host(HangingPlayer(name="Hang"))
+        failing = pool.host(FailingPlayer(name="Fail"))
+        game = play([crashing, hanging, failing, pool.host(CallingPlayer(name="Caller"))], n_rounds=3)
+
+        assert game.n_hands >= 1
+        assert crashing.n_crashes == crashing.n_decisions > 0
+        assert hanging.n_timeouts == hanging.n_decisions > 0
+        assert failing.n_errors == failing.n_decisions > 0
+        # Failed workers are replaced for the next decision.
+        assert pool.n_started > 4
+
+def test_amounts_must_fit_in_the_messages():
+    game = Game(players=[CallingPlayer(name="A"), CallingPlayer(name="B")], engine="fast")
+    game.players[0].observes = game.players[1].observes = True
+    decisions = game.play_round_step_by_step(verbose=False)
+    actor_index, valid_actions = next(decisions)
+    observation = game.view(actor_index)
+    message = encode_observations([(valid_actions, observation)])
+
+    # A bot that bets more than an i32 holds gets an error action; a broken message is not the bot's fault.
+    assert _ACTION.unpack(_decide(OverbettingPlayer(name="Over"), decode_observations(message))) == (ERROR, 0)
+    with pytest.raises(AttributeError):
+        _decide(None, decode_observations(message))
+
+    game.seat_players(game.players, [2 ** 31, 2 ** 31])
+    decisions = game.play_round_step_by_step(verbose=False)
+    actor_index, valid_actions = next(decisions)
+    with pytest.raises(ValueError):
+        encode_observations([(valid_actions, game.view(actor_index))])
+
+def test_workers_are_reused():
+    with BotWorkerPool() as pool:
+        player = pool.host(CallingPlayer(name="A"))
+        play([player, pool.host(RaisingPlayer(name="B"))], n_rounds=2)
+        assert pool.n_started == 2
+
+        player.release()
+        del player
+        gc.collect()
+        play([pool.host(CallingPlayer(name="C")), pool.host(RaisingPlayer(name="D"))], n_rounds=2)
+        assert pool.n_started == 2
+
+def test_batch_simulator_sends_batches():
+    with BotWorkerPool() as pool:
+        players = [pool.host(RaisingPlayer(name="Raiser")), pool.host(CallingPlayer(name="Caller"))]
+        summary = BatchSimulator(players=players, n_tables=8, rounds=5).run()
+
+    assert summary.n_hands >= 8
+    assert sum(seat.chips_won for seat in summary.players) == 0
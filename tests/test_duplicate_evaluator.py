@@ -0,0 +1,58 @@
+import pytest
+from PokerBots import BasePlayer, CallingPlayer, DuplicateEvaluator, RandomPlayer
+from PokerBots.game.DuplicateEvaluator import msprt_likelihood_ratio
+
+
+class CheckingPlayer(BasePlayer):
+    """
+    Checks when it is free, and folds otherwise.
+    """
+
+    def play(self, valid_actions, state):
+        if valid_actions.get("check_or_call") == 0:
+            return "check_or_call", 0
+        return "fold", 0
+
+
+def test_identical_bots_always_tie():
+    evaluator = DuplicateEvaluator(CallingPlayer(name="A"), CallingPlayer(name="B"), max_hands=100, min_pairs=10)
+    result = evaluator.run()
+
+    # Both bots play the same way with the same cards, so every pair of hands is a tie.
+    assert result.n_hands == 100
+    assert result.mean == 0
+    assert result.winner is None
+    assert result.p_value == 1.0
+
+def test_clear_winner_stops_early():
+    result = DuplicateEvaluator(CallingPlayer(name="Caller"), CheckingPlayer(name="Checker"), min_pairs=20).run()
+
+    assert result.winner == "Caller"
+    assert result.n_hands < 1_000
+    assert result.p_value <= 0.05
+    assert result.chips_won_per_hand > 0
+
+    swapped = DuplicateEvaluator(CheckingPlayer(name="Checker"), CallingPlayer(name="Caller"), min_pairs=20).run()
+    assert swapped.winner == "Caller"
+    assert swapped.n_pairs == result.n_pairs
+    assert swapped.mean == -result.mean
+
+def test_evaluations_are_reproducible():
+    def evaluate(seed):
+        return DuplicateEvaluator(
+            RandomPlayer(name="Random"), CallingPlayer(name="Caller"), max_hands=200, min_pairs=10, seed=seed
+        ).run()
+
+    first, second = evaluate(3), evaluate(3)
+    assert (first.n_pairs, first.mean, first.p_value) == (second.n_pairs, second.mean, second.p_value)
+
+def test_likelihood_ratio_grows_with_the_difference():
+    ratios = [msprt_likelihood_ratio(100, mean, 1.0, 0.01) for mean in (0.0, 0.1, 0.2, 0.4)]
+
+    assert ratios[0] < 1
+    assert ratios == sorted(ratios)
+    assert ratios[-1] > 20
+
+def test_players_need_different_names():
+    with pytest.raises(ValueError):
+        DuplicateEvaluator(CallingPlayer(name="Bot"), RandomPlayer(name="Bot"))
@@ -0,0 +1,147 @@
+import pytest
+import numpy as np
+import treys
+from PokerBots import EquityCache, EquityEngine, PreflopTable
+from PokerBots.equity.cards import CARD_STRINGS, card_code
+from PokerBots.equity.HandEvaluator import default_hand_evaluator
+from PokerBots.equity.PreflopTable import hand_class, hand_class_name
+
+
+def test_card_codes_follow_rank_then_suit_order():
+    assert card_code("2c") == 0
+    assert card_code("As") == 51
+    assert CARD_STRINGS[card_code("Td")] == "Td"
+
+def test_hand_evaluator_matches_treys():
+    rng = np.random.default_rng(0)
+    evaluator = default_hand_evaluator()
+    treys_evaluator = treys.Evaluator()
+    cards = [treys.Card.new(card) for card in CARD_STRINGS]
+
+    for n_cards in (5, 6, 7):
+        hands = np.array([rng.permutation(52)[:n_cards] for _ in range(2000)])
+        expected = [
+            treys_evaluator.evaluate([cards[c] for c in hand[:2]], [cards[c] for c in hand[2:]]) for hand in hands
+        ]
+
+        assert evaluator.evaluate_batch(hands).tolist() == expected
+        assert [evaluator.evaluate(hand) for hand in hands[:200].tolist()] == expected[:200]
+
+def test_hand_evaluator_ranks_flushes():
+    evaluator = default_hand_evaluator()
+
+    assert evaluator.evaluate(["As", "Ks", "Qs", "Js", "Ts", "2d", "2c"]) == 1
+    steel_wheel = evaluator.evaluate(["Ah", "5h", "4h", "3h", "2h", "2d", "2c"])
+    assert steel_wheel == 10
+    assert steel_wheel < evaluator.evaluate(["2h", "2d", "2c", "3s", "3d"])
+
+def test_estimate_is_reproducible_with_seed():
+    first = EquityEngine(seed=3).estimate(["Ah", "Kh"], ["Qh", "Jh", "2c"], n_players=3, n_simulations=5000)
+    second = EquityEngine(seed=3).estimate(["Ah", "Kh"], ["Qh", "Jh", "2c"], n_players=3, n_simulations=5000)
+
+    assert (first.wins, first.ties) == (second.wins, second.ties)
+
+def test_estimate_of_known_spots():
+    engine = EquityEngine(seed=0)
+
+    # Pocket aces against one random hand win about 85% of the time.
+    aces = engine.estimate(["As", "Ad"], [], n_players=2, n_simulations=20_000)
+    assert abs(aces.win_rate + aces.tie_rate / 2 - 0.85) < 0.01
+
+    # The nuts on the river can not lose.
+    royal = engine.estimate(["As", "Ks"], ["Qs", "Js", "Ts", "2d", "3c"], n_players=4, n_simulations=1000)
+    assert royal.wins == 1000
+
+def test_hand_classes_cover_all_starting_hands():
+    classes = {hand_class(first, second) for first in range(52) for second in range(52) if first != second}
+
+    assert classes == set(range(169))
+    assert hand_class_name(hand_class("As", "Ad")) == "AA"
+    assert hand_class_name(hand_class("Ks", "As")) == "AKs"
+    assert hand_class_name(hand_class("7h", "2c")) == "72o"
+
+def test_preflop_table_lookup():
+    table = PreflopTable.load()
+
+    assert table.win_rate(["As", "Ah"], 2) > table.win_rate(["Ks", "Kh"], 2) > table.win_rate(["7s", "2h"], 2)
+    assert table.win_rate(["As", "Ah"], 2) > table.win_rate(["As", "Ah"], 10)
+    assert abs(table.win_rate(["Qs", "Jh"], 3) - table.win_rate(["Qd", "Jc"], 3)) == 0
+
+def test_cache_shares_entries_across_suit_relabelings():
+    cache = EquityCache(max_entries=10)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return 0.5
+
+    cache.get_or_compute(["Ah", "Kh"], ["Qh", "2c", "7d"], 3, compute)
+    cache.get_or_compute(["Ks", "As"], ["7c", "Qs", "2d"], 3, compute)
+    cache.get_or_compute(["Ah", "Kh"], ["Qh", "2c", "7d"], 4, compute)
+
+    assert len(calls) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+def test_cache_evicts_least_recently_used_entry():
+    cache = EquityCache(max_entries=2)
+
+    cache.get_or_compute(["As", "Ad"], [], 2, lambda: 0.85)
+    cache.get_or_compute(["Ks", "Kd"], [], 2, lambda: 0.82)
+    cache.get_or_compute(["As", "Ad"], [], 2, lambda: 0.0)
+    cache.get_or_compute(["Qs", "Qd"], [], 2, lambda: 0.80)
+
+    assert len(cache) == 2
+    assert cache.get_or_compute(["Ah", "Ac"], [], 2, lambda: 0.0) == 0.85
+    assert cache.get_or_compute(["Kh", "Kc"], [], 2, lambda: 0.0) == 0.0
+
+def test_exact_enumeration_counts_every_deal():
+    engine = EquityEngine()
+
+    river = engine.enumerate_exactly(["As", "Kd"], ["Qs", "Js", "2c", "7h", "9d"], n_players=2)
+    assert river.exact
+    assert river.n_simulations == EquityEngine.count_deals(5, 2) == 990
+
+    turn = engine.enumerate_exactly(["As", "Kd"], ["Qs", "Js", "2c", "7h"], n_players=3)
+    assert turn.n_simulations == EquityEngine.count_deals(4, 3)
+
+def test_exact_enumeration_agrees_with_sampling():
+    engine = EquityEngine(seed=0)
+
+    exact = engine.enumerate_exactly(["7c", "7d"], ["Qs", "Js", "2c", "8h"], n_players=2)
+    sampled = engine.estimate(["7c", "7d"], ["Qs", "Js", "2c", "8h"], n_players=2, n_simulations=50_000)
+    assert abs(exact.win_rate - sampled.win_rate) < 0.01
+
+def test_equity_switches_to_sampling_above_budget():
+    engine = EquityEngine(seed=0)
+
+    assert engine.equity(["As", "Kd"], ["Qs", "Js", "2c", "7h"], n_players=2).exact
+    assert not engine.equity(["As", "Kd"], ["Qs", "Js", "2c"], n_players=2, n_simulations=1000).exact
+    assert engine.equity(["As", "Kd"], ["Qs", "Js", "2c"], n_players=2, exact_budget=2_000_000).exact
+
+def test_threshold_sampling_stops_early_far_from_threshold():
+    engine = EquityEngine(seed=0)
+
+    weak = engine.estimate_against_threshold(["7s", "2d"], ["Kc", "Qd", "9h"], 3, 0.9, max_simulations=10_000)
+    assert weak.n_simulations < 1000
+    assert weak.win_rate + weak.tie_rate < 0.9
+
+def test_threshold_sampling_respects_simulation_cap():
+    engine = EquityEngine(seed=0)
+
+    # A win rate close to the threshold can not be settled quickly, so all simulations are run.
+    close = engine.estimate(["Ah", "Kh"], ["Qh", "Jd", "2c"], n_players=3, n_simulations=20_000)
+    threshold = close.win_rate + close.tie_rate
+    result = engine.estimate_against_threshold(["Ah", "Kh"], ["Qh", "Jd", "2c"], 3, threshold, max_simulations=3000)
+    assert result.n_simulations == 3000
+
+def test_estimate_batch_agrees_with_estimate():
+    engine = EquityEngine(seed=0)
+    spots = [(["As", "Kd"], ["Qs", "Js", "2c"], 3), (["7c", "7d"], ["Qs", "Js", "2c", "8h"], 2), (["9h", "8h"], [], 4)]
+
+    hole_cards, board_cards, n_players = zip(*spots)
+    results = engine.estimate_batch(hole_cards, board_cards, n_players, n_simulations=20_000)
+    for (hole, board, players), result in zip(spots, results):
+        expected = engine.estimate(hole, board, players, n_simulations=20_000)
+        assert result.n_simulations == 20_000
+        assert result.win_rate == pytest.approx(expected.win_rate, abs=0.02)
+        assert result.tie_rate == pytest.approx(expected.tie_rate, abs=0.02)
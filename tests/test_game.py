@@ -0,0 +1,128 @@
+import random
+import pytest
+from PokerBots import Game, BasePlayer, CallingPlayer, RandomPlayer, GamblingPlayer
+from PokerBots.equity.EquityCache import shared_equity_cache
+from PokerBots.game.GameEvents import (
+    HandStarted, BlindPosted, ActionTaken, StreetDealt, Showdown, PayoffsSettled, PlayerEliminated, GameWon
+)
+
+
+class AllInPlayer(BasePlayer):
+    def play(self, valid_actions, state):
+        if "complete_bet_or_raise_to" in valid_actions:
+            return "complete_bet_or_raise_to", valid_actions["complete_bet_or_raise_to"][1]
+        return "check_or_call", valid_actions["check_or_call"]
+
+def play_hands(engine, create_players, stacks, seed, rounds=30):
+    random.seed(seed)
+    shared_equity_cache().clear()
+    game = Game(players=create_players(), engine=engine)
+    game.stacks = list(stacks)
+
+    hands = []
+    for _ in range(rounds):
+        is_over = game.play_round(verbose=False)
+        board_cards = [str(card[0]) for card in game.state.board_cards]
+        # The next random number checks that both engines drew the same numbers during the hand.
+        hands.append((list(game.state.payoffs), list(game.stacks), board_cards, random.random()))
+        if is_over:
+            break
+    return hands
+
+@pytest.mark.parametrize("seed", range(8))
+def test_fast_engine_plays_the_same_hands_as_pokerkit(seed):
+    rng = random.Random(seed)
+    n_players = rng.randint(2, 6)
+    kinds = [rng.choice([RandomPlayer, CallingPlayer, AllInPlayer]) for _ in range(n_players)]
+    # Short stacks create all-ins and side pots.
+    stacks = [rng.choice([400, 1500, 4000, 12_000, 30_000]) for _ in range(n_players)]
+
+    def create_players():
+        return [kind(name=f"Player {i}") for i, kind in enumerate(kinds)]
+
+    assert play_hands("fast", create_players, stacks, seed) == play_hands("pokerkit", create_players, stacks, seed)
+
+def test_fast_engine_with_gambling_players():
+    def create_players():
+        return [GamblingPlayer(name="Gambler", win_rate_threshold=0.5), RandomPlayer(name="Random")]
+
+    fast = play_hands("fast", create_players, [30_000, 30_000], seed=3, rounds=15)
+    assert fast == play_hands("pokerkit", create_players, [30_000, 30_000], seed=3, rounds=15)
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError):
+        Game(players=[CallingPlayer(), CallingPlayer()], engine="turbo")
+
+def record_events(engine, seed, rounds=40):
+    random.seed(seed)
+    game = Game(players=[AllInPlayer(name="All-in"), RandomPlayer(name="Random"), CallingPlayer(name="Caller")],
+                initial_stack=8000, engine=engine)
+    events = []
+    game.subscribe(events.append)
+    for _ in range(rounds):
+        if game.play_round(verbose=False):
+            break
+    return events
+
+def test_events_describe_every_hand():
+    events = record_events("fast", seed=1)
+    hands = [event for event in events if isinstance(event, HandStarted)]
+    results = [event for event in events if isinstance(event, PayoffsSettled)]
+
+    assert [hand.hand_number for hand in hands] == list(range(1, len(hands) + 1))
+    assert len(results) == len(hands)
+    assert all(sum(result.payoffs) == 0 for result in results)
+    assert any(isinstance(event, Showdown) for event in events)
+    assert sum(isinstance(event, BlindPosted) for event in events) == 2 * len(hands)
+    assert {event.street for event in events if isinstance(event, StreetDealt)} == {"PREFLOP", "FLOP", "TURN", "RIVER"}
+    assert {event.action for event in events if isinstance(event, ActionTaken)} <= {
+        "fold", "check_or_call", "complete_bet_or_raise_to"
+    }
+    eliminated = [event.player_name for event in events if isinstance(event, PlayerEliminated)]
+    assert isinstance(events[-1], GameWon)
+    assert len(eliminated) == 2 and events[-1].player_name not in eliminated
+
+@pytest.mark.parametrize("seed", range(3))
+def test_both_engines_emit_the_same_events(seed):
+    assert record_events("fast", seed) == record_events("pokerkit", seed)
+
+def test_verbose_output_is_a_subscriber(capsys):
+    game = Game(players=[CallingPlayer(name="Ivan"), CallingPlayer(name="Maria")], engine="fast")
+    events = []
+    game.subscribe(events.append)
+    game.play_round(verbose=True)
+    output = capsys.readouterr().out
+
+    assert output.startswith("INFO: ROUND STARTS\nINFO: stacks = [30000, 30000]\n")
+    assert "INFO: ===== PREFLOP =====" in output and "INFO: ===== ROUND RESULTS =====" in output
+    assert sum(isinstance(event, ActionTaken) for event in events) == output.count("checks.") + output.count("calls")
+
+def test_unsubscribed_callables_receive_nothing():
+    game = Game(players=[CallingPlayer(), RandomPlayer()], engine="fast")
+    events = []
+    game.unsubscribe(game.subscribe(events.append))
+    game.play_round(verbose=False)
+
+    assert not events
+
+def test_subscribers_changed_during_a_hand_take_effect_from_the_next_one():
+    game = Game(players=[CallingPlayer(), RandomPlayer()], engine="fast")
+    first_events, second_events, late_events = [], [], []
+
+    def first(event):
+        first_events.append(event)
+        if isinstance(event, HandStarted):
+            game.unsubscribe(first)
+            game.subscribe(late_events.append)
+
+    game.subscribe(first)
+    game.subscribe(second_events.append)
+    game.play_round(verbose=False)
+
+    assert first_events == second_events
+    assert isinstance(second_events[-1], PayoffsSettled)
+    assert not late_events
+
+    game.play_round(verbose=False)
+    assert len(first_events) < len(second_events)
+    assert late_events == second_events[len(first_events):]
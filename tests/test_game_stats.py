@@ -0,0 +1,67 @@
+import pytest
+from PokerBots import Game, GameStats, SimulationRunner
+from PokerBots import CallingPlayer, RandomPlayer, GamblingPlayer
+from PokerBots.game.GameStats import PHASES, LatencyHistogram
+
+
+def create_players():
+    return [GamblingPlayer(name="Gambler"), RandomPlayer(name="Random"), CallingPlayer(name="Caller")]
+
+def play(game, n_hands):
+    for _ in range(n_hands):
+        if game.play_round(verbose=False):
+            break
+    return game.n_hands
+
+def test_histogram_quantiles_are_bucket_bounds():
+    histogram = LatencyHistogram()
+    for seconds in (1e-6, 3e-6, 3e-6, 1e-3):
+        histogram.record(seconds)
+
+    assert histogram.count == 4
+    assert histogram.mean == pytest.approx((1e-6 + 6e-6 + 1e-3) / 4)
+    assert histogram.quantile(0.25) == pytest.approx(1e-6)
+    assert histogram.quantile(0.5) == pytest.approx(4e-6)
+    assert 1e-3 <= histogram.quantile(1.0) <= 2e-3
+
+    other = LatencyHistogram()
+    other.record(1.0)
+    histogram.merge(other)
+    assert histogram.count == 5
+    assert histogram.max == 1.0
+
+@pytest.mark.parametrize("engine", Game.ENGINES)
+def test_timed_hands_record_phases_and_decisions(engine):
+    stats = GameStats()
+    game = Game(players=create_players(), engine=engine, stats=stats)
+    n_hands = play(game, 20)
+
+    assert stats.n_hands == stats.n_timed_hands == n_hands
+    assert set(stats.phase_seconds) == set(PHASES)
+    assert all(seconds > 0 for seconds in stats.phase_seconds.values())
+    assert sum(stats.phase_seconds.values()) <= stats.timed_seconds
+    assert set(stats.decision_latency) <= {"Gambler", "Random", "Caller"}
+    assert sum(histogram.count for histogram in stats.decision_latency.values()) > 0
+    assert stats.hands_per_second > 0
+
+def test_one_hand_out_of_sample_every_is_timed():
+    stats = GameStats(sample_every=3)
+    game = Game(players=[RandomPlayer(name="A"), CallingPlayer(name="B")], engine="fast", stats=stats)
+    n_hands = play(game, 10)
+
+    assert stats.n_hands == n_hands
+    assert stats.n_timed_hands == (n_hands + 2) // 3
+
+    with pytest.raises(ValueError):
+        GameStats(sample_every=0)
+
+def test_stats_are_merged_across_workers():
+    summary = SimulationRunner(
+        create_players(), rounds=10, n_workers=2, seed=3, engine="fast", stats_sample_every=2
+    ).run(n_games=4)
+
+    assert summary.stats.n_hands == summary.n_hands
+    assert summary.stats.n_timed_hands == pytest.approx(summary.n_hands / 2, abs=4)
+    assert "hands/s" in summary.stats.report()
+
+    assert SimulationRunner(create_players(), rounds=10, seed=3).run(n_games=1).stats is None
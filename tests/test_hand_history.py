@@ -0,0 +1,104 @@
+import random
+import numpy as np
+import pytest
+from PokerBots import Game, CallingPlayer, RandomPlayer, HandHistoryReader, HandHistoryWriter
+from PokerBots.equity.cards import CARD_STRINGS
+from PokerBots.game.GameEvents import ActionTaken, PayoffsSettled
+
+
+def record_game(path, seed, rounds=30, **settings):
+    random.seed(seed)
+    settings = {"initial_stack": 10_000, **settings}
+    game = Game(players=[RandomPlayer(name="Maria"), CallingPlayer(name="Ivan"), RandomPlayer(name="Игорь")],
+                engine="fast", **settings)
+    events = []
+    game.subscribe(events.append)
+    with HandHistoryWriter(path, buffer_size=256) as writer:
+        game.subscribe(writer)
+        for _ in range(rounds):
+            if game.play_round(verbose=False):
+                break
+    return events
+
+def test_hands_are_read_back_as_recorded(tmp_path):
+    path = tmp_path / "hands.bin"
+    events = record_game(path, seed=0)
+
+    with HandHistoryReader(path) as reader:
+        hands = list(reader)
+
+    assert [hand.payoffs for hand in hands] == [event.payoffs for event in events if isinstance(event, PayoffsSettled)]
+    actions = [(event.player_index, event.action, event.amount) for event in events if isinstance(event, ActionTaken)]
+    assert [(seat, action, amount) for hand in hands for seat, _, action, amount in hand.actions] == actions
+    assert hands[0].player_names == ("Maria", "Ivan", "Игорь")
+    assert all(len(set(sum(hand.hole_cards, hand.board_cards))) == 2 * len(hand.stacks) + len(hand.board_cards)
+               for hand in hands)
+
+def test_columns_match_the_hands(tmp_path):
+    path = tmp_path / "hands.bin"
+    record_game(path, seed=1)
+
+    with HandHistoryReader(path) as reader:
+        hands = list(reader)
+        columns = reader.columns()
+
+        assert columns["hand_number"].tolist() == [hand.hand_number for hand in hands]
+        assert columns["showdown"].tolist() == [hand.showdown for hand in hands]
+        assert columns["payoff"].tolist() == [payoff for hand in hands for payoff in hand.payoffs]
+        assert columns["stack"].tolist() == [stack for hand in hands for stack in hand.stacks]
+        assert [tuple(CARD_STRINGS[card] for card in row) for row in columns["hole_cards"]] == [
+            cards for hand in hands for cards in hand.hole_cards
+        ]
+        assert columns["action_amount"].tolist() == [action[3] for hand in hands for action in hand.actions]
+
+        names = [reader.player_names[player_id] for player_id in columns["player_id"]]
+        assert names == [name for hand in hands for name in hand.player_names]
+        assert np.bincount(columns["player_id"], weights=columns["payoff"]).sum() == 0
+
+def test_writers_append_to_existing_files(tmp_path):
+    path = tmp_path / "hands.bin"
+    record_game(path, seed=2, rounds=5)
+    record_game(path, seed=3, rounds=5)
+
+    with HandHistoryReader(path) as reader:
+        assert reader.player_names == ["Maria", "Ivan", "Игорь"]
+        assert len(reader.columns()["hand_number"]) == len(list(reader)) == 10
+
+def test_truncated_files_are_read_up_to_the_last_complete_hand(tmp_path):
+    path = tmp_path / "hands.bin"
+    record_game(path, seed=4, rounds=5)
+    data = path.read_bytes()
+    path.write_bytes(data[:-3])
+
+    with HandHistoryReader(path) as reader:
+        assert len(list(reader)) == 4
+
+def test_writers_drop_a_partial_record_before_appending(tmp_path):
+    path = tmp_path / "hands.bin"
+    record_game(path, seed=4, rounds=5)
+    path.write_bytes(path.read_bytes()[:-3])
+    record_game(path, seed=5, rounds=5)
+
+    with HandHistoryReader(path) as reader:
+        assert len(list(reader)) == 9
+        assert reader.complete_size == path.stat().st_size
+
+def test_forced_bets_and_large_amounts_are_recorded(tmp_path):
+    path = tmp_path / "hands.bin"
+    record_game(path, seed=6, rounds=5, initial_stack=5_000_000_000, ante=7, blinds=(50, 100), min_bet=200)
+
+    with HandHistoryReader(path) as reader:
+        hands = list(reader)
+        columns = reader.columns()
+
+    assert {(hand.ante, hand.blinds, hand.min_bet) for hand in hands} == {(7, (50, 100), 200)}
+    assert hands[0].stacks == (5_000_000_000,) * 3
+    assert columns["big_blind"].tolist() == [100] * len(hands)
+    assert columns["stack"].tolist() == [stack for hand in hands for stack in hand.stacks]
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "hands.txt"
+    path.write_text("INFO: ROUND STARTS")
+
+    with pytest.raises(ValueError):
+        HandHistoryReader(path)
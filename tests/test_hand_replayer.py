@@ -0,0 +1,104 @@
+import random
+import pytest
+from PokerBots import Game, BasePlayer, CallingPlayer, RandomPlayer, HandHistoryWriter, HandReplayer, Deal
+from PokerBots.game.HandHistory import HandHistoryReader
+from PokerBots.game.HandReplayer import replay_hand
+
+
+class CheckFoldPlayer(BasePlayer):
+    def play(self, valid_actions, state):
+        if valid_actions.get("check_or_call") == 0:
+            return "check_or_call", 0
+        return "fold", 0
+
+@pytest.fixture(name="history")
+def fixture_history(tmp_path):
+    path = tmp_path / "hands.bin"
+    random.seed(0)
+    with HandHistoryWriter(path) as writer:
+        for _ in range(4):
+            game = Game(players=[RandomPlayer(name="Random"), CallingPlayer(name="Bot"), RandomPlayer(name="Other")],
+                        initial_stack=10_000, engine="fast")
+            game.subscribe(writer)
+            for _ in range(25):
+                if game.play_round(verbose=False):
+                    break
+    return path
+
+def test_unchanged_bots_never_diverge(history):
+    result = HandReplayer([CallingPlayer(name="Bot")], chunk_size=16).run(history)
+
+    with HandHistoryReader(history) as reader:
+        assert result.n_hands == len(reader)
+    assert result.n_decisions > 0
+    assert result.first_divergence is None
+
+def test_changed_bots_diverge_at_their_first_different_decision(history):
+    result = HandReplayer([CheckFoldPlayer(name="Bot")], chunk_size=16).run(history)
+
+    assert result.divergences
+    with HandHistoryReader(history) as reader:
+        for divergence in result.divergences:
+            hand = reader.hand(divergence.hand_index)
+            seat = hand.player_names.index("Bot")
+            assert hand.actions[divergence.decision][0] == seat
+            assert divergence.recorded[0] == "check_or_call" and divergence.recorded[1] > 0
+            assert divergence.replayed == ("fold", 0)
+            # All earlier decisions of the bot were checks, which a check-fold player repeats.
+            assert all(amount == 0 for player, _, _, amount in hand.actions[:divergence.decision] if player == seat)
+
+def test_results_do_not_depend_on_number_of_workers(history):
+    players = [CheckFoldPlayer(name="Bot"), RandomPlayer(name="Other")]
+    sequential = HandReplayer(players, chunk_size=16).run(history)
+    parallel = HandReplayer(players, n_workers=2, chunk_size=16).run(history)
+
+    assert (sequential.n_hands, sequential.n_decisions) == (parallel.n_hands, parallel.n_decisions)
+    assert [(d.hand_index, d.decision, d.replayed) for d in sequential.divergences] == [
+        (d.hand_index, d.decision, d.replayed) for d in parallel.divergences
+    ]
+
+def test_replay_stops_after_enough_divergences(history):
+    result = HandReplayer([CheckFoldPlayer(name="Bot")], chunk_size=4).run(history, max_divergences=2)
+
+    assert len(result.divergences) == 2
+    assert result.n_hands <= result.divergences[-1].hand_index + 4
+
+def test_replaying_a_hand_reproduces_its_payoffs(history):
+    with HandHistoryReader(history) as reader:
+        for engine in Game.ENGINES:
+            for index in range(len(reader)):
+                # replay_hand checks the payoffs itself.
+                assert replay_hand(reader.hand(index), {}, engine=engine, hand_index=index) == (0, None)
+
+def test_hands_replay_with_their_recorded_forced_bets(tmp_path):
+    path = tmp_path / "hands.bin"
+    random.seed(1)
+    with HandHistoryWriter(path) as writer:
+        game = Game(players=[RandomPlayer(name="Random"), CallingPlayer(name="Bot")], initial_stack=10_000,
+                    engine="fast", ante=30, blinds=(100, 250), min_bet=500)
+        game.subscribe(writer)
+        for _ in range(20):
+            if game.play_round(verbose=False):
+                break
+
+    result = HandReplayer([CallingPlayer(name="Bot")]).run(path)
+    assert result.n_hands == game.n_hands
+    assert result.n_decisions > 0
+    assert result.first_divergence is None
+    with HandHistoryReader(path) as reader:
+        for engine in Game.ENGINES:
+            for index in range(len(reader)):
+                assert replay_hand(reader.hand(index), {}, engine=engine, hand_index=index) == (0, None)
+
+@pytest.mark.parametrize("engine", Game.ENGINES)
+def test_games_deal_preset_cards(engine):
+    deal = Deal([["As", "Ad"], ["2c", "7d"]], ["Ah", "Ac", "Kd", "5s", "9h"])
+    game = Game(players=[CallingPlayer(name="Aces"), CallingPlayer(name="Seven-deuce")], engine=engine)
+    game.play_round(verbose=False, deal=deal)
+
+    assert [str(card[0]) for card in game.state.board_cards] == [str(card) for card in deal.board_cards]
+    assert game.stacks[0] > game.stacks[1]
+
+def test_deals_reject_repeated_cards():
+    with pytest.raises(ValueError):
+        Deal([["As", "Ad"], ["As", "7d"]])
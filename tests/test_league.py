@@ -0,0 +1,80 @@
+import pytest
+from PokerBots import BasePlayer, CallingPlayer, League, RandomPlayer
+
+
+class CheckingPlayer(BasePlayer):
+    """
+    Checks when it is free, and folds otherwise.
+    """
+
+    def play(self, valid_actions, state):
+        if valid_actions.get("check_or_call") == 0:
+            return "check_or_call", 0
+        return "fold", 0
+
+
+def create_players():
+    return [CallingPlayer(name="Caller"), RandomPlayer(name="Random"), CheckingPlayer(name="Checker")]
+
+def summarize(result):
+    return result.ratings, [(pairing.names, pairing.n_matches, pairing.mean) for pairing in result.pairings]
+
+def test_resolved_pairings_stop_getting_matches():
+    result = League(create_players(), hands_per_match=40, max_hands_per_pairing=400).run()
+    pairings = {pairing.names: pairing for pairing in result.pairings}
+
+    assert result.complete
+    assert all(pairing.resolved for pairing in result.pairings)
+    # The checker folds to every bet, so the pairings against it resolve well before the one left to chance.
+    assert pairings["Caller", "Random"].n_hands == 400
+    assert pairings["Caller", "Checker"].n_hands < 400
+    assert pairings["Random", "Checker"].n_hands < 400
+    assert result.n_hands == sum(pairing.n_hands for pairing in result.pairings)
+    assert result.ranking()[-1] == "Checker"
+    assert result.ratings["Checker"] < 1500 < result.ratings["Caller"]
+    assert sum(result.ratings.values()) == pytest.approx(3 * 1500)
+
+def test_results_do_not_depend_on_number_of_workers():
+    sequential = League(create_players(), hands_per_match=20, max_hands_per_pairing=100, seed=3).run()
+    parallel = League(create_players(), hands_per_match=20, max_hands_per_pairing=100, seed=3, n_workers=2).run()
+
+    assert summarize(sequential) == summarize(parallel)
+
+def test_pairings_are_not_resolved_on_a_single_pair():
+    result = League([CallingPlayer(name="Caller"), RandomPlayer(name="Random")], hands_per_match=2, max_hands_per_pairing=20).run()
+
+    assert result.pairings[0].n_matches >= 2
+
+def test_interrupted_league_resumes_from_its_checkpoint(tmp_path):
+    checkpoint = tmp_path / "league.jsonl"
+    settings = {"hands_per_match": 20, "max_hands_per_pairing": 100, "seed": 1}
+    uninterrupted = League(create_players(), **settings).run()
+
+    partial = League(create_players(), **settings, checkpoint=checkpoint).run(max_matches=4)
+    assert not partial.complete
+    # A match cut short while it was written is played again.
+    with open(checkpoint, "a", encoding="utf-8") as file:
+        file.write("[0, 10")
+    resumed = League(create_players(), **settings, checkpoint=checkpoint).run()
+
+    assert resumed.complete
+    assert summarize(resumed) == summarize(uninterrupted)
+    n_matches = sum(pairing.n_matches for pairing in resumed.pairings)
+    assert len(checkpoint.read_text(encoding="utf-8").splitlines()) == 1 + n_matches
+
+    # Everything is read back: no match is left to play.
+    replayed = League(create_players(), **settings, checkpoint=checkpoint).run(max_matches=0)
+    assert summarize(replayed) == summarize(uninterrupted)
+    with pytest.raises(ValueError):
+        League(create_players(), hands_per_match=40, checkpoint=checkpoint).run()
+
+@pytest.mark.parametrize("setting", [
+    {"max_hands_per_pairing": 200}, {"confidence": 0.99}, {"precision": 5.0}, {"effect_size": 0.2}, {"k_factor": 32.0},
+])
+def test_checkpoint_of_other_resolution_settings_is_rejected(tmp_path, setting):
+    checkpoint = tmp_path / "league.jsonl"
+    settings = {"hands_per_match": 20, "max_hands_per_pairing": 100}
+    League(create_players(), **settings, checkpoint=checkpoint).run(max_matches=1)
+
+    with pytest.raises(ValueError):
+        League(create_players(), **{**settings, **setting}, checkpoint=checkpoint).run()
@@ -0,0 +1,74 @@
+import pickle
+import random
+from PokerBots import BasePlayer, CallingPlayer, Game, Observation, RandomPlayer
+from PokerBots.equity.cards import card_codes
+
+
+class ObservingPlayer(BasePlayer):
+    """
+    Calls every bet and records what it observes, along with the game state at that time.
+    """
+
+    observes = True
+
+    def __init__(self, name, game_of):
+        super().__init__(name=name)
+        self.game_of = game_of
+        self.seen = []
+
+    def play(self, valid_actions, state):
+        game_state = self.game_of().state
+        self.seen.append((
+            state,
+            card_codes(game_state.hole_cards[state.actor_index]),
+            card_codes(cards[0] for cards in game_state.board_cards),
+            sum(game_state.starting_stacks) - sum(game_state.stacks),
+        ))
+        return "check_or_call", valid_actions["check_or_call"]
+
+
+def play(engine, seed=0, n_rounds=10):
+    random.seed(seed)
+    games = []
+    observer = ObservingPlayer("Observer", lambda: games[0])
+    game = Game(players=[observer, RandomPlayer(name="Random"), CallingPlayer(name="Caller")], engine=engine)
+    games.append(game)
+    for _ in range(n_rounds):
+        if game.play_round(verbose=False):
+            break
+    return observer.seen
+
+def test_observations_describe_the_hand():
+    seen = play("pokerkit")
+
+    assert seen
+    for observation, hole_codes, board_codes, pot in seen:
+        assert isinstance(observation, Observation)
+        assert observation.player_count == len(observation.stacks) == len(observation.statuses)
+        assert list(observation.hole_codes) == hole_codes
+        assert list(observation.board_codes) == board_codes
+        assert observation.pot == pot
+        assert len(observation.board_codes) == (0, 3, 4, 5)[observation.street_index]
+        # Every action so far is in the history, with the street it was taken on.
+        assert all(street_index <= observation.street_index for _, street_index, _, _ in observation.history)
+
+    hands = {}
+    for observation, *_ in seen:
+        hands.setdefault(observation.hand_number, []).append(observation)
+    for observations in hands.values():
+        lengths = [len(observation.history) for observation in observations]
+        assert lengths == sorted(lengths)
+        assert all(a.history == b.history[:len(a.history)] for a, b in zip(observations, observations[1:]))
+
+def test_observations_do_not_depend_on_the_engine():
+    pokerkit_observations = [observation for observation, *_ in play("pokerkit", seed=3)]
+    fast_observations = [observation for observation, *_ in play("fast", seed=3)]
+
+    assert pokerkit_observations == fast_observations
+
+def test_observations_are_compact_snapshots():
+    observation = play("fast")[-1][0]
+
+    assert pickle.loads(pickle.dumps(observation)) == observation
+    assert hash(observation) == hash(pickle.loads(pickle.dumps(observation)))
+    assert len(pickle.dumps(observation)) < 500
@@ -0,0 +1,103 @@
+import random
+import pytest
+from PokerBots import CallingPlayer, Game, MCTSPlayer, RandomPlayer
+from PokerBots.equity.cards import card_codes
+
+
+class CheckingPlayer(RandomPlayer):
+    """
+    Plays at random, and checks that its observations rebuild the state of the game.
+    """
+
+    observes = True
+
+    def __init__(self, name, game_of):
+        super().__init__(name=name)
+        self.game_of = game_of
+        self.n_checked = 0
+
+    def play(self, valid_actions, state):
+        game_state = self.game_of().state
+        sampled = state.sample_state(random.Random(self.n_checked))
+
+        assert sampled.actor_index == game_state.actor_index
+        assert sampled.stacks == list(game_state.stacks)
+        assert sampled.bets == list(game_state.bets)
+        assert sampled.statuses == list(game_state.statuses)
+        assert sampled.hole_cards[state.actor_index] == list(game_state.hole_cards[state.actor_index])
+        assert [cards[0] for cards in sampled.board_cards] == [cards[0] for cards in game_state.board_cards]
+        assert sampled.checking_or_calling_amount == valid_actions["check_or_call"]
+        assert sampled.min_completion_betting_or_raising_to_amount == game_state.min_completion_betting_or_raising_to_amount
+        self.n_checked += 1
+        return super().play(valid_actions, state)
+
+def first_decision(n_players, seed=0):
+    random.seed(seed)
+    game = Game(players=[CallingPlayer(name=str(i)) for i in range(n_players)], engine="fast")
+    next(game.play_round_step_by_step(verbose=False))
+    return game.state
+
+def play_out(state):
+    while state.status:
+        if state.actor_index is not None:
+            state.check_or_call()
+        else:
+            state.burn_card()
+            state.deal_board()
+
+def test_forks_are_independent():
+    state = first_decision(4)
+    stacks, deck_cards, hole_cards = list(state.stacks), list(state.deck_cards), [list(c) for c in state.hole_cards]
+
+    fork = state.fork()
+    play_out(fork)
+
+    assert not fork.status and sum(fork.payoffs) == 0
+    assert state.status and state.actor_index is not None
+    assert state.stacks == stacks and state.deck_cards == deck_cards and state.hole_cards == hole_cards
+
+def test_determinize_redraws_the_unseen_cards():
+    def all_codes(state):
+        codes = [code for codes in state.hole_codes for code in codes] + state.deck_cards
+        return sorted(codes + card_codes(state.mucked_cards))
+
+    state = first_decision(6)
+    folded_index = state.actor_index
+    state.fold()
+    actor_index = state.actor_index
+    fork = state.fork()
+    fork.determinize(actor_index, random.Random(0))
+
+    assert fork.hole_codes[actor_index] == state.hole_codes[actor_index]
+    assert fork.hole_codes != state.hole_codes
+    # The cards of the player who folded are redrawn too, and they still have none in hand.
+    assert fork.hole_codes[folded_index] == [] and len(fork.mucked_cards) == 2
+    assert fork.mucked_cards != state.mucked_cards
+    assert all_codes(fork) == all_codes(state)
+
+@pytest.mark.parametrize("engine", ["pokerkit", "fast"])
+def test_observations_rebuild_the_state(engine):
+    random.seed(1)
+    games = []
+    players = [CheckingPlayer(str(i), lambda: games[0]) for i in range(3)] + [RandomPlayer(name="Random")]
+    games.append(Game(players=list(players), engine=engine, initial_stack=10_000))
+    for _ in range(20):
+        if games[0].play_round(verbose=False):
+            break
+
+    assert sum(player.n_checked for player in players[:3]) > 10
+
+def test_mcts_games_are_reproducible():
+    def play(seed):
+        random.seed(seed)
+        game = Game(
+            players=[MCTSPlayer(name="MCTS", n_iterations=50, seed=0), RandomPlayer(name="Random"), CallingPlayer(name="Caller")],
+            engine="fast",
+        )
+        for _ in range(10):
+            if game.play_round(verbose=False):
+                break
+        return game.stacks, random.random()
+
+    assert play(0) == play(0)
+    assert MCTSPlayer(n_iterations=50, seed=0).search(first_decision(3)).visits == 50
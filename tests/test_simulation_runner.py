@@ -0,0 +1,27 @@
+from PokerBots import SimulationRunner
+from PokerBots import CallingPlayer, RandomPlayer, GamblingPlayer
+
+
+def create_players():
+    return [GamblingPlayer(name="Gambler"), RandomPlayer(name="Random"), CallingPlayer(name="Caller")]
+
+def summarize(summary):
+    return [
+        (seat.name, seat.final_stacks, seat.hands_played, seat.hands_won, seat.chips_won)
+        for seat in summary.players
+    ]
+
+def test_results_do_not_depend_on_number_of_workers():
+    sequential = SimulationRunner(create_players(), rounds=20, n_workers=1, seed=42).run(n_games=6)
+    parallel = SimulationRunner(create_players(), rounds=20, n_workers=2, seed=42).run(n_games=6)
+
+    assert sequential.n_games == parallel.n_games == 6
+    assert sequential.n_hands == parallel.n_hands
+    assert summarize(sequential) == summarize(parallel)
+
+def test_chips_are_conserved():
+    summary = SimulationRunner(create_players(), initial_stack=30_000, rounds=20, seed=7).run(n_games=4)
+
+    assert sum(seat.chips_won for seat in summary.players) == 0
+    for game in range(4):
+        assert sum(seat.final_stacks[game] for seat in summary.players) == 3 * 30_000
@@ -0,0 +1,81 @@
+import random
+import pytest
+from PokerBots import BlindLevel, BlindSchedule, CallingPlayer, GamblingPlayer, Game, RandomPlayer, Tournament
+
+
+def create_players():
+    return [CallingPlayer(name="Caller"), RandomPlayer(name="Random")]
+
+def test_every_entrant_gets_a_distinct_finish_position():
+    tournament = Tournament(create_players(), n_entrants=200, table_size=6, seed=3)
+    result = tournament.run()
+
+    assert result.complete
+    assert sorted(result.finish_positions) == list(range(1, 201))
+    assert tournament.registry.n_remaining == 1
+    assert tournament.registry.stacks[result.winner] == 200 * 30_000
+    assert result.name(result.winner).startswith(("Caller #", "Random #"))
+    assert set(result.average_finish()) == {"Caller", "Random"}
+
+def test_tournament_in_process_keeps_the_random_state():
+    random.seed(7)
+    expected = random.random()
+    random.seed(7)
+    Tournament(create_players(), n_entrants=20, seed=2, max_hands=20).run()
+
+    assert random.random() == expected
+
+def test_results_do_not_depend_on_number_of_workers():
+    players = [GamblingPlayer(name="Gambler"), *create_players()]
+    sequential = Tournament(players, n_entrants=30, seed=5, max_hands=40).run()
+    parallel = Tournament(players, n_entrants=30, seed=5, max_hands=40, n_workers=2).run()
+
+    assert sequential.finish_positions == parallel.finish_positions
+    assert sequential.n_table_hands == parallel.n_table_hands
+
+def test_tournament_stopped_early_ranks_remaining_entrants_by_stack():
+    tournament = Tournament(create_players(), n_entrants=50, seed=1, max_hands=5)
+    result = tournament.run()
+
+    assert not result.complete
+    assert result.n_hands == 5
+    assert sorted(result.finish_positions) == list(range(1, 51))
+    stacks = [tournament.registry.stacks[entrant] for entrant in result.ranking()]
+    assert stacks == sorted(stacks, reverse=True)
+    assert sum(stacks) == 50 * 30_000
+
+def test_tournament_out_of_time_stops_between_segments():
+    tournament = Tournament(create_players(), n_entrants=50, seed=1, time_budget=0)
+    result = tournament.run()
+
+    assert not result.complete
+    assert result.n_hands == 0
+    assert sorted(result.finish_positions) == list(range(1, 51))
+    assert sum(tournament.registry.stacks) == 50 * 30_000
+
+def test_balancing_breaks_tables_and_evens_them_out():
+    tournament = Tournament(create_players(), n_entrants=40, table_size=9)
+    tables = tournament.balance([[0, 1, 2, 3, 4, 5, 6, 7, 8], [9, 10, 11], [12, 13, 14, 15, 16, 17, 18], [19, 20]])
+
+    assert sorted(len(entrants) for entrants in tables) == [7, 7, 7]
+    assert sorted(entrant for entrants in tables for entrant in entrants) == list(range(21))
+    assert all(tournament.registry.tables[entrant] == index for index, entrants in enumerate(tables) for entrant in entrants)
+
+def test_schedule_levels_follow_the_hand_clock():
+    schedule = BlindSchedule([BlindLevel(50, 100), BlindLevel(100, 200, 25)], hands_per_level=3)
+
+    assert [schedule.level(hand).big_blind for hand in range(8)] == [100, 100, 100, 200, 200, 200, 200, 200]
+    assert BlindSchedule.geometric(200, growth=2, n_levels=3).levels == [
+        BlindLevel(100, 200, 25), BlindLevel(200, 400, 50), BlindLevel(400, 800, 100)
+    ]
+    with pytest.raises(ValueError):
+        BlindLevel(200, 100)
+
+def test_game_uses_its_forced_bets():
+    game = Game(players=create_players(), engine="fast", ante=10, blinds=(20, 40))
+    decisions = game.play_round_step_by_step(verbose=False)
+    next(decisions)
+
+    assert game.min_bet == 40
+    assert sorted(game.state.bets) == [20, 40]
+    assert sum(game.state.stacks) == 2 * 30_000 - 2 * 10 - 60